@@ -36,6 +36,10 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Any
 import contextlib
 
+# refactored 모듈(bkp_reader)을 가져오기 위해 경로 추가
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'refactored'))
+import bkp_reader
+
 
 #======================================================================
 # Session model for preview/overrides persistence
@@ -218,53 +222,16 @@ print(block_names)
 #======================================================================
 def parse_bkp_file_for_blocks(file_path, block_names):
     """
-    .bkp 파일을 텍스트로 읽어서 주어진 블록 이름들의 카테고리를 파싱하는 함수
+    .bkp 파일 헤더의 블록 레코드를 한 번만 읽어서 주어진 블록 이름들의 카테고리를 파싱하는 함수
     """
     block_info = {}
     
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        
-        lines = content.split('\n')
-        
-        # 각 블록 이름에 대해 카테고리 찾기
+        # mmap으로 연 아카이브(refactored/bkp_reader)의 블록 레코드 구간만 읽어 각 블록 이름의 카테고리를 조회
+        with bkp_reader.BkpArchive(file_path) as archive:
+            block_categories = archive.block_categories(bkp_reader.CLASSIFIER_BLOCK_CATEGORIES)
         for block_name in block_names:
-            category = "Unknown"
-            
-            # 블록 이름이 있는 줄 찾기
-            for i, line in enumerate(lines):
-                if line.strip() == block_name:
-                    # 다음 4줄에서 카테고리 정보 찾기
-                    for j in range(i + 1, min(i + 5, len(lines))):
-                        next_line = lines[j].strip()
-                        
-                        # 카테고리 후보들
-                        if next_line in ['Heater', 'Cooler', 'HeatX', 'Condenser']:
-                            category = next_line
-                            break
-                        elif next_line in ['RadFrac', 'Distl', 'DWSTU']:
-                            category = next_line
-                            break
-                        elif next_line in ['RStoic', 'RCSTR', 'RPlug', 'RBatch', 'REquil', 'RYield']:
-                            category = next_line
-                            break
-                        elif next_line in ['Pump', 'Compr', 'MCompr', 'Vacuum', 'Flash', 'Sep', 'Mixer', 'FSplit', 'Valve']:
-                            category = next_line
-                            break
-                        elif next_line in ['EVAP1', 'EVAP2', 'EVAP3']:
-                            category = next_line
-                            break
-                        elif next_line in ['ABS', 'PSA']:
-                            category = next_line
-                            break
-                        elif next_line in ['COMB']:
-                            category = next_line
-                            break
-                    
-                    break  # 블록 이름을 찾았으므로 루프 종료
-            
-            block_info[block_name] = category
+            block_info[block_name] = block_categories.get(block_name, "Unknown")
         
         return block_info
         
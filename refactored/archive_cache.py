@@ -0,0 +1,91 @@
+"""
+.bkp 아카이브 메타데이터 디스크 캐시 모듈
+
+블록 분류(block_info), 현재 단위 세트, 단위 타입 값처럼 아카이브 내용에만 의존하는 결과를
+아카이브 내용 해시(SHA-256)로 키잉해 로컬 캐시 디렉토리에 저장합니다.
+.bkp 파일이 바이트 단위로 같으면 다음 실행에서 파싱/COM 조회 없이 바로 재사용하고,
+해시가 달라지면 해당 항목을 폐기합니다.
+"""
+
+from typing import Optional, Dict, Any
+import hashlib
+import json
+import os
+
+# 캐시 항목 형식이 바뀌면 올려서 이전 항목을 무효화합니다.
+CACHE_FORMAT_VERSION = 1
+_HASH_CHUNK_SIZE = 1 << 20
+
+# =============================================================================
+# 아카이브 해시
+# =============================================================================
+
+def file_digest(file_path: str) -> str:
+    """파일 내용의 SHA-256 해시(hex). 1MB 단위로 읽어 파일 전체를 메모리에 올리지 않습니다."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# =============================================================================
+# 디스크 캐시
+# =============================================================================
+
+class ArchiveCache:
+    """
+    아카이브 경로별 캐시 항목을 <cache_dir>/<경로 해시>.json 으로 저장합니다.
+    항목에는 저장 당시의 아카이브 내용 해시가 들어 있어, 불러올 때 현재 해시와 다르면 삭제 후 None을 반환합니다.
+    """
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, file_path: str) -> str:
+        key = hashlib.sha256(os.path.abspath(file_path).encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(self, file_path: str, digest: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """캐시 항목을 반환합니다. 없거나 해시/형식이 다르면 None"""
+        entry_path = self._entry_path(file_path)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        digest = digest or file_digest(file_path)
+        if entry.get('version') != CACHE_FORMAT_VERSION or entry.get('digest') != digest:
+            self.invalidate(file_path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.get('data')
+
+    def store(self, file_path: str, data: Dict[str, Any], digest: Optional[str] = None) -> None:
+        """캐시 항목을 저장합니다. 임시 파일에 쓴 뒤 교체하므로 중간에 끊겨도 깨진 항목이 남지 않습니다."""
+        entry = {
+            'version': CACHE_FORMAT_VERSION,
+            'file_path': os.path.abspath(file_path),
+            'digest': digest or file_digest(file_path),
+            'data': data,
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entry_path = self._entry_path(file_path)
+            tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            print(f"Warning: could not write archive cache: {e}")
+
+    def invalidate(self, file_path: str) -> None:
+        try:
+            os.remove(self._entry_path(file_path))
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
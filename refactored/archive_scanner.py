@@ -0,0 +1,162 @@
+"""
+.bkp 아카이브 폴더 스캔 모듈
+
+폴더 안의 .bkp 파일마다 헤더 구간만 읽어 Aspen 버전, 저장 시각(DATETIME), 블록 수,
+블록 타입 분포를 요약하고, 결과를 (경로, 크기, mtime) 키로 캐시합니다.
+캐시에 없는 파일이 많으면 프로세스 풀에서 병렬로 헤더를 읽습니다.
+"""
+
+from typing import Optional, Dict, List, Any, Iterable, NamedTuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import time
+
+import config
+import bkp_reader
+
+# =============================================================================
+# 아카이브 요약
+# =============================================================================
+
+class ArchiveInfo(NamedTuple):
+    """아카이브 하나의 헤더 요약"""
+    path: str
+    size: int
+    mtime: float
+    version: Optional[str]
+    datetime: Optional[str]
+    block_count: int
+    block_types: Dict[str, int]   # 모델 타입 → 블록 수
+    error: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def saved_at(self) -> Optional[time.struct_time]:
+        """DATETIME('Mon Sep  1 19:59:17 2025')을 정렬 가능한 시각으로 변환합니다."""
+        if not self.datetime:
+            return None
+        try:
+            return time.strptime(' '.join(self.datetime.split()), '%a %b %d %H:%M:%S %Y')
+        except ValueError:
+            return None
+
+def summarize_archive(path: str, size: int, mtime: float) -> ArchiveInfo:
+    """헤더 구간만 읽어 ArchiveInfo를 만듭니다. (프로세스 풀 워커에서도 호출되므로 모듈 최상위 함수)"""
+    try:
+        header = bkp_reader.read_header(path)
+    except OSError as e:
+        return ArchiveInfo(path, size, mtime, None, None, 0, {}, str(e))
+    histogram = Counter(header.block_types.values())
+    return ArchiveInfo(path, size, mtime, header.version, header.datetime,
+                       len(header.block_types), dict(histogram.most_common()))
+
+# =============================================================================
+# 스캔 + 캐시
+# =============================================================================
+
+_SCAN_CACHE_FILE = 'scan_index.json'
+
+def _load_scan_cache(cache_path: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_scan_cache(cache_path: str, infos: Iterable[ArchiveInfo]) -> None:
+    entries = {info.path: info._asdict() for info in infos if info.error is None}
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not write archive scan cache: {e}")
+
+def scan_archives(paths: List[str], cache_dir: Optional[str] = None, max_workers: Optional[int] = None) -> List[ArchiveInfo]:
+    """
+    주어진 .bkp 경로들의 헤더 요약을 반환합니다 (입력 순서 유지).
+    cache_dir가 있으면 (경로, 크기, mtime)이 같은 파일은 캐시 값을 그대로 쓰고,
+    캐시에 없는 파일이 config.SCAN_PARALLEL_THRESHOLD개 이상이면 프로세스 풀로 병렬 처리합니다.
+    """
+    cache_path = os.path.join(cache_dir, _SCAN_CACHE_FILE) if cache_dir else None
+    cached = _load_scan_cache(cache_path) if cache_path else {}
+
+    results: Dict[str, ArchiveInfo] = {}
+    pending = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            results[path] = ArchiveInfo(path, 0, 0.0, None, None, 0, {}, str(e))
+            continue
+        entry = cached.get(path)
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime:
+            results[path] = ArchiveInfo(**entry)
+        else:
+            pending.append((path, stat.st_size, stat.st_mtime))
+
+    if pending:
+        if len(pending) >= getattr(config, 'SCAN_PARALLEL_THRESHOLD', 32):
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                scanned = list(pool.map(summarize_archive, *zip(*pending), chunksize=4))
+        else:
+            scanned = [summarize_archive(*args) for args in pending]
+        for info in scanned:
+            results[info.path] = info
+        if cache_path:
+            _save_scan_cache(cache_path, results.values())
+
+    return [results[path] for path in paths]
+
+def scan_directory(directory: str, cache_dir: Optional[str] = None) -> List[ArchiveInfo]:
+    """폴더의 모든 .bkp 파일을 스캔합니다."""
+    paths = [os.path.join(directory, f) for f in os.listdir(directory) if f.lower().endswith('.bkp')]
+    return scan_archives(paths, cache_dir)
+
+# =============================================================================
+# 정렬 / 표 출력
+# =============================================================================
+
+# 정렬 키: 입력 문자 → (설명, 정렬 함수, 내림차순 여부)
+SORT_KEYS = {
+    'm': ('modified', lambda info: info.mtime, True),
+    'd': ('saved (DATETIME)', lambda info: info.saved_at or time.gmtime(0), True),
+    'n': ('name', lambda info: info.name.lower(), False),
+    'b': ('blocks', lambda info: info.block_count, True),
+    's': ('size', lambda info: info.size, True),
+}
+
+def sort_archives(infos: List[ArchiveInfo], key: str = 'm') -> List[ArchiveInfo]:
+    _, sort_func, reverse = SORT_KEYS.get(key, SORT_KEYS['m'])
+    return sorted(infos, key=sort_func, reverse=reverse)
+
+def _histogram_text(block_types: Dict[str, int], limit: int = 4) -> str:
+    items = sorted(block_types.items(), key=lambda item: (-item[1], item[0]))
+    text = ' '.join(f"{model}x{count}" for model, count in items[:limit])
+    return text + (' ...' if len(items) > limit else '')
+
+def format_table(infos: List[ArchiveInfo], last_costs: Optional[Dict[str, Optional[float]]] = None) -> str:
+    """
+    번호가 붙은 아카이브 요약 표 문자열.
+    last_costs({경로: 총 비용})가 주어지면 요약 사이드카에 저장된 마지막 총 비용 열을 추가합니다.
+    """
+    name_width = max([len(info.name) for info in infos] + [4])
+    cost_header = f"  {'Last cost':>16}" if last_costs is not None else ''
+    lines = [f"  {'#':>3}  {'File':<{name_width}}  {'Ver':>5}  {'Saved':<20}  {'Size':>8}  {'Blocks':>6}{cost_header}  Block types"]
+    for i, info in enumerate(infos, 1):
+        saved = time.strftime('%Y-%m-%d %H:%M:%S', info.saved_at) if info.saved_at else '-'
+        detail = f"ERROR: {info.error}" if info.error else _histogram_text(info.block_types)
+        cost = ''
+        if last_costs is not None:
+            total = last_costs.get(info.path)
+            cost = f"  {f'${total:,.0f}' if total is not None else '-':>16}"
+        lines.append(f"  {i:>3}  {info.name:<{name_width}}  {info.version or '-':>5}  {saved:<20}  "
+                     f"{info.size / 1e6:>6.1f}MB  {info.block_count:>6}{cost}  {detail}")
+    return '\n'.join(lines)
@@ -0,0 +1,199 @@
+"""
+아카이브 요약 사이드카 모듈
+
+실행이 끝나면 .bkp 옆에 '<파일명>.summary.json' 요약 파일(사이드카)을 씁니다.
+사이드카에는 블록 분류, 단위 세트/단위 타입, 추출된 장치/유틸리티 데이터, 마지막 비용 계산 결과가 들어 있고
+아카이브 내용 해시(SHA-256)로 키잉되어, 같은 .bkp를 다시 열 때 Aspen 연결 없이 바로 프리뷰를 보여줄 수 있습니다.
+"""
+
+from typing import Optional, Dict, List, Any
+from dataclasses import dataclass, field, asdict
+import json
+import os
+import time
+
+import config
+import archive_cache
+
+# 사이드카 형식이 바뀌면 올려서 이전 파일을 무시합니다.
+SUMMARY_FORMAT_VERSION = 1
+
+# =============================================================================
+# 요약 데이터
+# =============================================================================
+
+@dataclass
+class ArchiveSummary:
+    """
+    한 아카이브의 마지막 성공 실행 요약
+    - digest/size/mtime: 저장 당시 아카이브의 내용 해시와 파일 상태
+    - devices: 추출된 장치 데이터 (오버라이드 적용 전)
+    - costs: summarize_cost_results 형식의 장치별 비용 행
+    """
+    aspen_file: str
+    digest: str
+    size: int
+    mtime: float
+    unit_set: Optional[str]
+    block_info: Dict[str, str]
+    unit_types: Dict[str, Optional[str]] = field(default_factory=dict)
+    devices: List[Dict[str, Any]] = field(default_factory=list)
+    utilities: List[Dict[str, Any]] = field(default_factory=list)
+    costs: List[Dict[str, Any]] = field(default_factory=list)
+    total_bare_module_cost: Optional[float] = None
+    cepci_target_index: Optional[float] = None
+    saved_at: str = ''
+
+    def matches_stat(self, file_path: str) -> bool:
+        """파일 크기/mtime이 저장 당시와 같은지 (해시 계산 없는 빠른 확인)"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime == self.mtime
+
+def summarize_cost_results(all_devices: List[Dict[str, Any]], cost_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """비용 결과를 장치별 행(이름, 카테고리, 타입, 비용, 상태)으로 정리합니다. 계산 과정(debug_steps)은 제외합니다."""
+    types = {device.get('name'): (device.get('selected_type'), device.get('selected_subtype')) for device in all_devices}
+    rows = []
+    for res in cost_results["results"]:
+        eq_type, subtype = types.get(res.get("name"), (None, None))
+        if res.get("info") is not None:
+            status, message = "skipped", res.get("info")
+        elif res.get("bare_module_cost") is not None:
+            status, message = "ok", None
+        else:
+            status, message = "error", res.get("error", "Unknown Error")
+        rows.append({
+            "name": res.get("name"),
+            "category": res.get("category"),
+            "type": eq_type or res.get("category"),
+            "subtype": subtype,
+            "bare_module_cost": res.get("bare_module_cost"),
+            "status": status,
+            "message": message,
+        })
+    return rows
+
+# =============================================================================
+# 사이드카 읽기/쓰기
+# =============================================================================
+
+def sidecar_path(file_path: str) -> str:
+    """아카이브 옆 사이드카 경로 (예: case.bkp → case.summary.json)"""
+    return os.path.splitext(file_path)[0] + getattr(config, 'SUMMARY_SIDECAR_SUFFIX', '.summary.json')
+
+def _restore_device(device: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON에서 문자열이 된 MCompr stage_data 키를 단 번호(int)로 되돌립니다."""
+    stage_data = device.get('stage_data')
+    if isinstance(stage_data, dict):
+        device['stage_data'] = {int(key) if str(key).isdigit() else key: value for key, value in stage_data.items()}
+    return device
+
+def write_summary(file_path: str, metadata: Dict[str, Any], devices: List[Dict[str, Any]], utilities: List[Dict[str, Any]],
+                  cost_results: Optional[Dict[str, Any]] = None, costed_devices: Optional[List[Dict[str, Any]]] = None,
+                  cepci_target_index: Optional[float] = None, digest: Optional[str] = None) -> Optional[ArchiveSummary]:
+    """
+    사이드카를 씁니다. 임시 파일에 쓴 뒤 교체하며, 쓰기에 실패하면 경고만 출력하고 None을 반환합니다.
+    cost_results가 있으면 costed_devices(없으면 devices)의 타입 정보와 함께 장치별 비용 행으로 저장합니다.
+    """
+    try:
+        stat = os.stat(file_path)
+        summary = ArchiveSummary(
+            aspen_file=os.path.basename(file_path),
+            digest=digest or archive_cache.file_digest(file_path),
+            size=stat.st_size,
+            mtime=stat.st_mtime,
+            unit_set=metadata.get('unit_set'),
+            block_info=metadata.get('block_info', {}),
+            unit_types=metadata.get('unit_types', {}),
+            # 지연 추출 목록(lazy_devices.LazyDeviceList)도 일반 dict 목록으로 저장합니다.
+            devices=[dict(device) for device in devices],
+            utilities=utilities,
+            costs=summarize_cost_results(costed_devices or devices, cost_results) if cost_results else [],
+            total_bare_module_cost=cost_results.get("total_bare_module_cost") if cost_results else None,
+            cepci_target_index=cepci_target_index,
+            saved_at=time.strftime('%Y-%m-%d %H:%M:%S'),
+        )
+        path = sidecar_path(file_path)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': SUMMARY_FORMAT_VERSION, **asdict(summary)}, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        return summary
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Warning: could not write summary sidecar: {e}")
+        return None
+
+def peek_summary(file_path: str) -> Optional[ArchiveSummary]:
+    """
+    사이드카를 해시 확인 없이 읽습니다 (파일 목록 표시용).
+    파일 크기/mtime이 저장 당시와 다르면 None
+    """
+    try:
+        with open(sidecar_path(file_path), 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.pop('version', None) != SUMMARY_FORMAT_VERSION:
+        return None
+    try:
+        summary = ArchiveSummary(**entry)
+    except TypeError:
+        return None
+    if not summary.matches_stat(file_path):
+        return None
+    summary.devices = [_restore_device(device) for device in summary.devices]
+    return summary
+
+def load_summary(file_path: str, digest: Optional[str] = None) -> Optional[ArchiveSummary]:
+    """
+    사이드카를 읽어 현재 아카이브 내용 해시와 같을 때만 반환합니다.
+    크기/mtime이 같으면 해시 계산 없이 신뢰하고, 다르면(복사/touch 등) 해시를 비교합니다.
+    """
+    try:
+        with open(sidecar_path(file_path), 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        if entry.pop('version', None) != SUMMARY_FORMAT_VERSION:
+            return None
+        summary = ArchiveSummary(**entry)
+    except (OSError, ValueError, TypeError):
+        return None
+    if digest is not None or not summary.matches_stat(file_path):
+        if (digest or archive_cache.file_digest(file_path)) != summary.digest:
+            return None
+    summary.devices = [_restore_device(device) for device in summary.devices]
+    return summary
+
+# =============================================================================
+# 프리뷰 출력
+# =============================================================================
+
+def format_cost(value: Optional[float]) -> str:
+    return f"${value:,.0f}" if value is not None else '-'
+
+def format_preview(summary: ArchiveSummary) -> str:
+    """캐시된 장치 목록과 마지막 비용 결과 표 문자열"""
+    costs = {row.get('name'): row for row in summary.costs}
+    lines = [
+        "=" * 80,
+        f"CACHED PREVIEW: {summary.aspen_file} (saved {summary.saved_at}, unit set {summary.unit_set or '-'})",
+        "=" * 80,
+        f"  {'Equipment Name':<20} {'Category':<12} {'Type':<20} {'Last Cost/Status':>22}",
+        "  " + "─" * 76,
+    ]
+    for device in summary.devices:
+        name = device.get('name', 'Unknown')
+        row = costs.get(name, {})
+        eq_type = row.get('type') or device.get('selected_type') or ''
+        if row.get('status') == 'ok':
+            status = format_cost(row.get('bare_module_cost'))
+        elif row:
+            status = row.get('status', '')
+        else:
+            status = 'not costed'
+        lines.append(f"  {name:<20} {device.get('category', ''):<12} {eq_type:<20} {status:>22}")
+    lines.append("  " + "─" * 76)
+    lines.append(f"  {'LAST TOTAL BARE MODULE COST':<54} {format_cost(summary.total_bare_module_cost):>22}")
+    lines.append("=" * 80)
+    return '\n'.join(lines)
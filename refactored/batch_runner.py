@@ -0,0 +1,210 @@
+"""
+배치 실행 모듈
+
+glob 패턴에 맞는 여러 .bkp 시나리오 아카이브를 비대화식으로 처리합니다.
+아카이브마다 장치 분류 → 데이터 추출 → 비용 계산(calculate_all_costs_with_data)을 프로세스 풀에서 실행하고,
+모든 결과를 하나의 결과 파일(.json 또는 .csv)로 씁니다.
+한 아카이브의 실패(연결/파싱/계산 오류, 워커 프로세스 종료)는 해당 아카이브 결과에만 기록됩니다.
+
+사용법:
+    python batch_runner.py "scenarios/*.bkp" [-w 워커 수] [-o 결과 파일] [--backend bkp|com] [--year 2024]
+"""
+
+from typing import Optional, Dict, List, Any
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import argparse
+import copy
+import csv
+import glob
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from contextlib import redirect_stdout
+
+import config
+import data_manager
+import cost_calculator
+import archive_summary
+
+# =============================================================================
+# 아카이브 하나 처리 (워커)
+# =============================================================================
+
+def run_archive(file_path: str, backend: str, target_index: Optional[float]) -> Dict[str, Any]:
+    """
+    .bkp 하나를 분류/추출/비용 계산합니다. (프로세스 풀 워커에서 호출되므로 모듈 최상위 함수)
+    예외는 밖으로 던지지 않고 status='error' 결과로 반환합니다.
+    """
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"archive": file_path, "status": "ok", "error": None}
+    output = io.StringIO()
+    Application = None
+    try:
+        with redirect_stdout(output):
+            # 워커 프로세스는 여러 아카이브를 연달아 처리하므로 이전 아카이브의 모듈 상태를 비웁니다.
+            data_manager.clear_aspen_cache()
+            data_manager.clear_stream_table()
+            Application = data_manager.connect_to_aspen(file_path, backend=backend)
+            metadata = data_manager.load_archive_metadata(Application, file_path)
+            if not metadata['block_info']:
+                raise ValueError("no blocks found in archive")
+            if getattr(config, 'USE_STREAM_TABLE', False):
+                data_manager.load_stream_table(file_path)
+            all_devices = data_manager.extract_all_device_data(Application, metadata['block_info'], metadata['unit_set'], metadata['unit_types'])
+            utilities = data_manager.extract_all_utility_data(Application, metadata['unit_types'])
+            cost_results = cost_calculator.calculate_all_costs_with_data(copy.deepcopy(all_devices), cost_calculator.CEPCIOptions(target_index=target_index), Application)
+            if getattr(config, 'ENABLE_SUMMARY_SIDECAR', False):
+                archive_summary.write_summary(file_path, metadata, all_devices, utilities, cost_results, cepci_target_index=target_index)
+        result.update({
+            "unit_set": metadata['unit_set'],
+            "device_count": len(all_devices),
+            "total_bare_module_cost": cost_results["total_bare_module_cost"],
+            "devices": archive_summary.summarize_cost_results(all_devices, cost_results),
+        })
+    except (Exception, SystemExit) as e:
+        # connect_to_aspen은 COM 연결 실패 시 sys.exit를 호출하므로 SystemExit도 이 아카이브의 실패로 처리합니다.
+        result.update({"status": "error", "error": f"{type(e).__name__}: {e}",
+                       "traceback": traceback.format_exc(), "log": output.getvalue()})
+    finally:
+        if Application is not None:
+            try:
+                Application.Close()
+            except Exception:
+                pass
+    result["elapsed_s"] = round(time.perf_counter() - start, 3)
+    return result
+
+# =============================================================================
+# 배치 실행
+# =============================================================================
+
+def expand_patterns(patterns: List[str]) -> List[str]:
+    """glob 패턴(또는 폴더)들을 중복 없는 .bkp 경로 목록으로 확장합니다 (정렬 순서)."""
+    paths: List[str] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*.bkp')
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            path = os.path.abspath(path)
+            if path.lower().endswith('.bkp') and path not in paths:
+                paths.append(path)
+    return paths
+
+def _run_in_fresh_process(path: str, backend: str, target_index: Optional[float]) -> Dict[str, Any]:
+    """아카이브 하나를 새 워커 프로세스에서 실행합니다 (워커 종료 시 원인 아카이브를 가려내기 위한 재실행)."""
+    try:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            return pool.submit(run_archive, path, backend, target_index).result()
+    except Exception as e:
+        return {"archive": path, "status": "error", "error": f"{type(e).__name__}: {e}", "elapsed_s": 0.0}
+
+def run_batch(paths: List[str], max_workers: Optional[int] = None, backend: Optional[str] = None,
+              target_index: Optional[float] = None, progress: bool = True) -> List[Dict[str, Any]]:
+    """
+    아카이브들을 병렬로 처리하고 입력 순서대로 결과를 반환합니다.
+    max_workers가 1이면 프로세스 풀 없이 현재 프로세스에서 순차 처리합니다.
+    워커 프로세스가 비정상 종료되어 풀이 깨지면, 끝나지 못한 아카이브들을 하나씩 새 프로세스에서 다시 실행해
+    원인이 된 아카이브만 status='error'로 기록합니다.
+    """
+    backend = backend or getattr(config, 'BATCH_BACKEND', 'bkp')
+    max_workers = max_workers or getattr(config, 'BATCH_MAX_WORKERS', None) or os.cpu_count() or 1
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def report(result: Dict[str, Any]) -> None:
+        results[result["archive"]] = result
+        if progress:
+            detail = f"${result['total_bare_module_cost']:,.0f}" if result["status"] == "ok" else result["error"]
+            print(f"  [{len(results)}/{len(paths)}] {os.path.basename(result['archive'])}: {detail} ({result['elapsed_s']:.2f}s)")
+
+    if max_workers == 1 or len(paths) <= 1:
+        for path in paths:
+            report(run_archive(path, backend, target_index))
+        return [results[path] for path in paths]
+
+    broken: List[str] = []
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(paths))) as pool:
+        futures = {pool.submit(run_archive, path, backend, target_index): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                report(future.result())
+            except BrokenProcessPool:
+                broken.append(path)
+            except Exception as e:
+                report({"archive": path, "status": "error", "error": f"{type(e).__name__}: {e}", "elapsed_s": 0.0})
+    for path in sorted(broken, key=paths.index):
+        report(_run_in_fresh_process(path, backend, target_index))
+    return [results[path] for path in paths]
+
+# =============================================================================
+# 결과 파일
+# =============================================================================
+
+_CSV_FIELDS = ["archive", "archive_status", "unit_set", "name", "category", "type", "subtype",
+               "bare_module_cost", "status", "message"]
+
+def write_results(results: List[Dict[str, Any]], output_path: str, target_index: Optional[float] = None) -> None:
+    """결과를 하나의 파일로 씁니다. 확장자가 .csv면 장치 단위 행, 그 외에는 JSON."""
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    if output_path.lower().endswith('.csv'):
+        with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=_CSV_FIELDS)
+            writer.writeheader()
+            for result in results:
+                base = {"archive": result["archive"], "archive_status": result["status"], "unit_set": result.get("unit_set")}
+                if result["status"] != "ok":
+                    writer.writerow({**base, "status": "error", "message": result["error"]})
+                    continue
+                for row in result["devices"]:
+                    writer.writerow({**base, **row})
+        return
+    payload = {
+        "generated_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+        "cepci_target_index": target_index,
+        "archive_count": len(results),
+        "failed_count": sum(1 for result in results if result["status"] != "ok"),
+        "archives": results,
+    }
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cost many .bkp archives in parallel")
+    parser.add_argument('patterns', nargs='+', help='.bkp glob pattern(s) or folder(s)')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes (default: config.BATCH_MAX_WORKERS or CPU count)')
+    parser.add_argument('-o', '--output', default=None, help='consolidated results file (.json or .csv)')
+    parser.add_argument('--backend', choices=('bkp', 'com'), default=None, help='data backend (default: config.BATCH_BACKEND)')
+    parser.add_argument('--year', type=int, default=config.DEFAULT_TARGET_YEAR, help='CEPCI target year')
+    args = parser.parse_args(argv)
+
+    paths = expand_patterns(args.patterns)
+    if not paths:
+        print("No .bkp files matched.")
+        return 1
+    target_index = config.CEPCI_BY_YEAR.get(args.year)
+    if target_index is None:
+        print(f"Unknown CEPCI year: {args.year}")
+        return 1
+    output_path = args.output or getattr(config, 'BATCH_RESULTS_FILE', 'batch_results.json')
+
+    print(f"Costing {len(paths)} archive(s)...")
+    start = time.perf_counter()
+    results = run_batch(paths, args.workers, args.backend, target_index)
+    elapsed = time.perf_counter() - start
+    write_results(results, output_path, target_index)
+
+    failed = [result for result in results if result["status"] != "ok"]
+    print(f"Done: {len(results) - len(failed)} ok, {len(failed)} failed in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.1f} archives/s) -> {output_path}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+아카이브 메타데이터 캐시 벤치마크: 캐시 미스(cold) vs 캐시 적중(warm)
+
+오프라인 트리(bkp_tree)를 Application으로 사용해 load_archive_metadata를 측정합니다.
+cold는 캐시 디렉토리를 비운 상태, warm은 같은 .bkp로 다시 호출한 경우입니다.
+COM 왕복 비용을 흉내 내기 위해 노드 접근(FindNode/Value/Elements/Name)마다 지정한 지연(ms)을 넣을 수 있습니다 (0이면 순수 오프라인 트리).
+
+사용법:
+    python benchmarks/bench_archive_cache.py [BKP 파일 경로] [반복 횟수] [COM 호출 지연 ms]
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import bkp_tree
+import data_manager
+from bench_common import LatencyDocument
+
+DEFAULT_BKP = os.path.join(ROOT, 'MIX_HEFA_20250716_after_HI_v1.bkp')
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BKP
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    latency_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+
+    work_dir = tempfile.mkdtemp(prefix='bkp_cache_bench_')
+    try:
+        bkp_copy = os.path.join(work_dir, os.path.basename(file_path))
+        shutil.copyfile(file_path, bkp_copy)
+        cache_dir = os.path.join(work_dir, config.ARCHIVE_CACHE_DIR)
+        config.ENABLE_ARCHIVE_CACHE = True
+        application = LatencyDocument(bkp_tree.open_document(bkp_copy), latency_ms / 1000)
+
+        cold, warm = [], []
+        for _ in range(repeat):
+            # cold는 새로 연 문서와 같게 디스크 캐시와 노드 캐시를 모두 비운 상태에서 트리를 읽습니다.
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            data_manager.clear_aspen_cache()
+            application.Tree.reset()
+            with redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                expected = data_manager.load_archive_metadata(application, bkp_copy)
+                cold.append(time.perf_counter() - start)
+                cold_calls = application.Tree.calls
+                start = time.perf_counter()
+                cached = data_manager.load_archive_metadata(application, bkp_copy)
+                warm.append(time.perf_counter() - start)
+                warm_calls = application.Tree.calls - cold_calls
+            assert cold_calls > 0, "cold run did not read the tree"
+            assert cached == expected, "cached metadata differs from a fresh read"
+
+        print(f"file: {os.path.basename(file_path)} ({os.path.getsize(file_path) / 1e6:.1f} MB), "
+              f"{len(expected['block_info'])} blocks, unit set {expected['unit_set']}")
+        print(f"COM call latency: {latency_ms:.2f} ms")
+        print(f"cold (cache miss): {min(cold) * 1000:8.1f} ms  ({cold_calls} COM calls)")
+        print(f"warm (cache hit) : {min(warm) * 1000:8.1f} ms  ({warm_calls} COM calls)")
+        print(f"speedup          : {min(cold) / min(warm):8.1f}x")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
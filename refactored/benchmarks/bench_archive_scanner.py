@@ -0,0 +1,72 @@
+"""
+.bkp 폴더 스캔 벤치마크: 헤더 요약 (순차 / 프로세스 풀 / 캐시 적중)
+
+샘플 아카이브를 임시 폴더에 N개 복제한 뒤 archive_scanner.scan_archives를 측정합니다.
+비교용으로 파일 전체를 읽는 방식(f.read())의 순차 시간도 함께 출력합니다.
+
+사용법:
+    python benchmarks/bench_archive_scanner.py [BKP 파일 경로] [아카이브 개수]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import bkp_reader
+import archive_scanner
+
+DEFAULT_BKP = os.path.join(ROOT, 'MIX_HEFA_20250716_after_HI_v1.bkp')
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def full_read_scan(paths):
+    """비교 기준: 파일 전체를 읽고 블록 레코드를 인덱싱"""
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        list(bkp_reader._RECORD_RE.finditer(data))
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BKP
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+
+    work_dir = tempfile.mkdtemp(prefix='bkp_scan_bench_')
+    try:
+        paths = []
+        for i in range(count):
+            path = os.path.join(work_dir, f"variant_{i:03d}.bkp")
+            shutil.copyfile(file_path, path)
+            paths.append(path)
+        cache_dir = os.path.join(work_dir, config.ARCHIVE_CACHE_DIR)
+
+        _, full_s = timed(full_read_scan, paths)
+        config.SCAN_PARALLEL_THRESHOLD = count + 1
+        infos, serial_s = timed(archive_scanner.scan_archives, paths)
+        config.SCAN_PARALLEL_THRESHOLD = 1
+        _, pool_s = timed(archive_scanner.scan_archives, paths, cache_dir)
+        cached, warm_s = timed(archive_scanner.scan_archives, paths, cache_dir)
+        assert [info.block_types for info in cached] == [info.block_types for info in infos]
+
+        print(f"{count} archives x {os.path.getsize(file_path) / 1e6:.1f} MB ({infos[0].block_count} blocks each)")
+        print(f"full read (baseline)   : {full_s * 1000:8.1f} ms")
+        print(f"header scan, serial    : {serial_s * 1000:8.1f} ms")
+        print(f"header scan, pool(cold): {pool_s * 1000:8.1f} ms")
+        print(f"header scan, cache hit : {warm_s * 1000:8.1f} ms")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+배치 실행 벤치마크: 워커 수별 처리량 (archives/s)
+
+샘플 아카이브를 임시 폴더에 N개 복제한 뒤 오프라인(bkp) 백엔드로 batch_runner.run_batch를 측정합니다.
+워커 수 1은 프로세스 풀 없는 순차 실행입니다. 아카이브 처리는 CPU 작업이라 1코어 머신에서는 워커를 늘려도 처리량이 늘지 않으며
+(8개, 워커 1: 1.34 archives/s, 워커 2: 1.28 archives/s), 다중 코어에서의 확장성은 아직 측정하지 않았습니다.
+
+사용법:
+    python benchmarks/bench_batch_runner.py [BKP 파일 경로] [아카이브 개수] [워커 수 ...]
+    (기본 워커 수: 1, 2, 4, ... CPU 코어 수)
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import batch_runner
+
+DEFAULT_BKP = os.path.join(ROOT, 'MIX_HEFA_20250716_after_HI_v1.bkp')
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BKP
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    cpus = os.cpu_count() or 1
+    workers = [int(arg) for arg in sys.argv[3:]] or sorted({1, cpus} | {2 ** i for i in range(cpus.bit_length()) if 2 ** i <= cpus})
+
+    work_dir = tempfile.mkdtemp(prefix='bkp_batch_bench_')
+    try:
+        paths = []
+        for i in range(count):
+            path = os.path.join(work_dir, f"scenario_{i:03d}.bkp")
+            shutil.copyfile(file_path, path)
+            paths.append(path)
+        # 메타데이터 캐시가 두 번째 측정부터 적중하지 않도록 끕니다.
+        config.ENABLE_ARCHIVE_CACHE = False
+
+        print(f"{count} archives x {os.path.getsize(file_path) / 1e6:.1f} MB, {cpus} CPU(s)")
+        baseline = None
+        for n in workers:
+            start = time.perf_counter()
+            results = batch_runner.run_batch(paths, n, 'bkp', 800.0, progress=False)
+            elapsed = time.perf_counter() - start
+            assert all(result["status"] == "ok" for result in results)
+            baseline = baseline or elapsed
+            print(f"workers={n:<3}: {elapsed:7.2f} s  {count / elapsed:6.2f} archives/s  (x{baseline / elapsed:.2f})")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+BKP 리더 메모리 벤치마크: 블록 분류 함수(parse_bkp_file_for_blocks + classify_blocks_from_bkp)의 기존 구현 vs mmap 리더
+
+- legacy: 저장소 최초 커밋의 block_classifier.py (f.read() + split('\\n') 후 블록마다 줄 단위 탐색)를 git에서 읽어 실행합니다.
+- mmap: 현재 block_classifier.py (bkp_reader.BkpArchive로 블록 레코드 구간만 디코딩)
+- mmap+index: 위에 더해 BkpArchive의 입력/결과 섹션 오프셋 테이블 전체를 만들고 블록마다 입력 문단을 디코딩합니다.
+
+각 방식을 별도 프로세스에서 실행해 peak RSS 증가량과 Python 힙 최대 할당량(tracemalloc)을 비교하고,
+기존 구현과 분류 결과가 같은지 확인합니다.
+
+사용법:
+    python benchmarks/bench_bkp_reader_memory.py [BKP 파일 경로] [복제 배수] [--legacy-rev REV]
+
+복제 배수를 주면 입력/결과 섹션을 각각 반복해 큰 합성 아카이브를 임시로 만들어 측정합니다.
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(ROOT)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, REPO)
+
+import bkp_reader
+
+DEFAULT_BKP = os.path.join(ROOT, 'MIX_HEFA_20250716_after_HI_v1.bkp')
+MODES = ('legacy', 'mmap', 'mmap+index')
+
+
+def load_legacy_classifier(rev: str) -> types.ModuleType:
+    """rev 시점의 block_classifier.py를 git에서 읽어 모듈로 만듭니다."""
+    source = subprocess.run(['git', '-C', REPO, 'show', f'{rev}:block_classifier.py'],
+                            capture_output=True, text=True, check=True).stdout
+    module = types.ModuleType('legacy_block_classifier')
+    exec(compile(source, f'{rev}:block_classifier.py', 'exec'), module.__dict__)
+    return module
+
+
+def root_revision() -> str:
+    return subprocess.run(['git', '-C', REPO, 'rev-list', '--max-parents=0', 'HEAD'],
+                          capture_output=True, text=True, check=True).stdout.split()[0]
+
+
+def run_mmap_index(file_path: str, block_names) -> None:
+    with bkp_reader.BkpArchive(file_path) as archive:
+        archive.offsets
+        for name in block_names:
+            archive.block_text(name)
+
+
+def _measure(mode: str, file_path: str, legacy_rev: str) -> None:
+    block_names = list(bkp_reader.index_block_types(file_path))
+    if mode == 'legacy':
+        classifier = load_legacy_classifier(legacy_rev)
+    else:
+        import block_classifier as classifier
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    start = time.perf_counter()
+    block_categories, _ = classifier.classify_blocks_from_bkp(file_path, block_names)
+    if mode == 'mmap+index':
+        run_mmap_index(file_path, block_names)
+    elapsed = time.perf_counter() - start
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss 단위: Linux KB
+    print(json.dumps({'elapsed': elapsed, 'heap': heap_peak, 'rss': (rss_after - rss_before) * 1024,
+                      'categories': block_categories}))
+
+
+def _make_synthetic(file_path: str, factor: int) -> str:
+    """원본 아카이브의 입력 섹션과 결과 섹션을 각각 factor배 반복한 임시 파일을 만듭니다."""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    input_start = data.find(b'\n?') + 1
+    input_end = data.find(b'GRAPHICS_BACKUP')
+    summary_start = data.find(b'\n', data.find(b'$_SUMMARY_FILE')) + 1
+    summary_end = data.find(b'$_ADS_FILE')
+    fd, path = tempfile.mkstemp(suffix='.bkp')
+    with os.fdopen(fd, 'wb') as out:
+        out.write(data[:input_start])
+        for _ in range(factor):
+            out.write(data[input_start:input_end])
+        out.write(data[input_end:summary_start])
+        for _ in range(factor):
+            out.write(data[summary_start:summary_end])
+        out.write(data[summary_end:])
+    return path
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        _measure(sys.argv[2], sys.argv[3], sys.argv[4])
+        return
+
+    args = sys.argv[1:]
+    legacy_rev = None
+    if '--legacy-rev' in args:
+        i = args.index('--legacy-rev')
+        legacy_rev = args[i + 1]
+        del args[i:i + 2]
+    legacy_rev = legacy_rev or root_revision()
+    file_path = args[0] if args else DEFAULT_BKP
+    factor = int(args[1]) if len(args) > 1 else 1
+    target = _make_synthetic(file_path, factor) if factor > 1 else file_path
+    try:
+        print(f"파일: {os.path.basename(file_path)} x{factor} ({os.path.getsize(target) / 1e6:.1f} MB), legacy = {legacy_rev[:10]}")
+        print(f"  {'mode':<11} {'time':>10} {'heap peak':>12} {'RSS delta':>12}")
+        baseline = None
+        for mode in MODES:
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, target, legacy_rev],
+                                 capture_output=True, text=True, check=True).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            baseline = baseline or result['categories']
+            match = 'same' if result['categories'] == baseline else 'DIFFERENT'
+            print(f"  {mode:<11} {result['elapsed'] * 1000:8.1f}ms {result['heap'] / 1e6:10.1f}MB {result['rss'] / 1e6:10.1f}MB  ({match} categories)")
+    finally:
+        if target != file_path:
+            os.remove(target)
+
+
+if __name__ == "__main__":
+    main()
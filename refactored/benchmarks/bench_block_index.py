@@ -0,0 +1,78 @@
+"""
+블록 분류 벤치마크: 기존 O(blocks × lines) 스캔 vs 단일 패스 인덱스
+
+사용법:
+    python benchmarks/bench_block_index.py [BKP 파일 경로] [반복 횟수]
+"""
+
+import os
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bkp_reader
+
+DEFAULT_BKP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'MIX_HEFA_20250716_after_HI_v1.bkp')
+
+CATEGORIES = bkp_reader.BKP_BLOCK_CATEGORIES
+
+
+def legacy_parse_bkp_file_for_blocks(file_path: str, block_names: List[str]) -> Dict[str, str]:
+    """기존 data_manager.parse_bkp_file_for_blocks 구현 (비교 기준)"""
+    block_info = {}
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        content = f.read()
+    lines = content.split('\n')
+    for block_name in block_names:
+        category = "Unknown"
+        for i, line in enumerate(lines):
+            if line.strip() == block_name:
+                for j in range(i + 1, min(i + 5, len(lines))):
+                    next_line = lines[j].strip()
+                    if next_line in CATEGORIES:
+                        category = next_line
+                        break
+                break
+        block_info[block_name] = category
+    return block_info
+
+
+def indexed_parse_bkp_file_for_blocks(file_path: str, block_names: List[str]) -> Dict[str, str]:
+    """단일 패스 인덱스 구현 (data_manager.parse_bkp_file_for_blocks와 동일한 조회 규칙)"""
+    block_categories = bkp_reader.index_block_categories(file_path, CATEGORIES)
+    return {name: block_categories.get(name, "Unknown") for name in block_names}
+
+
+def _time(func, *args, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BKP
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    block_names = list(bkp_reader.index_block_types(file_path).keys())
+    legacy = legacy_parse_bkp_file_for_blocks(file_path, block_names)
+    indexed = indexed_parse_bkp_file_for_blocks(file_path, block_names)
+    if legacy != indexed:
+        mismatched = [n for n in block_names if legacy.get(n) != indexed.get(n)]
+        print(f"경고: 결과 불일치 {len(mismatched)}건: {mismatched[:10]}")
+
+    t_legacy = _time(legacy_parse_bkp_file_for_blocks, file_path, block_names, repeat=repeat)
+    t_indexed = _time(indexed_parse_bkp_file_for_blocks, file_path, block_names, repeat=repeat)
+
+    print(f"파일: {os.path.basename(file_path)} ({os.path.getsize(file_path) / 1e6:.1f} MB, {len(block_names)} blocks)")
+    print(f"  legacy scan   : {t_legacy * 1000:9.2f} ms")
+    print(f"  single-pass   : {t_indexed * 1000:9.2f} ms")
+    print(f"  speedup       : {t_legacy / t_indexed:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+COM 재시도 벤치마크: 일시적 호출 오류율별 재시도/최종 실패 횟수와 결과 일치 여부
+
+오프라인(bkp) 트리를 감싸 FindNode/Value/Elements 호출이 주어진 확률로 예외를 내는 트리로
+직접 추출(extract_all_device_data + extract_all_utility_data)을 실행합니다.
+재시도 정책의 대기(sleep)는 실제로 자지 않고 합계만 기록하며, 오류가 없는 경우와 장치 레코드가 다른 수를 출력합니다.
+재시도하지 않는 경우(max_attempts=1)도 함께 측정합니다.
+
+사용법:
+    python benchmarks/bench_com_retry.py [BKP 파일 경로] [오류율 ...]
+    (기본 오류율: 0, 0.01, 0.05, 0.2)
+"""
+
+import io
+import os
+import random
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import bkp_tree
+import com_retry
+import data_manager
+
+DEFAULT_BKP = os.path.join(ROOT, 'MIX_HEFA_20250716_after_HI_v1.bkp')
+
+
+class TransientComError(Exception):
+    pass
+
+
+class FlakyNode:
+    def __init__(self, node, faults):
+        self._node = node
+        self._faults = faults
+        self.Name = node.Name
+
+    def _call(self):
+        self._faults.calls += 1
+        if self._faults.random.random() < self._faults.rate:
+            raise TransientComError("The remote procedure call failed")
+
+    @property
+    def Value(self):
+        self._call()
+        return self._node.Value
+
+    @property
+    def UnitString(self):
+        self._call()
+        return self._node.UnitString
+
+    @property
+    def Elements(self):
+        self._call()
+        return [FlakyNode(child, self._faults) for child in self._node.Elements]
+
+    def FindNode(self, path):
+        self._call()
+        node = self._node.FindNode(path)
+        return FlakyNode(node, self._faults) if node is not None else None
+
+
+class FlakyDocument:
+    def __init__(self, document, rate, seed=0):
+        self.random = random.Random(seed)
+        self.rate = rate
+        self.calls = 0
+        self.Tree = FlakyNode(document.Tree, self)
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BKP
+    rates = [float(arg) for arg in sys.argv[2:]] or [0.0, 0.01, 0.05, 0.2]
+    config.PREFETCH_BLOCK_SUBTREES = False
+    config.ENABLE_NODE_STORE = False
+    data_manager.clear_stream_table()
+    document = bkp_tree.open_document(file_path)
+
+    with redirect_stdout(io.StringIO()):
+        metadata = data_manager.load_archive_metadata(document, file_path)
+    print(f"{os.path.basename(file_path)}: {len(metadata['block_info'])} blocks")
+
+    def extract(application, max_attempts):
+        waits = []
+        data_manager.clear_aspen_cache()
+        data_manager._com_policy = com_retry.RetryPolicy(max_attempts, backoff=0.05, max_interval=0.1, sleep=waits.append)
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            devices = data_manager.extract_all_device_data(application, metadata['block_info'], metadata['unit_set'], metadata['unit_types'])
+            data_manager.extract_all_utility_data(application)
+        return devices, data_manager.get_com_retry_stats(), sum(waits)
+
+    baseline, _, _ = extract(document, 1)
+    for rate in rates:
+        for max_attempts in (1, 3):
+            application = FlakyDocument(document, rate)
+            devices, stats, waited = extract(application, max_attempts)
+            differing = sum(1 for device, expected in zip(devices, baseline) if device != expected)
+            failed_devices = sum(1 for device in devices if device.get('error'))
+            print(f"  error rate {rate:<5} attempts {max_attempts}: {application.calls:5d} calls  retries {stats['retries']:4d}  "
+                  f"failed {stats['failed']:3d}  error devices {failed_devices:3d}  differing {differing:3d}  "
+                  f"waited {waited:6.2f} s  final interval {stats['interval'] * 1000:5.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+COM 트레이스 벤치마크: 기록한 세션을 재생해 같은 추출 결과가 나오는지와 재생 속도
+
+오프라인 트리(bkp_tree, 노드 접근마다 지정한 지연)를 RecordingDocument로 감싸 메타데이터/장치/유틸리티 추출을 기록하고,
+트레이스 파일(gzip JSON)을 ReplayDocument로 다시 열어 같은 추출을 실행합니다.
+기록은 하위 트리 수집을 켠 채로 하며, 같은 설정의 재생은 누락 없이 같은 결과여야 합니다.
+하위 트리 수집을 끄고(접근 경로가 달라짐) 재생했을 때의 결과 일치 여부와 트레이스에 없던 접근 수도 출력합니다.
+
+사용법:
+    python benchmarks/bench_com_trace.py [BKP 파일 경로] [COM 호출 지연 ms]
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import bkp_tree
+import com_trace
+import data_manager
+from bench_common import LatencyDocument
+
+DEFAULT_BKP = os.path.join(ROOT, 'MIX_HEFA_20250716_after_HI_v1.bkp')
+
+
+def extract(application, file_path):
+    data_manager.clear_aspen_cache()
+    data_manager.clear_stream_table()
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        metadata = data_manager.load_archive_metadata(application, file_path)
+        devices = data_manager.extract_all_device_data(application, metadata['block_info'], metadata['unit_set'], metadata['unit_types'])
+        utilities = data_manager.extract_all_utility_data(application, metadata['unit_types'])
+        elapsed = time.perf_counter() - start
+    return (metadata, devices, utilities), elapsed
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BKP
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    config.ENABLE_ARCHIVE_CACHE = False
+    config.ENABLE_NODE_STORE = False
+    config.USE_STREAM_TABLE = False
+    config.PREFETCH_BLOCK_SUBTREES = True
+    trace_dir = tempfile.mkdtemp(prefix='com_trace_bench_')
+    trace_path = os.path.join(trace_dir, 'session.trace.json.gz')
+    try:
+        recording = com_trace.RecordingDocument(LatencyDocument(bkp_tree.open_document(file_path), latency_ms / 1000), trace_path)
+        recorded, record_s = extract(recording, file_path)
+        size = recording.save()
+
+        start = time.perf_counter()
+        replay = com_trace.open_replay(trace_path)
+        load_s = time.perf_counter() - start
+        replayed, replay_s = extract(replay, file_path)
+        assert replayed == recorded, "replayed extraction differs from the recorded session"
+        assert not replay.missing, replay.format_missing()
+
+        config.PREFETCH_BLOCK_SUBTREES = False
+        changed = com_trace.open_replay(trace_path)
+        changed_result, _ = extract(changed, file_path)
+    finally:
+        shutil.rmtree(trace_dir, ignore_errors=True)
+
+    print(f"{os.path.basename(file_path)}: COM call latency {latency_ms} ms")
+    print(f"  record : {record_s * 1000:8.1f} ms  ({recording.trace.accesses} accesses, {len(recording.trace.nodes)} paths, {size / 1e3:.1f} kB trace)")
+    print(f"  replay : {replay_s * 1000:8.1f} ms  (+{load_s * 1000:.1f} ms load, identical output, 0 misses)")
+    print(f"  replay without subtree prefetch: {'identical' if changed_result == recorded else 'different'} output")
+    print("    " + changed.format_missing(top=5).replace("\n", "\n    "))
+
+
+if __name__ == '__main__':
+    main()
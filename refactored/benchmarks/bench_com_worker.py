@@ -0,0 +1,78 @@
+"""
+COM 워커 벤치마크: 메인 스레드 직접 접근 / COM 워커 스레드 경유 추출 비교
+
+FakeComDocument(.bkp 오프라인 트리 위의 가짜 Apwn.Document, 호출마다 지연)로
+1) 메인 스레드에서 문서를 열고 추출, 2) COM 워커 스레드가 문서를 열고 추출 요청을 처리하는 경우를 측정합니다.
+워커 경우에는 문서 열기와 스트림 테이블 로드(메인 스레드)가 겹쳐 실행됩니다.
+두 경우의 추출 결과가 같은지, 워커가 소유한 문서를 메인 스레드에서 직접 호출하면 예외가 나는지 확인합니다.
+
+사용법:
+    python benchmarks/bench_com_worker.py [BKP 파일 경로] [COM 호출 지연 ms]
+"""
+
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import data_manager
+import com_worker
+
+DEFAULT_BKP = os.path.join(ROOT, 'MIX_HEFA_20250716_after_HI_v1.bkp')
+
+
+def open_fake(file_path, latency_s):
+    document = com_worker.FakeComDocument(latency_s)
+    document.InitFromArchive2(file_path)
+    return document
+
+
+def extract(application, file_path):
+    data_manager.clear_aspen_cache()
+    data_manager.load_stream_table(file_path)
+    if isinstance(application, com_worker.WorkerDocument):
+        application.wait_ready()
+    metadata = data_manager.load_archive_metadata(application, file_path)
+    devices = data_manager.extract_all_device_data(application, metadata['block_info'], metadata['unit_set'], metadata['unit_types'])
+    return metadata, devices, data_manager.extract_all_utility_data(application)
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BKP
+    latency_s = (float(sys.argv[2]) if len(sys.argv) > 2 else 0.2) / 1000
+    config.ENABLE_ARCHIVE_CACHE = False
+    config.ENABLE_NODE_STORE = False
+
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        document = open_fake(file_path, latency_s)
+        direct = extract(document, file_path)
+        direct_s = time.perf_counter() - start
+        direct_calls = document.calls
+
+        start = time.perf_counter()
+        worker_document = com_worker.open_worker_document(lambda: open_fake(file_path, latency_s))
+        via_worker = extract(worker_document, file_path)
+        worker_s = time.perf_counter() - start
+        fake = worker_document.worker.ready.result()
+        try:
+            fake.Tree
+            wrong_thread = "no error"
+        except com_worker.WrongThreadError:
+            wrong_thread = "WrongThreadError"
+        worker_document.Close()
+
+    assert via_worker == direct, "extraction through the COM worker differs from direct extraction"
+    print(f"{os.path.basename(file_path)}: COM call latency {latency_s * 1000:.2f} ms")
+    print(f"  main thread : {direct_s * 1000:8.1f} ms  ({direct_calls} COM calls)")
+    print(f"  COM worker  : {worker_s * 1000:8.1f} ms  ({fake.calls} COM calls, open overlapped with stream table load)")
+    print(f"  main-thread call on worker-owned document: {wrong_thread}")
+
+
+if __name__ == '__main__':
+    main()
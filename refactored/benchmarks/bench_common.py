@@ -0,0 +1,59 @@
+"""
+벤치마크 공용 도우미
+
+LatencyDocument: 오프라인 트리(bkp_tree)를 감싸 노드 접근마다 고정 지연을 넣고 호출 수를 세는 Application 대용
+(COM 프로세스 간 호출 비용 근사). 라이브 Aspen 문서에서는 FindNode뿐 아니라 .Value/.Elements/.Name 등
+노드 속성 접근 하나하나가 프로세스 간 호출이므로 모두 호출 한 번으로 셉니다.
+벤치마크 스크립트끼리 서로 import하지 않도록 여기에 둡니다.
+"""
+
+import time
+
+
+class LatencyNode:
+    """노드 래퍼. FindNode와 모든 속성 접근(Value, Elements, Name, UnitString 등)에 지연을 넣고 트리의 호출 수에 더합니다."""
+    def __init__(self, node, tree: "LatencyTree"):
+        self._node = node
+        self._tree = tree
+
+    def FindNode(self, path):
+        self._tree.charge('FindNode')
+        node = self._node.FindNode(path)
+        return LatencyNode(node, self._tree) if node is not None else None
+
+    @property
+    def Elements(self):
+        self._tree.charge('Elements')
+        return [LatencyNode(child, self._tree) for child in self._node.Elements]
+
+    def __getattr__(self, name):
+        attribute = getattr(self._node, name)  # 없는 속성(AttributeError)은 호출로 세지 않습니다.
+        self._tree.charge(name)
+        return attribute
+
+
+class LatencyTree(LatencyNode):
+    """
+    루트 트리 래퍼 (COM 프로세스 간 호출 비용 근사)
+    calls: 전체 호출 수, by_op: 접근 종류별 호출 수 {'FindNode': n, 'Value': n, 'Elements': n, 'Name': n, ...}
+    """
+    def __init__(self, tree, latency_s: float):
+        super().__init__(tree, self)
+        self._latency_s = latency_s
+        self.calls = 0
+        self.by_op = {}
+
+    def charge(self, op: str) -> None:
+        self.calls += 1
+        self.by_op[op] = self.by_op.get(op, 0) + 1
+        if self._latency_s:
+            time.sleep(self._latency_s)
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.by_op = {}
+
+
+class LatencyDocument:
+    def __init__(self, document, latency_s: float):
+        self.Tree = LatencyTree(document.Tree, latency_s)
@@ -0,0 +1,62 @@
+"""
+문서 풀 병렬 추출 벤치마크: 워커 수별 장치 추출 시간
+
+가짜 COM 문서(com_worker.FakeComDocument, 호출마다 지연)를 opener로 써서 document_pool.extract_device_data_parallel을
+워커 수를 바꿔 가며 실행하고, 한 문서로 순차 추출한 결과와 같은지(병합 순서 포함) 확인합니다.
+측정 시간에는 워커마다 아카이브를 여는 시간이 포함됩니다.
+워커 수는 document_pool.resolve_workers로 config.MAX_EXTRACTION_WORKERS까지 제한됩니다.
+1코어 머신에서는 워커들이 COM 호출 지연(sleep)을 겹치는 효과만 나타나므로, 다중 코어 확장성은 여러 코어에서 따로 측정해야 합니다.
+
+사용법:
+    python benchmarks/bench_document_pool.py [BKP 파일 경로] [COM 호출 지연 ms] [워커 수 ...]
+"""
+
+import functools
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import data_manager
+import com_worker
+import document_pool
+
+DEFAULT_BKP = os.path.join(ROOT, 'MIX_HEFA_20250716_after_HI_v1.bkp')
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BKP
+    latency_s = (float(sys.argv[2]) if len(sys.argv) > 2 else 1.0) / 1000
+    workers = [int(arg) for arg in sys.argv[3:]] or [1, 2, 4]
+    config.ENABLE_ARCHIVE_CACHE = False
+    config.ENABLE_NODE_STORE = False
+    opener = functools.partial(com_worker.open_fake_document, latency=latency_s)
+
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        document = opener(file_path)
+        metadata = data_manager.load_archive_metadata(document, file_path)
+        data_manager.load_stream_table(file_path)
+        baseline = data_manager.extract_all_device_data(document, metadata['block_info'], metadata['unit_set'], metadata['unit_types'])
+        sequential_s = time.perf_counter() - start
+
+    print(f"{os.path.basename(file_path)}: {len(metadata['block_info'])} blocks, COM call latency {latency_s * 1000:.2f} ms, {os.cpu_count()} CPU(s)")
+    print(f"  sequential : {sequential_s * 1000:8.1f} ms")
+    for n in workers:
+        n = document_pool.resolve_workers(n)
+        shards = document_pool.shard_blocks(metadata['block_info'], n)
+        start = time.perf_counter()
+        devices = document_pool.extract_device_data_parallel(file_path, metadata['block_info'], metadata['unit_set'],
+                                                             metadata['unit_types'], workers=n, opener=opener)
+        elapsed = time.perf_counter() - start
+        assert devices == baseline, f"{n}-worker extraction differs from sequential extraction"
+        print(f"  workers={n:<3}: {elapsed * 1000:8.1f} ms  (x{sequential_s / elapsed:.2f}, shard sizes {[len(shard) for shard in shards]})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+스냅샷 읽기 벤치마크: 장치 데이터 추출의 COM 호출 수
+(직접 추출 / 블록 하위 트리 일괄 수집)
+
+저장된 흐름도(.bkp)의 오프라인 트리(bkp_tree)를 Application으로 사용해 extract_all_device_data를 실행하고
+COM 호출 수와 시간을 비교합니다. 라이브 문서에서는 FindNode뿐 아니라 .Value/.Elements/.Name 접근도 각각 프로세스 간 호출이므로
+모두 세고(bench_common.LatencyDocument) 종류별 수도 출력합니다. 호출마다 지정한 지연(ms)을 넣어 COM 왕복 비용을 흉내 낼 수 있습니다.
+모든 방식의 추출 결과가 같은지 확인하며, 스트림 테이블/토폴로지 그래프/노드 저장소는 끈 상태로
+노드 캐시를 켠 경우와 끈 경우(MAX_CACHE_SIZE = 0)를 각각 측정합니다.
+
+사용법:
+    python benchmarks/bench_extraction_plan.py [BKP 파일 경로 ...] [--latency ms]
+"""
+
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import bkp_tree
+import data_manager
+from bench_common import LatencyDocument
+
+DEFAULT_BKPS = [os.path.join(ROOT, 'MIX_HEFA_20250716_after_HI_v1.bkp'),
+                os.path.join(ROOT, 'Equipment_cost_estimation_aspen.bkp')]
+
+
+MODES = (
+    ('direct', False),
+    ('prefetch', True),
+)
+
+
+def run(application, metadata, prefetch, cache_size):
+    config.PREFETCH_BLOCK_SUBTREES = prefetch
+    data_manager._aspen_cache.max_size = cache_size
+    data_manager.clear_aspen_cache()
+    application.Tree.reset()
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        devices = data_manager.extract_all_device_data(application, metadata['block_info'], metadata['unit_set'], metadata['unit_types'])
+        elapsed = time.perf_counter() - start
+    return devices, elapsed, application.Tree.calls, dict(application.Tree.by_op)
+
+
+def format_ops(by_op):
+    return ', '.join(f"{op} {count}" for op, count in sorted(by_op.items(), key=lambda item: -item[1]))
+
+
+def main():
+    args = sys.argv[1:]
+    latency_ms = 0.0
+    if '--latency' in args:
+        i = args.index('--latency')
+        latency_ms = float(args[i + 1])
+        del args[i:i + 2]
+    config.USE_STREAM_TABLE = False
+    config.USE_TOPOLOGY_GRAPH = False
+    config.ENABLE_NODE_STORE = False
+    data_manager.clear_stream_table()
+    default_cache_size = data_manager._aspen_cache.max_size
+
+    for file_path in args or DEFAULT_BKPS:
+        application = LatencyDocument(bkp_tree.open_document(file_path), latency_ms / 1000)
+        with redirect_stdout(io.StringIO()):
+            metadata = data_manager.load_archive_metadata(application, file_path)
+
+        print(f"{os.path.basename(file_path)}: {len(metadata['block_info'])} blocks, COM call latency {latency_ms} ms")
+        baseline = None
+        for cache_label, cache_size in (('node cache on', default_cache_size), ('node cache off', 0)):
+            print(f"  [{cache_label}]")
+            for label, prefetch in MODES:
+                devices, elapsed, calls, by_op = run(application, metadata, prefetch, cache_size)
+                baseline = baseline or devices
+                assert devices == baseline, f"{label} extraction differs from direct extraction"
+                print(f"    {label:<9}: {calls:5d} COM calls  {elapsed * 1000:8.1f} ms  ({format_ops(by_op)})")
+    data_manager._aspen_cache.max_size = default_cache_size
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+지연 장치 추출 벤치마크: 일부 장치만 볼 때와 전체를 순회할 때의 COM 호출 수/시간
+
+synthetic_flowsheet로 만든 플로우시트를 가짜 COM 문서(호출마다 지정한 지연)로 열어
+extract_all_device_data(전체 추출)와 extract_device_data_lazy(처음 접근할 때 추출)를 비교합니다.
+지연 목록은 앞 장치 몇 개만 읽었을 때의 호출 수와, 전체를 순회(materialize)했을 때의 호출 수/결과 일치 여부를 출력합니다.
+
+사용법:
+    python benchmarks/bench_lazy_devices.py [블록 수] [--latency ms] [--peek n] [--seed n]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stderr, redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import data_manager
+import synthetic_flowsheet
+
+
+def open_document(flowsheet, latency_s):
+    data_manager.clear_aspen_cache()
+    data_manager.clear_stream_table()
+    data_manager.clear_topology()
+    return synthetic_flowsheet.open_synthetic_document(flowsheet, latency_s)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('size', nargs='?', type=int, default=3000)
+    parser.add_argument('--latency', type=float, default=0.0, help='COM 호출당 지연(ms)')
+    parser.add_argument('--peek', type=int, default=20, help='지연 목록에서 읽어 볼 앞 장치 수')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    config.ENABLE_NODE_STORE = False
+    config.ENABLE_ARCHIVE_CACHE = False
+    latency_s = args.latency / 1000
+
+    flowsheet = synthetic_flowsheet.generate_flowsheet(args.size, args.seed)
+    metadata = flowsheet.metadata()
+    block_info, unit_set, unit_types = metadata['block_info'], metadata['unit_set'], metadata['unit_types']
+
+    with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        application = open_document(flowsheet, latency_s)
+        start = time.perf_counter()
+        eager = data_manager.extract_all_device_data(application, block_info, unit_set, unit_types)
+        eager_s, eager_calls = time.perf_counter() - start, application.calls
+
+        application = open_document(flowsheet, latency_s)
+        start = time.perf_counter()
+        devices = data_manager.extract_device_data_lazy(application, block_info, unit_set, unit_types)
+        init_s, init_calls = time.perf_counter() - start, application.calls
+        start = time.perf_counter()
+        peeked = [device.copy() for device in devices[:args.peek]]
+        names = [device['name'] for device in devices]
+        peek_s, peek_calls = time.perf_counter() - start, application.calls - init_calls
+        start = time.perf_counter()
+        lazy = devices.materialize()
+        full_s, full_calls = time.perf_counter() - start, application.calls
+
+    assert peeked == eager[:args.peek] and names == [device['name'] for device in eager]
+    assert lazy == eager, "lazy extraction differs from eager extraction"
+    print(f"Synthetic flowsheet: {args.size} blocks (seed {args.seed}, COM latency {args.latency} ms, "
+          f"readahead {getattr(config, 'LAZY_EXTRACTION_READAHEAD', 1)})")
+    print(f"  eager extraction      : {eager_s * 1000:9.1f} ms  {eager_calls:8d} calls")
+    print(f"  lazy list             : {init_s * 1000:9.1f} ms  {init_calls:8d} calls  (non-node records only)")
+    print(f"  lazy, first {args.peek:4d} + names: {peek_s * 1000:9.1f} ms  {peek_calls:8d} calls")
+    print(f"  lazy, all devices     : {full_s * 1000:9.1f} ms  {full_calls:8d} calls  (identical devices)")
+
+
+if __name__ == '__main__':
+    main()
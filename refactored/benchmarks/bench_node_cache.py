@@ -0,0 +1,120 @@
+"""
+노드 캐시 벤치마크: 캐시 크기별 FindNode/Value 호출 수와 적중/실패/제거 횟수
+
+하위 트리 수집/토폴로지 그래프/스트림 테이블/노드 저장소를 끈 직접 추출
+(extract_all_device_data + extract_all_utility_data)을 캐시 크기(MAX_CACHE_SIZE)를 바꿔 가며 실행하고,
+마지막 크기의 경로 접두사별 통계를 출력합니다. 캐시 크기 0은 캐시를 끈 기준선입니다.
+이어서 실행 세대를 올린(시뮬레이션 재실행) 뒤 재추출해 결과(Output) 노드만 다시 읽는지 봅니다.
+모든 경우 추출 결과가 같은지 확인합니다.
+
+사용법:
+    python benchmarks/bench_node_cache.py [BKP 파일 경로] [캐시 크기 ...]
+    (기본 캐시 크기: 0, 무제한, 1000, 100, 20)
+"""
+
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import bkp_tree
+import data_manager
+
+DEFAULT_BKP = os.path.join(ROOT, 'MIX_HEFA_20250716_after_HI_v1.bkp')
+
+
+class CountingNode:
+    """Value 읽기를 세는 노드 래퍼"""
+    def __init__(self, node, tree):
+        self._node = node
+        self._tree = tree
+        self.Name = node.Name
+
+    @property
+    def Value(self):
+        self._tree.value_reads += 1
+        return self._node.Value
+
+    @property
+    def Elements(self):
+        return [CountingNode(child, self._tree) for child in self._node.Elements]
+
+
+class CountingTree:
+    """FindNode 호출 수(calls)와 돌려준 노드의 Value 읽기 수(value_reads)를 세는 트리 래퍼"""
+    def __init__(self, tree):
+        self._tree = tree
+        self.calls = 0
+        self.value_reads = 0
+
+    def FindNode(self, path):
+        self.calls += 1
+        node = self._tree.FindNode(path)
+        return CountingNode(node, self) if node is not None else None
+
+
+class CountingDocument:
+    def __init__(self, document):
+        self.Tree = CountingTree(document.Tree)
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BKP
+    sizes = [int(arg) for arg in sys.argv[2:]] or [0, None, 1000, 100, 20]
+    config.PREFETCH_BLOCK_SUBTREES = False
+    config.USE_TOPOLOGY_GRAPH = False
+    config.USE_STREAM_TABLE = False
+    config.ENABLE_NODE_STORE = False
+    data_manager.clear_stream_table()
+
+    application = CountingDocument(bkp_tree.open_document(file_path))
+    with redirect_stdout(io.StringIO()):
+        metadata = data_manager.load_archive_metadata(application, file_path)
+
+    print(f"{os.path.basename(file_path)}: {len(metadata['block_info'])} blocks")
+
+    def extract():
+        application.Tree.calls = 0
+        application.Tree.value_reads = 0
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = (data_manager.extract_all_device_data(application, metadata['block_info'], metadata['unit_set'], metadata['unit_types']),
+                      data_manager.extract_all_utility_data(application))
+        return result, time.perf_counter() - start
+
+    baseline = None
+    for size in sizes:
+        data_manager._aspen_cache.max_size = size
+        data_manager.clear_aspen_cache()
+        result, elapsed = extract()
+        baseline = baseline or result
+        assert result == baseline, f"extraction differs with cache size {size}"
+        stats = data_manager.get_cache_stats()
+        print(f"  max_size={str(size):<5}: {application.Tree.calls:4d} FindNode  {application.Tree.value_reads:4d} Value  {elapsed * 1000:7.1f} ms  "
+              f"hits {stats['hits']:4d}  misses {stats['misses']:4d}  evictions {stats['evictions']:4d}  hit rate {stats['hit_rate']:.0%}")
+
+    print("  by prefix (last run):")
+    for prefix, counters in stats['by_prefix'].items():
+        print(f"    {prefix:<32} hits {counters['hits']:4d}  misses {counters['misses']:4d}  evictions {counters['evictions']:4d}")
+
+    data_manager._aspen_cache.max_size = None
+    data_manager.clear_aspen_cache()
+    extract()
+    for label in ('re-extract', 'after rerun'):
+        if label == 'after rerun':
+            data_manager.advance_run_generation()
+        before = data_manager.get_cache_stats()
+        result, elapsed = extract()
+        assert result == baseline, f"{label} extraction differs"
+        stats = data_manager.get_cache_stats()
+        print(f"  {label:<15}: {application.Tree.calls:4d} FindNode  {application.Tree.value_reads:4d} Value  {elapsed * 1000:7.1f} ms  "
+              f"invalidated {stats['invalidations'] - before['invalidations']:4d}  (generation {stats['generation']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+노드 저장소 벤치마크: 같은 아카이브를 다시 열었을 때의 COM 호출 수 (FindNode/Value/Elements/Name)
+
+세션(문서 열기 → 메타데이터 → 장치/유틸리티 추출 → 저장소 저장)을 저장소 없이 한 번, 저장소를 켜고
+첫 세션(cold)과 두 번째 세션(warm)으로 실행해 COM 호출 수와 시간을 비교합니다.
+저장소는 임시 디렉토리에 만들고, 모든 세션의 추출 결과가 같은지 확인합니다.
+메타데이터 디스크 캐시와 스트림 테이블은 끈 상태로 측정합니다.
+
+사용법:
+    python benchmarks/bench_node_store.py [BKP 파일 경로 ...] [--latency ms]
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import bkp_tree
+import data_manager
+from bench_common import LatencyDocument
+
+DEFAULT_BKPS = [os.path.join(ROOT, 'MIX_HEFA_20250716_after_HI_v1.bkp'),
+                os.path.join(ROOT, 'Equipment_cost_estimation_aspen.bkp')]
+
+
+def session(file_path, latency_s, use_store):
+    config.ENABLE_NODE_STORE = use_store
+    with redirect_stdout(io.StringIO()):
+        application = data_manager.connect_to_aspen(file_path, backend='bkp')
+        application = LatencyDocument(application, latency_s)
+        start = time.perf_counter()
+        data_manager.open_node_store(application, file_path)
+        metadata = data_manager.load_archive_metadata(application, file_path)
+        devices = data_manager.extract_all_device_data(application, metadata['block_info'], metadata['unit_set'], metadata['unit_types'])
+        utilities = data_manager.extract_all_utility_data(application)
+        data_manager.save_node_store()
+        elapsed = time.perf_counter() - start
+    return (metadata, devices, utilities), elapsed, application.Tree.calls
+
+
+def main():
+    args = sys.argv[1:]
+    latency_ms = 0.0
+    if '--latency' in args:
+        i = args.index('--latency')
+        latency_ms = float(args[i + 1])
+        del args[i:i + 2]
+    config.ENABLE_ARCHIVE_CACHE = False
+    config.USE_STREAM_TABLE = False
+    data_manager.clear_stream_table()
+    store_dir = tempfile.mkdtemp(prefix='bkp_node_store_bench_')
+    config.ARCHIVE_CACHE_DIR = store_dir
+    try:
+        for file_path in args or DEFAULT_BKPS:
+            print(f"{os.path.basename(file_path)}: COM call latency {latency_ms} ms")
+            baseline = None
+            for label, use_store in (('no store', False), ('store cold', True), ('store warm', True)):
+                result, elapsed, calls = session(file_path, latency_ms / 1000, use_store)
+                baseline = baseline or result
+                assert result == baseline, f"{label} extraction differs"
+                print(f"  {label:<11}: {calls:5d} COM calls  {elapsed * 1000:8.1f} ms")
+        print(f"  store size: {os.path.getsize(os.path.join(store_dir, config.NODE_STORE_FILE)) / 1e3:.0f} kB")
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
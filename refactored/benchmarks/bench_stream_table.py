@@ -0,0 +1,64 @@
+"""
+스트림 결과 테이블 벤치마크: 장치 데이터 추출 (노드 조회 vs .bkp 스트림 테이블 vs 트리 스트림 테이블)
+
+오프라인 트리(bkp_tree)를 Application으로 사용해 extract_all_device_data를 측정합니다.
+COM 왕복 비용을 흉내 내기 위해 노드 접근(FindNode/Value/Elements/Name)마다 지정한 지연(ms)을 넣고 호출 수를 셉니다.
+테이블 모드는 스트림 테이블 로드(.bkp 결과 섹션 또는 \Data\Streams 순회) 시간을 포함하며, 세 모드의 추출 결과가 같은지 확인합니다.
+
+사용법:
+    python benchmarks/bench_stream_table.py [BKP 파일 경로] [COM 호출 지연 ms]
+"""
+
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import bkp_tree
+import data_manager
+from bench_common import LatencyDocument
+
+DEFAULT_BKP = os.path.join(ROOT, 'MIX_HEFA_20250716_after_HI_v1.bkp')
+
+
+def run(application, file_path, metadata, table):
+    data_manager.clear_stream_table()
+    data_manager.clear_aspen_cache()
+    config.USE_STREAM_TABLE = table is not None
+    application.Tree.reset()
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        if table == 'bkp':
+            data_manager.load_stream_table(file_path)
+        devices = data_manager.extract_all_device_data(application, metadata['block_info'], metadata['unit_set'], metadata['unit_types'])
+        elapsed = time.perf_counter() - start
+    return devices, elapsed, application.Tree.calls
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BKP
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+
+    application = LatencyDocument(bkp_tree.open_document(file_path), latency_ms / 1000)
+    with redirect_stdout(io.StringIO()):
+        metadata = data_manager.load_archive_metadata(application, file_path)
+
+    nodes, nodes_s, nodes_calls = run(application, file_path, metadata, table=None)
+    table, table_s, table_calls = run(application, file_path, metadata, table='bkp')
+    tree, tree_s, tree_calls = run(application, file_path, metadata, table='tree')
+    assert nodes == table, "stream table results differ from node lookups"
+    assert nodes == tree, "tree stream table results differ from node lookups"
+
+    print(f"{os.path.basename(file_path)}: {len(nodes)} devices, COM call latency {latency_ms} ms")
+    print(f"node lookups       : {nodes_s * 1000:8.1f} ms  ({nodes_calls} COM calls)")
+    print(f"stream table (bkp) : {table_s * 1000:8.1f} ms  ({table_calls} COM calls)")
+    print(f"stream table (tree): {tree_s * 1000:8.1f} ms  ({tree_calls} COM calls)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+스트리밍 토크나이저 메모리 벤치마크: 파일 크기별 peak 메모리 (f.read() vs bkp_reader.iter_records)
+
+샘플 아카이브의 입력 섹션과 결과 섹션을 반복해 지정한 크기(MB)들의 합성 아카이브를 만들고,
+각 방식을 별도 프로세스에서 실행해 peak RSS 증가량과 Python 힙 최대 할당량(tracemalloc)을 측정합니다.
+iter_records는 파일 크기가 커져도 메모리가 일정해야 합니다.
+
+사용법:
+    python benchmarks/bench_stream_tokenizer.py [BKP 파일 경로] [크기 MB ...]
+    (기본: 50 150 500)
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import bkp_reader
+
+DEFAULT_BKP = os.path.join(ROOT, 'MIX_HEFA_20250716_after_HI_v1.bkp')
+
+
+def run_read(file_path: str) -> int:
+    """비교 기준: 파일 전체를 읽어 결과 레코드 첫 줄을 정규식으로 찾음"""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    return sum(1 for _ in bkp_reader._SUMMARY_RECORD_RE.finditer(data))
+
+
+def run_stream(file_path: str) -> int:
+    """스트리밍 토크나이저로 파일 끝까지 모든 레코드를 소비"""
+    return sum(1 for record in bkp_reader.iter_records(file_path) if isinstance(record, bkp_reader.SummaryRecord))
+
+
+def _measure(mode: str, file_path: str) -> None:
+    func = run_read if mode == 'read' else run_stream
+    # 시간/RSS는 추적 없이 측정하고, 힙 최대 할당량은 tracemalloc을 켠 두 번째 실행에서 측정합니다.
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    count = func(file_path)
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    func(file_path)
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # ru_maxrss 단위: Linux KB
+    print(f"{mode} {elapsed:.4f} {heap_peak} {(rss_after - rss_before) * 1024} {count}")
+
+
+def _make_synthetic(file_path: str, size_mb: int) -> str:
+    """입력/결과 섹션을 반복해 약 size_mb 크기의 임시 아카이브를 씁니다 (원본만 메모리에 올림)."""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    input_start = data.find(b'\n?') + 1
+    input_end = data.find(b'GRAPHICS_BACKUP')
+    summary_start = data.find(b'\n', data.find(b'$_SUMMARY_FILE')) + 1
+    summary_end = data.find(b'$_ADS_FILE')
+    repeated = (input_end - input_start) + (summary_end - summary_start)
+    factor = max(1, (size_mb * 10**6 - len(data)) // repeated + 1)
+    fd, path = tempfile.mkstemp(suffix='.bkp')
+    with os.fdopen(fd, 'wb') as out:
+        out.write(data[:input_start])
+        for _ in range(factor):
+            out.write(data[input_start:input_end])
+        out.write(data[input_end:summary_start])
+        for _ in range(factor):
+            out.write(data[summary_start:summary_end])
+        out.write(data[summary_end:])
+    return path
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        _measure(sys.argv[2], sys.argv[3])
+        return
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BKP
+    sizes = [int(arg) for arg in sys.argv[2:]] or [50, 150, 500]
+    print(f"원본: {os.path.basename(file_path)}")
+    print(f"  {'size':>8} {'mode':<7} {'time':>10} {'heap peak':>12} {'RSS delta':>12} {'records':>9}")
+    for size_mb in sizes:
+        target = _make_synthetic(file_path, size_mb)
+        try:
+            for mode in ('read', 'stream'):
+                out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, target],
+                                     capture_output=True, text=True, check=True).stdout.split()
+                _, elapsed, heap, rss, count = out
+                print(f"  {os.path.getsize(target) / 1e6:6.0f}MB {mode:<7} {float(elapsed):8.2f}s "
+                      f"{int(heap) / 1e6:10.1f}MB {int(rss) / 1e6:10.1f}MB {int(count):>9}")
+        finally:
+            os.remove(target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+합성 플로우시트 규모 벤치마크: 블록 수에 따른 장치 추출/비용 계산 시간과 COM 호출 수
+
+synthetic_flowsheet로 만든 블록 N개짜리 플로우시트를 가짜 COM 문서(호출마다 지정한 지연)로 열어
+extract_all_device_data + calculate_all_costs_with_data를 그대로 실행합니다.
+가장 작은 크기에서는 하위 트리 수집/토폴로지 그래프/스트림 테이블을 모두 끈 직접 추출과
+장치 데이터가 같은지 확인합니다.
+
+사용법:
+    python benchmarks/bench_synthetic_scale.py [블록 수 ...] [--latency ms] [--seed n] [--unit-set SI|ENG|MET]
+    (기본 블록 수: 300, 3000, 30000)
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import redirect_stderr, redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config
+import cost_calculator
+import data_manager
+import synthetic_flowsheet
+
+OPTIMIZATIONS = ('PREFETCH_BLOCK_SUBTREES', 'USE_TOPOLOGY_GRAPH', 'USE_STREAM_TABLE')
+
+
+def extract(flowsheet, latency_s):
+    data_manager.clear_aspen_cache()
+    data_manager.clear_stream_table()
+    data_manager.clear_topology()
+    application = synthetic_flowsheet.open_synthetic_document(flowsheet, latency_s)
+    metadata = flowsheet.metadata()
+    with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        start = time.perf_counter()
+        devices = data_manager.extract_all_device_data(application, metadata['block_info'], metadata['unit_set'], metadata['unit_types'])
+        extract_s = time.perf_counter() - start
+        start = time.perf_counter()
+        costs = cost_calculator.calculate_all_costs_with_data(devices, cost_calculator.CEPCIOptions(), application)
+        cost_s = time.perf_counter() - start
+    return devices, costs, application.calls, extract_s, cost_s
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('sizes', nargs='*', type=int, default=[300, 3000, 30000])
+    parser.add_argument('--latency', type=float, default=0.0, help='COM 호출당 지연(ms)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--unit-set', default='SI')
+    args = parser.parse_args()
+    config.ENABLE_NODE_STORE = False
+    config.ENABLE_ARCHIVE_CACHE = False
+    latency_s = args.latency / 1000
+
+    print(f"Synthetic flowsheets (seed {args.seed}, unit set {args.unit_set}, COM latency {args.latency} ms)")
+    for i, size in enumerate(sorted(args.sizes)):
+        start = time.perf_counter()
+        flowsheet = synthetic_flowsheet.generate_flowsheet(size, args.seed, args.unit_set)
+        generate_s = time.perf_counter() - start
+        devices, costs, calls, extract_s, cost_s = extract(flowsheet, latency_s)
+
+        if i == 0:
+            saved = {name: getattr(config, name) for name in OPTIMIZATIONS}
+            for name in OPTIMIZATIONS:
+                setattr(config, name, False)
+            try:
+                direct, _, direct_calls, _, _ = extract(flowsheet, latency_s)
+            finally:
+                for name, value in saved.items():
+                    setattr(config, name, value)
+            assert direct == devices, "optimized extraction differs from direct extraction"
+            print(f"  direct extraction ({size} blocks): identical devices, {direct_calls} calls vs {calls}")
+
+        errors = Counter(result['category'] for result in costs['results'] if result.get('error'))
+        print(f"  {size:6d} blocks {len(flowsheet.stream_names):6d} streams: generate {generate_s:6.2f} s  "
+              f"extract {extract_s:7.2f} s ({calls} calls, {calls / size:.1f}/block)  cost {cost_s:6.2f} s  "
+              f"total ${costs['total_bare_module_cost']:,.0f}  errors {dict(errors)}")
+
+
+if __name__ == '__main__':
+    main()
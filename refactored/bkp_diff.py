@@ -0,0 +1,208 @@
+"""
+BKP 아카이브 블록/스트림 단위 비교(diff) 모듈
+
+두 .bkp 아카이브(또는 이전 실행 때 저장해 둔 지문)를 섹션 단위로 비교해
+추가/삭제/모델 변경(retyped)/내용 변경된 블록과 스트림을 찾고,
+다시 추출·계산해야 하는 장치(블록) 집합을 계산합니다.
+이전 실행의 추출/비용 결과는 RunSnapshot으로 저장해 변경되지 않은 장치에 재사용합니다.
+"""
+
+from typing import Optional, Dict, List, Set, Tuple, Any
+from dataclasses import dataclass, field
+import hashlib
+import os
+import pickle
+
+import bkp_reader
+
+# =============================================================================
+# 아카이브 지문
+# =============================================================================
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+@dataclass
+class ArchiveFingerprint:
+    """
+    아카이브의 섹션별 해시 요약. 원본 파일 없이도 이후 아카이브와 비교할 수 있습니다.
+    - blocks: {블록: (모델 타입, 입력 섹션 해시, 결과 섹션 해시)}
+    - streams / utilities: {이름: (입력 섹션 해시, 결과 섹션 해시)}
+    - connections: {블록: ((스트림, 포트, 방향), ...)}
+    - block_utilities: {블록: 입력에서 참조하는 유틸리티 이름들}
+    - setup: SETUP 문단(단위 세트 등) 해시
+    """
+    blocks: Dict[str, Tuple[str, str, str]] = field(default_factory=dict)
+    streams: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    utilities: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    connections: Dict[str, Tuple[Tuple[str, str, str], ...]] = field(default_factory=dict)
+    block_utilities: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    setup: str = ''
+
+def _section_digests(archive: bkp_reader.BkpArchive, kind: str, name: str) -> Tuple[str, str]:
+    return (_digest(archive.section_bytes(kind, name, bkp_reader.SECTION_INPUT)),
+            _digest(archive.section_bytes(kind, name, bkp_reader.SECTION_RESULTS)))
+
+def _referenced_utilities(block_text: str) -> Tuple[str, ...]:
+    """블록 입력에서 UTILITY-ID / COOLER-UTL 처럼 유틸리티를 가리키는 키워드 값들"""
+    names: Set[str] = set()
+    _, sentences = bkp_reader.parse_input_paragraph(block_text)
+    for sentence in sentences:
+        for row in sentence.rows:
+            for entry in row:
+                if ('UTL' in entry.key or 'UTILITY' in entry.key) and isinstance(entry.value, str):
+                    names.add(entry.value)
+    return tuple(sorted(names))
+
+def fingerprint_archive(file_path: str) -> ArchiveFingerprint:
+    """.bkp 파일의 섹션별 해시 지문을 만듭니다."""
+    fingerprint = ArchiveFingerprint()
+    with bkp_reader.BkpArchive(file_path) as archive:
+        for name, model in archive.block_types.items():
+            input_digest, results_digest = _section_digests(archive, 'block', name)
+            fingerprint.blocks[name] = (model, input_digest, results_digest)
+            fingerprint.block_utilities[name] = _referenced_utilities(archive.block_text(name))
+        for name in archive.stream_names():
+            fingerprint.streams[name] = _section_digests(archive, 'stream', name)
+        for name in archive.utility_names():
+            fingerprint.utilities[name] = _section_digests(archive, 'utility', name)
+        fingerprint.connections = {block: tuple(ports) for block, ports in archive.block_connections().items()}
+        setup_text = ''.join(text for _, text in archive.paragraphs('SETUP'))
+        fingerprint.setup = _digest(setup_text.encode('utf-8'))
+    return fingerprint
+
+# =============================================================================
+# 비교
+# =============================================================================
+
+@dataclass
+class ArchiveDiff:
+    """두 지문의 차이. changed_* 는 {이름: 변경된 섹션 목록}"""
+    added_blocks: List[str] = field(default_factory=list)
+    removed_blocks: List[str] = field(default_factory=list)
+    retyped_blocks: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    changed_blocks: Dict[str, List[str]] = field(default_factory=dict)
+    added_streams: List[str] = field(default_factory=list)
+    removed_streams: List[str] = field(default_factory=list)
+    changed_streams: Dict[str, List[str]] = field(default_factory=dict)
+    changed_utilities: List[str] = field(default_factory=list)
+    setup_changed: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added_blocks or self.removed_blocks or self.retyped_blocks or self.changed_blocks
+                    or self.added_streams or self.removed_streams or self.changed_streams
+                    or self.changed_utilities or self.setup_changed)
+
+    def affected_blocks(self, new: ArchiveFingerprint) -> Set[str]:
+        """
+        다시 추출해야 하는 블록 집합.
+        블록 자체의 변경 외에, 연결된 스트림(입출구 온도/압력)이나 참조하는 유틸리티가 바뀐 블록도 포함하며,
+        SETUP(단위 세트)이 바뀌면 모든 블록을 다시 추출합니다.
+        """
+        if self.setup_changed:
+            return set(new.blocks)
+        affected = set(self.added_blocks) | set(self.retyped_blocks) | set(self.changed_blocks)
+        streams = set(self.added_streams) | set(self.removed_streams) | set(self.changed_streams)
+        utilities = set(self.changed_utilities)
+        for block in new.blocks:
+            if streams and any(stream in streams for stream, _, _ in new.connections.get(block, ())):
+                affected.add(block)
+            if utilities and utilities.intersection(new.block_utilities.get(block, ())):
+                affected.add(block)
+        return affected
+
+    def summary_lines(self) -> List[str]:
+        lines = []
+        if self.setup_changed:
+            lines.append("SETUP (units) changed")
+        for label, names in (("Blocks added", self.added_blocks), ("Blocks removed", self.removed_blocks),
+                             ("Streams added", self.added_streams), ("Streams removed", self.removed_streams),
+                             ("Utilities changed", self.changed_utilities)):
+            if names:
+                lines.append(f"{label}: {', '.join(names)}")
+        for name, (old_model, new_model) in self.retyped_blocks.items():
+            lines.append(f"Block retyped: {name} ({old_model} -> {new_model})")
+        for label, changed in (("Block changed", self.changed_blocks), ("Stream changed", self.changed_streams)):
+            for name, sections in changed.items():
+                lines.append(f"{label}: {name} ({', '.join(sections)})")
+        return lines
+
+_SECTION_LABELS = ('input', 'results')
+
+def diff_fingerprints(old: ArchiveFingerprint, new: ArchiveFingerprint) -> ArchiveDiff:
+    """두 지문을 블록/스트림/유틸리티 단위로 비교합니다."""
+    diff = ArchiveDiff(setup_changed=old.setup != new.setup)
+
+    diff.added_blocks = [name for name in new.blocks if name not in old.blocks]
+    diff.removed_blocks = [name for name in old.blocks if name not in new.blocks]
+    for name, (model, *digests) in new.blocks.items():
+        if name not in old.blocks:
+            continue
+        old_model, *old_digests = old.blocks[name]
+        if old_model != model:
+            diff.retyped_blocks[name] = (old_model, model)
+            continue
+        sections = [label for label, a, b in zip(_SECTION_LABELS, old_digests, digests) if a != b]
+        if old.connections.get(name) != new.connections.get(name):
+            sections.append('connections')
+        if sections:
+            diff.changed_blocks[name] = sections
+
+    diff.added_streams = [name for name in new.streams if name not in old.streams]
+    diff.removed_streams = [name for name in old.streams if name not in new.streams]
+    for name, digests in new.streams.items():
+        if name in old.streams:
+            sections = [label for label, a, b in zip(_SECTION_LABELS, old.streams[name], digests) if a != b]
+            if sections:
+                diff.changed_streams[name] = sections
+
+    utility_names = list(new.utilities) + [name for name in old.utilities if name not in new.utilities]
+    diff.changed_utilities = [name for name in utility_names if old.utilities.get(name) != new.utilities.get(name)]
+    return diff
+
+def diff_archives(old_path: str, new_path: str) -> ArchiveDiff:
+    """두 .bkp 파일을 비교합니다."""
+    return diff_fingerprints(fingerprint_archive(old_path), fingerprint_archive(new_path))
+
+# =============================================================================
+# 이전 실행 스냅샷 (증분 재계산용)
+# =============================================================================
+
+@dataclass
+class RunSnapshot:
+    """한 아카이브의 마지막 실행 결과: 지문, 추출된 장치/유틸리티 데이터, 비용 계산 입력/결과"""
+    aspen_file: str
+    fingerprint: ArchiveFingerprint
+    unit_set: Optional[str]
+    all_devices: List[Dict[str, Any]]
+    utilities: List[Dict[str, Any]]
+    costed_devices: List[Dict[str, Any]] = field(default_factory=list)
+    cost_results: List[Dict[str, Any]] = field(default_factory=list)
+    cepci: Any = None   # 비용 계산에 쓴 cost_calculator.CEPCIOptions
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path: str) -> Optional["RunSnapshot"]:
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+def snapshot_path(cache_dir: str, file_path: str) -> str:
+    """아카이브 경로별 스냅샷 파일 경로 (<cache_dir>/runs/<경로 해시>.pkl)"""
+    key = hashlib.sha256(os.path.abspath(file_path).encode('utf-8')).hexdigest()[:32]
+    return os.path.join(cache_dir, 'runs', f"{key}.pkl")
+
+def merge_device_data(block_order: List[str], previous: List[Dict[str, Any]], fresh: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """블록 순서대로 새로 추출한 장치 데이터를 우선하고, 나머지는 이전 실행 데이터를 씁니다."""
+    by_name = {device.get('name'): device for device in previous}
+    by_name.update({device.get('name'): device for device in fresh})
+    return [by_name[name] for name in block_order if name in by_name]
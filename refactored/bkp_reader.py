@@ -0,0 +1,814 @@
+"""
+Aspen Plus 백업(.bkp) 파일 직접 파싱 모듈
+
+이 모듈은 Aspen COM 인터페이스 없이 .bkp 텍스트를 직접 읽어
+블록 이름/모델 타입 등 아카이브 메타데이터를 추출하는 기능을 제공합니다.
+파일은 mmap으로 열고 레코드 경계만 한 번 훑어 오프셋 테이블을 만든 뒤,
+호출자가 필요한 구간만 디코딩하도록 합니다.
+"""
+
+from typing import Optional, Dict, List, Set, Tuple, Any, Iterable, Iterator, NamedTuple
+from array import array
+import mmap
+import os
+import re
+
+# =============================================================================
+# 아카이브 구조 상수
+# =============================================================================
+
+# .bkp 헤더의 블록 레코드는 아래 형식으로 반복됩니다.
+#   >VERSION 0
+#   <블록 이름>
+#   <모델 타입>      (예: Heater, RadFrac, MCompr)
+#   <라이브러리>     (예: Built-In)
+#   <모델 타입 대문자>
+# 레코드 목록이 끝나면 '? SETUP ...' 으로 입력 언어 섹션이 시작됩니다.
+RECORD_MARKER = '>VERSION'
+INPUT_SECTION_MARKER = '?'
+# 블록 분류 시 모델 타입을 찾는 범위: 블록 이름 다음 줄부터 이 줄 수까지
+RECORD_SCAN_LINES = 4
+# 블록 분류 시 블록 레코드에서 찾는 모델 타입 (data_manager: 비용 계산 대상)
+BKP_BLOCK_CATEGORIES = (
+    'Heater', 'HeatX',
+    'RadFrac', 'Distl', 'DWSTU',
+    'RStoic', 'RCSTR', 'RPlug', 'RBatch', 'REquil', 'RYield',
+    'Pump', 'Compr', 'MCompr', 'Vacuum', 'Flash', 'Sep', 'Mixer', 'FSplit', 'Valve',
+)
+# 분류 스크립트(TEA_machine.py, block_classifier.py)가 추가로 구분하는 모델 타입
+CLASSIFIER_BLOCK_CATEGORIES = BKP_BLOCK_CATEGORIES + (
+    'Cooler', 'Condenser', 'Utility',
+    'EVAP1', 'EVAP2', 'EVAP3',
+    'ABS', 'PSA',
+    'COMB',
+)
+
+# 오프셋 테이블의 섹션 구분
+SECTION_RECORD = 'record'    # 헤더의 >VERSION 블록 레코드
+SECTION_INPUT = 'input'      # 입력 언어 문단 (? BLOCK HEATER 03HEX ? ...)
+SECTION_RESULTS = 'results'  # $_SUMMARY_FILE의 결과 레코드 (DSET BLOCK HEATER 03HEX ...)
+
+_RECORD_RE = re.compile(rb'^>VERSION[^\n]*\n([^\r\n]*)\r?\n([^\r\n]*)', re.M)
+_INPUT_START_RE = re.compile(rb'^\?', re.M)
+_INPUT_END_RE = re.compile(rb'^\s*GRAPHICS_BACKUP|^\$CONFIG', re.M)
+_SUMMARY_START_RE = re.compile(rb'^\$_SUMMARY_FILE', re.M)
+_SUMMARY_END_RE = re.compile(rb'^\$_', re.M)
+# 입력 문단 식별자 경계: 따옴표 문자열 안의 '?'는 건너뛰고 '? BLOCK HEATER "10HEX-1" ?'의 '?'만 찾습니다.
+# (본문 전체를 반복 그룹 하나로 매칭하면 정규식 엔진의 되추적 상태가 본문 길이만큼 쌓이므로 '?' 위치만 훑습니다.)
+_PARAGRAPH_MARK_RE = re.compile(rb'"[^"]*"|\?')
+_TOKEN_RE = re.compile(rb'"[^"]*"|\S+')
+# 결과 레코드 시작 줄: ' DSET STREAM MATERIAL 01 RES_STR @L_236 (...'
+_SUMMARY_RECORD_RE = re.compile(rb'^ (DSET|IDSET|LSET|MMSUMMARY)\b([^\r\n]*)', re.M)
+
+# 문단/결과 레코드 종류 → (오프셋 테이블 키, 이름 토큰 위치)
+def _unquote(token: bytes) -> str:
+    return token.strip(b'"').decode('utf-8', errors='ignore')
+
+_KINDS = {b'BLOCK': ('block', 2), b'STREAM': ('stream', 2), b'UTILITY': ('utility', 1)}
+
+Range = Tuple[int, int]
+# 오프셋 테이블의 구간 목록: 구간마다 튜플을 만들지 않고 [start0, end0, start1, end1, ...]을 64비트 정수 배열에 담습니다.
+Spans = array
+
+def _new_spans() -> Spans:
+    return array('q')
+
+def _iter_spans(spans: Spans) -> Iterator[Range]:
+    it = iter(spans)
+    return zip(it, it)
+
+# =============================================================================
+# mmap 기반 아카이브 리더
+# =============================================================================
+
+class BkpArchive:
+    """
+    .bkp 파일을 mmap으로 열고 블록/스트림 섹션의 바이트 오프셋 테이블을 유지하는 리더
+
+    - 헤더의 블록 레코드(이름 → 모델 타입)는 열 때 바로 인덱싱합니다 (헤더 페이지만 접근).
+    - 입력/결과 섹션의 오프셋 테이블은 처음 필요할 때 한 번만 스캔해 만듭니다. 구간은 정수 배열(Spans)로 저장합니다.
+    - 본문 텍스트는 block_text()/stream_text() 호출 시 해당 구간만 디코딩합니다.
+    """
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.block_types: Dict[str, str] = {}
+        self._offsets: Optional[Dict[str, Dict[str, Dict[str, Spans]]]] = None
+        self._paragraph_ids: List[Tuple[str, ...]] = []
+        self._paragraph_spans = _new_spans()
+        # 레이아웃 ID → _layout_spans의 구간 번호
+        self._layouts: Dict[bytes, int] = {}
+        self._layout_spans = _new_spans()
+        self._input_start = self._index_records()
+
+    def __enter__(self) -> "BkpArchive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def _index_records(self) -> int:
+        """헤더의 >VERSION 레코드를 인덱싱하고 입력 섹션 시작 오프셋을 반환합니다."""
+        data = self._data
+        first = _RECORD_RE.search(data)
+        if first is None:
+            self._record_offsets = self._empty_offsets()
+            return 0
+        match = _INPUT_START_RE.search(data, first.start())
+        input_start = match.start() if match else len(data)
+        ranges = self._empty_offsets()
+        previous: Optional[Spans] = None
+        for rec in _RECORD_RE.finditer(data, first.start(), input_start):
+            # 레코드 구간은 다음 레코드 시작(마지막은 입력 섹션 시작)까지입니다.
+            if previous is not None:
+                previous.append(rec.start())
+                previous = None
+            name = rec.group(1).strip().decode('utf-8', errors='ignore')
+            model = rec.group(2).strip().decode('utf-8', errors='ignore')
+            if not name or name in self.block_types:
+                continue
+            self.block_types[name] = model
+            previous = ranges['block'].setdefault(name, {}).setdefault(SECTION_RECORD, _new_spans())
+            previous.append(rec.start())
+        if previous is not None:
+            previous.append(input_start)
+        self._record_offsets = ranges
+        return input_start
+
+    @staticmethod
+    def _empty_offsets() -> Dict[str, Dict[str, Dict[str, Spans]]]:
+        return {'block': {}, 'stream': {}, 'utility': {}}
+
+    # -------------------------------------------------------------------------
+    # 오프셋 테이블 (지연 생성)
+    # -------------------------------------------------------------------------
+
+    @property
+    def offsets(self) -> Dict[str, Dict[str, Dict[str, Spans]]]:
+        """{'block'|'stream'|'utility': {이름: {섹션: array('q', [start, end, ...])}}} 형식의 오프셋 테이블"""
+        if self._offsets is None:
+            offsets = self._record_offsets
+            self._scan_input_section(offsets)
+            self._scan_results_section(offsets)
+            self._offsets = offsets
+        return self._offsets
+
+    def _scan_input_section(self, offsets) -> None:
+        data = self._data
+        match = _INPUT_END_RE.search(data, self._input_start)
+        input_end = match.start() if match else len(data)
+
+        # 문단 하나는 여는 '?'부터 다음 문단의 여는 '?'(마지막 문단은 입력 섹션 끝)까지입니다.
+        current: Optional[Tuple[str, str]] = None
+        opening: Optional[int] = None
+        for m in _PARAGRAPH_MARK_RE.finditer(data, self._input_start, input_end):
+            if m.group() != b'?':
+                continue
+            if opening is None:
+                opening = m.start()
+                continue
+            paragraph_id = data[opening + 1:m.start()]
+            if self._paragraph_ids:
+                self._close_paragraph(offsets, current, opening)
+            self._paragraph_ids.append(tuple(_unquote(t) for t in _TOKEN_RE.findall(paragraph_id)))
+            self._paragraph_spans.append(opening)
+            current = self._paragraph_owner(paragraph_id)
+            opening = None
+        if self._paragraph_ids:
+            self._close_paragraph(offsets, current, input_end)
+
+    def _close_paragraph(self, offsets, owner: Optional[Tuple[str, str]], end: int) -> None:
+        start = self._paragraph_spans[-1]
+        self._paragraph_spans.append(end)
+        self._add_range(offsets, owner, SECTION_INPUT, start, end)
+
+    def _scan_results_section(self, offsets) -> None:
+        data = self._data
+        start = _SUMMARY_START_RE.search(data, self._input_start)
+        if start is None:
+            return
+        match = _SUMMARY_END_RE.search(data, start.end())
+        summary_end = match.start() if match else len(data)
+
+        # 레코드 구간은 다음 레코드 시작(마지막은 요약 섹션 끝)까지이므로, 열린 구간(open_spans)의 끝은 다음 레코드에서 채웁니다.
+        previous: Optional[Tuple[str, str]] = None
+        open_spans: Optional[Spans] = None
+        for m in _SUMMARY_RECORD_RE.finditer(data, start.end(), summary_end):
+            if open_spans is not None:
+                open_spans.append(m.start())
+                open_spans = None
+            if m.group(1) in (b'IDSET', b'LSET'):
+                # 레이아웃 정의: ' IDSET ID_53 (PROPERTIES) (...)', ' LSET L_23 (%ID_RXBAL ...)'
+                layout_id = m.group(2).split(None, 1)[0] if m.group(2).strip() else b''
+                self._layouts[layout_id] = len(self._layout_spans) // 2
+                self._layout_spans.append(m.start())
+                open_spans = self._layout_spans
+                continue
+            if m.group(1) != b'DSET':
+                continue
+            tokens = m.group(2).split()
+            owner = self._record_owner(tokens)
+            if owner is None:
+                previous = None
+                continue
+            spans = offsets[owner[0]].setdefault(owner[1], {}).setdefault(SECTION_RESULTS, _new_spans())
+            if owner == previous and spans:
+                # 같은 블록의 연속된 결과 레코드(사이의 IDSET/LSET 정의 포함)는 하나의 구간으로 합칩니다.
+                spans.pop()
+            else:
+                spans.append(m.start())
+            open_spans = spans
+            previous = owner
+        if open_spans is not None:
+            open_spans.append(summary_end)
+
+    @staticmethod
+    def _paragraph_owner(paragraph_id: bytes) -> Optional[Tuple[str, str]]:
+        """'BLOCK HEATER 03HEX' → ('block', '03HEX'), 'UTILITY "U-1"' → ('utility', 'U-1')"""
+        tokens = _TOKEN_RE.findall(paragraph_id)
+        if tokens and tokens[0] in _KINDS:
+            kind, name_pos = _KINDS[tokens[0]]
+            if len(tokens) == name_pos + 1:
+                return kind, _unquote(tokens[name_pos])
+        return None
+
+    @staticmethod
+    def _record_owner(tokens: List[bytes]) -> Optional[Tuple[str, str]]:
+        """'DSET BLOCK HEATER 03HEX RES_Q ...' 토큰 → ('block', '03HEX')"""
+        if tokens and tokens[0] in _KINDS:
+            kind, name_pos = _KINDS[tokens[0]]
+            if len(tokens) > name_pos + 1:
+                return kind, _unquote(tokens[name_pos])
+        return None
+
+    @staticmethod
+    def _add_range(offsets, owner: Optional[Tuple[str, str]], section: str, start: int, end: int) -> None:
+        if owner is None:
+            return
+        kind, name = owner
+        offsets[kind].setdefault(name, {}).setdefault(section, _new_spans()).extend((start, end))
+
+    # -------------------------------------------------------------------------
+    # 조회 API
+    # -------------------------------------------------------------------------
+
+    def block_names(self) -> List[str]:
+        """헤더 레코드 순서의 블록 이름 목록"""
+        return list(self.block_types.keys())
+
+    def block_categories(self, categories: Iterable[str]) -> Dict[str, str]:
+        """
+        블록 이름 → 카테고리. 블록 레코드 구간만 디코딩해 이름 다음 RECORD_SCAN_LINES줄 중 처음 나오는 categories 값을 씁니다
+        (레코드가 여러 줄에 걸쳐 모델 타입이 바로 다음 줄에 없어도 분류됩니다). 해당하는 줄이 없는 블록은 빠집니다.
+        """
+        categories = set(categories)
+        block_categories: Dict[str, str] = {}
+        for name, sections in self._record_offsets['block'].items():
+            for start, end in _iter_spans(sections.get(SECTION_RECORD, ())):
+                # 구간의 첫 두 줄은 '>VERSION'과 블록 이름입니다.
+                lines = self._data[start:end].splitlines()[2:2 + RECORD_SCAN_LINES]
+                for line in lines:
+                    if line.startswith((b'>', b'?')):
+                        break
+                    category = line.strip().decode('utf-8', errors='ignore')
+                    if category in categories:
+                        block_categories[name] = category
+                        break
+        return block_categories
+
+    def stream_names(self) -> List[str]:
+        """입력/결과 섹션에서 발견된 스트림 이름 목록 (처음 등장 순서)"""
+        return list(self.offsets['stream'].keys())
+
+    def _spans(self, kind: str, name: str, section: str) -> Iterator[Range]:
+        return _iter_spans(self.offsets[kind].get(name, {}).get(section, ()))
+
+    def block_ranges(self, name: str, section: str = SECTION_INPUT) -> List[Range]:
+        return list(self._spans('block', name, section))
+
+    def stream_ranges(self, name: str, section: str = SECTION_INPUT) -> List[Range]:
+        return list(self._spans('stream', name, section))
+
+    def decode(self, rng: Range) -> str:
+        """바이트 구간 하나만 디코딩합니다."""
+        start, end = rng
+        return self._data[start:end].decode('utf-8', errors='ignore')
+
+    def block_text(self, name: str, section: str = SECTION_INPUT) -> str:
+        return ''.join(self.decode(r) for r in self.block_ranges(name, section))
+
+    def stream_text(self, name: str, section: str = SECTION_INPUT) -> str:
+        return ''.join(self.decode(r) for r in self.stream_ranges(name, section))
+
+    def section_bytes(self, kind: str, name: str, section: str) -> bytes:
+        """블록/스트림/유틸리티 한 섹션의 원본 바이트 (디코딩 없이, 비교/해시용)"""
+        return b''.join(self._data[start:end] for start, end in self._spans(kind, name, section))
+
+    def block_connections(self) -> Dict[str, List[Tuple[str, str, str]]]:
+        """FLOWSHEET 문단의 'BLOCK BLKID = X IN = (s p ...) OUT = (...)' 행 → {블록: [(스트림, 포트, 'IN'|'OUT'), ...]}"""
+        connections: Dict[str, List[Tuple[str, str, str]]] = {}
+        for _, text in self.paragraphs('FLOWSHEET'):
+            _, sentences = parse_input_paragraph(text)
+            for sentence in sentences:
+                if sentence.name != 'BLOCK':
+                    continue
+                for row in sentence.rows:
+                    entries = {entry.key: entry.value for entry in row}
+                    if 'BLKID' not in entries:
+                        continue
+                    ports = connections.setdefault(str(entries['BLKID']), [])
+                    for direction in ('IN', 'OUT'):
+                        items = entries.get(direction) or []
+                        ports.extend((str(stream), str(port), direction) for stream, port in zip(items[0::2], items[1::2]))
+        return connections
+
+    def utility_names(self) -> List[str]:
+        """입력/결과 섹션에서 발견된 유틸리티 이름 목록 (처음 등장 순서)"""
+        return list(self.offsets['utility'].keys())
+
+    def utility_text(self, name: str, section: str = SECTION_INPUT) -> str:
+        return ''.join(self.decode(r) for r in self._spans('utility', name, section))
+
+    def paragraphs(self, *prefix: str) -> List[Tuple[Tuple[str, ...], str]]:
+        """식별자가 prefix로 시작하는 입력 문단들의 (식별자 토큰, 텍스트) 목록. 예: paragraphs('SETUP', 'UNITS-SET')"""
+        self.offsets
+        return [(pid, self.decode(rng)) for pid, rng in zip(self._paragraph_ids, _iter_spans(self._paragraph_spans))
+                if pid[:len(prefix)] == prefix]
+
+    def result_records(self, kind: str, name: str, variables: Optional[Iterable[str]] = None) -> List["ResultRecord"]:
+        """
+        블록/스트림/유틸리티 하나의 결과(DSET) 레코드들을 레이아웃에 맞춰 디코딩합니다.
+        variables가 주어지면 그 변수(RES_STR 등)의 레코드만 값을 디코딩합니다.
+        """
+        wanted = {v.encode('utf-8') for v in variables} if variables is not None else None
+        records = []
+        for start, end in self._spans(kind, name, SECTION_RESULTS):
+            for m in _SUMMARY_RECORD_RE.finditer(self._data, start, end):
+                if m.group(1) != b'DSET':
+                    continue
+                record_end = _next_record_start(self._data, m.end(), end)
+                record = self._decode_record(self._data[m.start(2):record_end], wanted)
+                if record is not None:
+                    records.append(record)
+        return records
+
+    def _layout_text(self, layout_id: bytes) -> Optional[bytes]:
+        index = self._layouts.get(layout_id)
+        if index is None:
+            return None
+        body = self._data[self._layout_spans[2 * index]:self._layout_spans[2 * index + 1]]
+        # ' LSET L_23 (...)' / ' IDSET ID_53 (PROPERTIES) (...)' → 첫 괄호부터
+        return body[body.index(b'('):] if b'(' in body else b''
+
+    def _decode_record(self, record: bytes, wanted: Optional[Set[bytes]] = None) -> Optional["ResultRecord"]:
+        """' DSET BLOCK HEATER 03HEX RES_Q @L_25 (값 ...)' 레코드 하나를 디코딩합니다."""
+        head, sep, body = record.partition(b'(')
+        tokens = head.split()
+        owner = self._record_owner(tokens)
+        if owner is None or not sep or not tokens[-1].startswith(b'@'):
+            return None
+        kind, name = owner
+        name_pos = _KINDS[tokens[0]][1]
+        if wanted is not None and tokens[name_pos + 1] not in wanted:
+            return None
+        model = tokens[1].decode('utf-8', errors='ignore') if name_pos == 2 else ''
+        variable = tokens[name_pos + 1].decode('utf-8', errors='ignore')
+        layout = self._layout_text(tokens[-1][1:])
+        values = _parse_record_values(body[:body.rfind(b')')])
+        fields = self._expand_layout(layout, values) if layout is not None else []
+        return ResultRecord(kind, model, name, variable, fields)
+
+    def _expand_layout(self, layout: bytes, values: List[Tuple[Any, Optional[int]]]) -> List["ResultField"]:
+        """
+        LSET 레이아웃('%ID_RXBAL %ID_TPQV', '%ID_324 & %ID_322')을 따라 값들에 속성 ID를 붙입니다.
+        해석할 수 없는 구성요소(중첩 괄호, 정의되지 않은 ID)를 만나면 그 앞까지만 반환합니다.
+        """
+        fields: List[ResultField] = []
+        pos = 0
+        for component in _LAYOUT_COMPONENT_RE.finditer(layout.strip()[1:-1]):
+            if component.group(1) is None:
+                break
+            properties = self._layout_properties(component.group(1))
+            indices = self._layout_indices(component.group(2)) if component.group(2) else [None]
+            if properties is None or indices is None:
+                break
+            for index in indices:
+                for prop_id, unit_type in properties:
+                    if pos >= len(values):
+                        return fields
+                    value, unit_code = values[pos]
+                    fields.append(ResultField(prop_id, index, value, unit_type, unit_code))
+                    pos += 1
+        return fields
+
+    def _layout_properties(self, layout_id: bytes) -> Optional[List[Tuple[int, Optional[int]]]]:
+        text = self._layout_text(layout_id)
+        if text is None or not text.startswith(b'(PROPERTIES)'):
+            return None
+        return [(int(m.group(1)), int(m.group(2)) if m.group(2) else None)
+                for m in _PROPERTY_RE.finditer(text, len(b'(PROPERTIES)'))]
+
+    def _layout_indices(self, layout_id: bytes) -> Optional[List[Any]]:
+        """'(NSTAGE) ( #3)' → [1, 2, 3], '(STREAMID) (19 18 20)' → ['19', '18', '20']"""
+        text = self._layout_text(layout_id)
+        if text is None:
+            return None
+        body = text[text.index(b')') + 1:].strip()[1:-1]
+        count = re.match(rb'\s*#(\d+)', body)
+        if count:
+            return list(range(1, int(count.group(1)) + 1))
+        return [_unquote(t) for t in _TOKEN_RE.findall(body)]
+
+
+# =============================================================================
+# 결과(요약) 레코드 디코딩
+# =============================================================================
+
+class ResultField(NamedTuple):
+    """결과 레코드의 값 하나. index는 스테이지 번호/스트림 ID처럼 반복 레이아웃의 인덱스입니다."""
+    prop_id: int
+    index: Any
+    value: Any
+    unit_type: Optional[int]
+    unit_code: Optional[int]
+
+class ResultRecord(NamedTuple):
+    """' DSET BLOCK HEATER 03HEX RES_Q @L_25 (...)' 레코드 하나"""
+    kind: str        # 'block' | 'stream' | 'utility'
+    model: str       # 'HEATER', 'MATERIAL' 등 (유틸리티는 '')
+    name: str
+    variable: str    # 'RES_Q', 'RES_STR', 'USAGE' 등
+    fields: List[ResultField]
+
+_LAYOUT_COMPONENT_RE = re.compile(rb'\s*(?:%(\w+)(?:\s*&\s*%(\w+))?|(\S))')
+_PROPERTY_RE = re.compile(rb'(\d+)\s+\*\d+(?:\s+<(-?\d+)>)?')
+_VALUE_RE = re.compile(rb'"[^"]*"|<-?\d+>|[^\s()]+')
+_NEXT_RECORD_RE = re.compile(rb'\n (?:DSET|IDSET|LSET|MMSUMMARY)\b')
+
+def _next_record_start(data, pos: int, end: int) -> int:
+    m = _NEXT_RECORD_RE.search(data, pos, end)
+    return m.start() + 1 if m else end
+
+def parse_value(token: bytes) -> Any:
+    """
+    BKP 값 토큰 하나를 파이썬 값으로 변환합니다.
+    '1.26909518D+07' → 12690951.8, '10' → 10, '*' → None, '"U-1"' → 'U-1'
+    ('01'처럼 0으로 시작하는 정수 모양 토큰은 스트림 이름일 수 있으므로 문자열로 둡니다.)
+    """
+    if token == b'*':
+        return None
+    if token.startswith(b'"'):
+        return _unquote(token)
+    if token.isdigit() or (token[:1] == b'-' and token[1:].isdigit()):
+        number = int(token)
+        return number if str(number).encode() == token else token.decode('utf-8', errors='ignore')
+    try:
+        return float(token.replace(b'D', b'E').replace(b'd', b'e'))
+    except ValueError:
+        return token.decode('utf-8', errors='ignore')
+
+def _parse_record_values(body: bytes) -> List[Tuple[Any, Optional[int]]]:
+    """결과 값 목록. 값 뒤의 '<n>' 태그는 그 값의 단위 코드입니다."""
+    values: List[Tuple[Any, Optional[int]]] = []
+    for token in _VALUE_RE.findall(body):
+        if token.startswith(b'<') and token.endswith(b'>'):
+            if values:
+                values[-1] = (values[-1][0], int(token[1:-1]))
+        else:
+            values.append((parse_value(token), None))
+    return values
+
+# =============================================================================
+# 입력 언어 문단 파싱
+# =============================================================================
+
+class InputEntry(NamedTuple):
+    """입력 문장의 키워드 하나: 'TEMP = 42. <22> <4>' → ('TEMP', 42.0, 22, 4)"""
+    key: str
+    value: Any
+    unit_type: Optional[int]
+    unit_code: Optional[int]
+
+class InputSentence(NamedTuple):
+    """'\\ PARAM TEMP = 42. ... \\' 문장. '/'로 구분된 반복 행은 rows의 원소가 됩니다."""
+    name: str
+    rows: List[List[InputEntry]]
+
+_INPUT_TOKEN_RE = re.compile(rb'"[^"]*"|\S+')
+
+def parse_input_paragraph(text: str) -> Tuple[Tuple[str, ...], List[InputSentence]]:
+    """
+    입력 문단 하나('? BLOCK HEATER 03HEX ? ; ... \\ PARAM ... \\')를
+    (식별자 토큰, 문장 목록)으로 파싱합니다.
+    """
+    tokens = [t.decode('utf-8', errors='ignore') for t in _INPUT_TOKEN_RE.findall(text.encode('utf-8'))]
+    pos = 1 if tokens and tokens[0] == '?' else 0
+    paragraph_id = []
+    while pos < len(tokens) and tokens[pos] != '?':
+        paragraph_id.append(tokens[pos].strip('"'))
+        pos += 1
+
+    sentences: List[InputSentence] = []
+    current: Optional[InputSentence] = None
+    pos += 1
+    while pos < len(tokens):
+        token = tokens[pos]
+        pos += 1
+        if token == '\\':
+            if current is None and pos < len(tokens) and tokens[pos] != '\\':
+                current = InputSentence(tokens[pos].strip('"'), [[]])
+                sentences.append(current)
+                pos += 1
+            else:
+                current = None
+            continue
+        if current is None:
+            continue
+        if token == '/':
+            current.rows.append([])
+        elif pos < len(tokens) and tokens[pos] == '=':
+            value, pos = _read_input_value(tokens, pos + 1)
+            unit_type = unit_code = None
+            if pos + 1 < len(tokens) and _is_unit_tag(tokens[pos]) and _is_unit_tag(tokens[pos + 1]):
+                unit_type, unit_code = int(tokens[pos][1:-1]), int(tokens[pos + 1][1:-1])
+                pos += 2
+            current.rows[-1].append(InputEntry(token.strip('"'), value, unit_type, unit_code))
+    return tuple(paragraph_id), sentences
+
+def _is_unit_tag(token: str) -> bool:
+    return len(token) > 2 and token[0] == '<' and token[-1] == '>'
+
+def _read_input_value(tokens: List[str], pos: int) -> Tuple[Any, int]:
+    """'=' 다음의 값 하나(스칼라 또는 괄호 목록)를 읽어 (값, 다음 위치)를 반환합니다."""
+    if pos >= len(tokens):
+        return None, pos
+    if tokens[pos] != '(':
+        return parse_value(tokens[pos].encode('utf-8')), pos + 1
+    items, depth = [], 1
+    pos += 1
+    while pos < len(tokens) and depth:
+        token = tokens[pos]
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        elif not _is_unit_tag(token):
+            items.append(parse_value(token.encode('utf-8')))
+        pos += 1
+    return items, pos
+
+
+# =============================================================================
+# 스트리밍 토크나이저
+# =============================================================================
+
+class HeaderRecord(NamedTuple):
+    """'MM "41.0" FLAVOR "NO" VERSION "41.0" DATETIME "..."' 처럼 따옴표 값이 붙은 헤더 줄들의 키/값"""
+    offset: int
+    fields: Dict[str, str]
+
+class LibraryRecord(NamedTuple):
+    """startlibrary ... endlibrary 구간: 모델 라이브러리 목록과 카테고리 → 상태"""
+    offset: int
+    libraries: List[str]
+    categories: Dict[str, str]
+
+class BlockRecord(NamedTuple):
+    """>VERSION 블록 레코드 (이름, 모델 타입, 라이브러리, 이름 다음 줄들)"""
+    offset: int
+    name: str
+    model: str
+    library: str
+    lines: Tuple[str, ...] = ()
+
+class ParagraphRecord(NamedTuple):
+    """입력 언어 문단의 시작: '? BLOCK HEATER 03HEX ?' → ('BLOCK', 'HEATER', '03HEX')"""
+    offset: int
+    paragraph_id: Tuple[str, ...]
+
+class SectionRecord(NamedTuple):
+    """'$_SUMMARY_FILE', '$CONFIG' 같은 섹션 표시 줄"""
+    offset: int
+    name: str
+
+class SummaryRecord(NamedTuple):
+    """결과 섹션 레코드의 첫 줄 ' DSET BLOCK HEATER 03HEX RES_Q @L_25 (' → ('DSET', [토큰...])"""
+    offset: int
+    tag: str
+    tokens: List[str]
+
+_HEADER_PAIR_RE = re.compile(rb'([A-Za-z][\w-]*)\s+"([^"]*)"')
+# 따옴표 문자열 안의 '?'는 건너뛰고 다음 문단 식별자 '? ... ?'까지 (unrolled: 실패 시에도 선형 시간)
+_PARAGRAPH_SCAN_RE = re.compile(rb'[^?"]*(?:"[^"]*"[^?"]*)*\?([^?"]*(?:"[^"]*"[^?"]*)*)\?')
+_TAIL_LINE_RE = re.compile(rb'^(\$(?:_\w+|CONFIG)\b|\s(?:DSET|IDSET|LSET|MMSUMMARY)\b)([^\r\n(]*)', re.M)
+STREAM_CHUNK_SIZE = 1 << 20
+
+class _ChunkBuffer:
+    """고정 크기 청크로 읽으면서 아직 소비하지 않은 꼬리만 유지하는 버퍼"""
+    def __init__(self, f, chunk_size: int):
+        self._file = f
+        self._chunk_size = chunk_size
+        self.data = b''
+        self.base = 0      # data[0]의 파일 오프셋
+        self.pos = 0       # data 안의 현재 위치
+        self.eof = False
+
+    def fill(self) -> bool:
+        """청크 하나를 더 읽습니다. 소비한 앞부분은 버립니다."""
+        if self.eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.base += self.pos
+        self.data = self.data[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def readline(self) -> Optional[Tuple[int, bytes]]:
+        """(파일 오프셋, 줄 내용(개행 제외))"""
+        while True:
+            end = self.data.find(b'\n', self.pos)
+            if end >= 0 or not self.fill():
+                break
+        if end < 0:
+            if self.pos >= len(self.data):
+                return None
+            end = len(self.data)
+        offset, line = self.base + self.pos, self.data[self.pos:end]
+        self.pos = end + 1
+        return offset, line.rstrip(b'\r')
+
+    def unread(self, offset: int) -> None:
+        self.pos = offset - self.base
+
+def iter_records(file_path: str, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    .bkp 파일을 고정 크기 청크로 읽으며 타입이 있는 레코드를 순서대로 내보내는 제너레이터.
+    헤더(HeaderRecord, LibraryRecord, BlockRecord) → 입력 문단(ParagraphRecord) → 섹션/결과 레코드
+    (SectionRecord, SummaryRecord) 순이며, 버퍼에는 아직 처리하지 않은 청크 꼬리만 남기므로
+    메모리 사용량은 파일 크기와 무관합니다. 필요한 레코드를 얻으면 호출자가 중간에 멈춰도 됩니다.
+    """
+    with open(file_path, 'rb') as f:
+        buf = _ChunkBuffer(f, chunk_size)
+        yield from _iter_header_records(buf)
+        yield from _iter_paragraph_records(buf)
+        yield from _iter_tail_records(buf)
+
+def _decode(token: bytes) -> str:
+    return token.decode('utf-8', errors='ignore')
+
+def _iter_header_records(buf: _ChunkBuffer):
+    header: Optional[HeaderRecord] = None
+    while True:
+        item = buf.readline()
+        if item is None:
+            break
+        offset, line = item
+        if line.startswith(b'?'):
+            buf.unread(offset)
+            break
+        pairs = _HEADER_PAIR_RE.findall(line)
+        if pairs and not line.startswith(b'>'):
+            if header is None:
+                header = HeaderRecord(offset, {})
+            header.fields.update((_decode(k), _decode(v)) for k, v in pairs)
+            continue
+        if header is not None:
+            yield header
+            header = None
+        stripped = line.strip()
+        if stripped == b'startlibrary':
+            yield _read_library(buf, offset)
+        elif stripped.startswith(b'>VERSION'):
+            item = buf.readline()
+            name = _decode(item[1].strip()) if item else ''
+            # 이름 다음 줄들은 다음 레코드('>')나 입력 섹션('?')이 나오기 전까지 RECORD_SCAN_LINES줄만 모읍니다.
+            lines: List[str] = []
+            while len(lines) < RECORD_SCAN_LINES:
+                item = buf.readline()
+                if item is None:
+                    break
+                if item[1].startswith((b'>', b'?')):
+                    buf.unread(item[0])
+                    break
+                lines.append(_decode(item[1].strip()))
+            if name:
+                yield BlockRecord(offset, name, lines[0] if lines else '', lines[1] if len(lines) > 1 else '', tuple(lines))
+    if header is not None:
+        yield header
+
+def _read_library(buf: _ChunkBuffer, offset: int) -> LibraryRecord:
+    lines = []
+    while True:
+        item = buf.readline()
+        if item is None or item[1].strip() == b'endlibrary':
+            break
+        lines.append(_decode(item[1].strip()))
+    libraries: List[str] = []
+    categories: Dict[str, str] = {}
+    i = 0
+    while i < len(lines):
+        key, _, count = lines[i].partition('=')
+        if key.strip() == 'NumLibs' and count.strip().isdigit():
+            n = int(count)
+            libraries = lines[i + 1:i + 1 + n]
+            i += n
+        elif key.strip() == 'NumCats' and count.strip().isdigit():
+            n = int(count)
+            pairs = lines[i + 1:i + 1 + 2 * n]
+            categories = dict(zip(pairs[0::2], pairs[1::2]))
+            i += 2 * n
+        i += 1
+    return LibraryRecord(offset, libraries, categories)
+
+def _iter_paragraph_records(buf: _ChunkBuffer):
+    """입력 섹션: 문단 식별자만 내보내고 본문은 건너뜁니다. GRAPHICS_BACKUP / $CONFIG 줄에서 끝납니다."""
+    end_match = _INPUT_END_RE.search(buf.data, buf.pos)
+    while True:
+        limit = end_match.start() if end_match else len(buf.data)
+        m = _PARAGRAPH_SCAN_RE.match(buf.data, buf.pos, limit)
+        if m is not None:
+            yield ParagraphRecord(buf.base + m.start(1) - 1, tuple(_unquote(t) for t in _TOKEN_RE.findall(m.group(1))))
+            buf.pos = m.end()
+            continue
+        if end_match is not None:
+            buf.pos = end_match.start()
+            return
+        tail = len(buf.data) - buf.pos
+        if not buf.fill():
+            return
+        # 새로 읽은 청크에서만 끝 표시를 찾습니다 (경계에 걸친 경우를 위해 직전 64바이트 포함).
+        end_match = _INPUT_END_RE.search(buf.data, max(0, tail - 64))
+
+def _iter_tail_records(buf: _ChunkBuffer):
+    """입력 섹션 이후: 섹션 표시 줄과 결과 섹션 레코드 첫 줄. 완결된 줄 단위로만 처리합니다."""
+    while True:
+        cut = buf.data.rfind(b'\n', buf.pos) + 1
+        if buf.eof:
+            cut = len(buf.data)
+        if cut > buf.pos:
+            for m in _TAIL_LINE_RE.finditer(buf.data, buf.pos, cut):
+                offset = buf.base + m.start()
+                if m.group(1).startswith(b'$'):
+                    yield SectionRecord(offset, _decode(m.group(1)))
+                else:
+                    yield SummaryRecord(offset, _decode(m.group(1).strip()), [_decode(t) for t in m.group(2).split()])
+            buf.pos = cut
+        if not buf.fill():
+            if buf.pos >= len(buf.data):
+                return
+
+# =============================================================================
+# 헤더 요약
+# =============================================================================
+
+class ArchiveHeader(NamedTuple):
+    """.bkp 헤더 요약: 'MM "41.0" ... VERSION "41.0" DATETIME "..."' 줄과 블록 레코드"""
+    version: Optional[str]
+    datetime: Optional[str]
+    block_types: Dict[str, str]
+
+_HEADER_CHUNK_SIZE = 1 << 16
+
+def read_header(file_path: str) -> ArchiveHeader:
+    """
+    스트리밍 토크나이저로 입력 언어 섹션('?')이 시작되기 전까지의 헤더 구간만 64KB 단위로 읽어 요약합니다.
+    """
+    fields: Dict[str, str] = {}
+    block_types: Dict[str, str] = {}
+    for record in iter_records(file_path, _HEADER_CHUNK_SIZE):
+        if isinstance(record, HeaderRecord) and not fields:
+            fields = record.fields
+        elif isinstance(record, BlockRecord):
+            block_types.setdefault(record.name, record.model)
+        elif isinstance(record, ParagraphRecord):
+            break
+    return ArchiveHeader(fields.get('VERSION'), fields.get('DATETIME'), block_types)
+
+
+# =============================================================================
+# 블록 레코드 인덱스
+# =============================================================================
+
+def index_block_types(file_path: str) -> Dict[str, str]:
+    """
+    .bkp 헤더의 블록 레코드를 한 번만 훑어 블록 이름 → 모델 타입 인덱스를 만듭니다.
+    스트리밍 토크나이저로 헤더 구간까지만 읽으므로 파일 전체를 메모리에 올리지 않습니다.
+    """
+    return read_header(file_path).block_types
+
+def index_block_categories(file_path: str, categories: Iterable[str]) -> Dict[str, str]:
+    """
+    블록 이름 → 카테고리 인덱스 (BkpArchive.block_categories). 파일은 mmap으로 열고 헤더의 블록 레코드 구간만 디코딩합니다.
+    """
+    with BkpArchive(file_path) as archive:
+        return archive.block_categories(categories)
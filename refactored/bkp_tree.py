@@ -0,0 +1,295 @@
+"""
+BKP 아카이브 기반 오프라인 Aspen 트리 모듈
+
+이 모듈은 .bkp 파일의 입력 언어 섹션과 결과 요약($_SUMMARY_FILE) 섹션을 파싱해
+Aspen COM 트리와 같은 FindNode / Elements / Value 인터페이스를 가진 메모리 내 노드 트리를 만듭니다.
+Aspen Plus가 없는 환경(Linux 배치 서버 등)에서도 data_manager의 추출 함수를 그대로 실행할 수 있습니다.
+
+결과 섹션의 값은 속성 ID로만 저장되어 있으므로, data_manager가 읽는 Output 노드 이름과
+속성 ID의 대응은 RESULT_VARIABLES 테이블로 관리합니다. 테이블에 없는 노드는 COM과 마찬가지로
+FindNode가 None을 반환합니다.
+"""
+
+from typing import Optional, Dict, Any, List, Tuple
+import re
+
+import bkp_reader
+
+# =============================================================================
+# 단위 세트 테이블
+# =============================================================================
+
+# UNITSET 코드 벡터에서 단위 타입의 위치(1부터). 결과 레이아웃의 단위 타입 태그(<n>)와 같은 번호입니다.
+UNIT_TYPE_POSITIONS = {
+    'MASS-FLOW': 10,
+    'MOLE-FLOW': 11,
+    'VOLUME-FLOW': 12,
+    'ENTHALPY-FLO': 13,
+    'HEAT-TRANS-C': 16,
+    'POWER': 19,
+    'PRESSURE': 20,
+    'TEMPERATURE': 22,
+    'VOLUME': 27,
+}
+
+def _codes(*units: str) -> Dict[int, str]:
+    return {i: unit for i, unit in enumerate(units, 1)}
+
+# 단위 타입별 코드 → 단위 문자열 (Unit_table.csv와 같은 Aspen 코드 순서, 표기는 unit_converter 기준)
+# ENTHALPY-FLO / HEAT-TRANS-C는 아카이브에서 확인된 코드만 수록합니다.
+UNIT_CODES = {
+    'MASS-FLOW': _codes('kg/sec', 'lb/hr', 'kg/hr', 'lb/sec', 'Mlb/hr', 'tons/day', 'gm/sec', 'tonne/hr',
+                        'lb/day', 'kg/day', 'tons/year', 'tons/hr', 'tonne/day', 'tonne/year', 'kg/min',
+                        'kg/year', 'gm/min', 'gm/hr', 'gm/day', 'Mgm/hr', 'Ggm/hr', 'Mgm/day', 'Ggm/day'),
+    'MOLE-FLOW': _codes('kmol/sec', 'lbmol/hr', 'kmol/hr', 'MMscfh', 'MMscmh', 'mol/sec', 'lbmol/sec', 'scmh',
+                        'bmol/day', 'kmol/day', 'MMscfd', 'Mlscfd', 'scfm', 'mol/min', 'kmol/khr', 'kmol/Mhr',
+                        'mol/hr', 'Mmol/hr', 'Mlbmol/hr', 'lbmol/Mhr', 'lbmol/MMhr', 'Mscfm', 'scfh'),
+    'VOLUME-FLOW': _codes('cum/sec', 'cuft/hr', 'l/min', 'gal/min', 'gal/hr', 'bbl/day', 'cum/hr', 'cuft/min',
+                          'bbl/hr', 'cuft/sec', 'cum/day', 'cum/year', 'l/hr', 'kbbl/day', 'MMcuft/hr',
+                          'MMcuft/day', 'Mcuft/day', 'l/sec', 'l/day', 'cum/min', 'kcum/sec', 'kcum/hr',
+                          'kcum/day', 'Mcum/sec', 'Mcum/hr', 'Mcum/day'),
+    'ENTHALPY-FLO': {1: 'Watt', 2: 'Btu/hr', 3: 'cal/sec', 18: 'Gcal/hr', 22: 'kJ/hr'},
+    'HEAT-TRANS-C': {1: 'Watt/sqm-K', 2: 'Btu/hr-sqft-R', 3: 'cal/sec-sqcm-K'},
+    'POWER': _codes('Watt', 'hp', 'kW', 'Btu/hr', 'cal/sec', 'ft-lbf/sec', 'MIW', 'GW', 'MJ/hr', 'kcal/hr',
+                    'Gcal/hr', 'MMBtu/hr', 'MBtu/hr', 'Mhp'),
+    'PRESSURE': _codes('N/sqm', 'Psia', 'atm', 'lbf/sqft', 'bar', 'torr', 'in-water', 'kg/sqcm', 'mmHg', 'kPa',
+                       'mm-water', 'mbar', 'psig', 'atmg', 'barg', 'kg/sqcmg', 'lb/ft-sqsec', 'kg/m-sqsec',
+                       'Pa', 'MiPa', 'Pag', 'kPag', 'MPag', 'mbarg', 'in-Hg'),
+    'TEMPERATURE': _codes('K', 'F', 'K', 'C', 'R'),
+    'VOLUME': _codes('cum', 'cuft', 'l', 'cuin', 'gal', 'bbl', 'cc', 'kcum', 'Mcum', 'Mcuft', 'MMcuft', 'ml',
+                     'kl', 'MMl', 'Mgal', 'MMgal', 'UKgal', 'MUKgal', 'MMUKgal', 'Mbbl', 'MMbbl', 'kbbl', 'cuyd'),
+}
+
+# 아카이브에 정의가 기록되지 않는 기본 단위 세트: 모든 단위 타입이 같은 코드를 씁니다.
+BUILTIN_UNIT_SETS = {'SI': 1, 'ENG': 2, 'MET': 3}
+
+_UNIT_TYPE_BY_POSITION = {pos: unit_type for unit_type, pos in UNIT_TYPE_POSITIONS.items()}
+
+def unit_string(unit_type_position: Optional[int], unit_code: Optional[int]) -> Optional[str]:
+    """결과/입력 값의 (단위 타입 위치, 단위 코드) 태그를 단위 문자열로 바꿉니다. 모르는 조합은 None"""
+    unit_type = _UNIT_TYPE_BY_POSITION.get(unit_type_position)
+    if unit_type is None or unit_code is None:
+        return None
+    return UNIT_CODES[unit_type].get(unit_code)
+
+# =============================================================================
+# 결과 레코드 → Output 노드 매핑
+# =============================================================================
+
+# (모델, 결과 레코드) → {속성 ID: Output 노드 이름}
+# 반복 레이아웃(스테이지별 등)의 값은 Output\<이름>\<인덱스> 노드가 됩니다.
+RESULT_VARIABLES = {
+    ('PUMP', 'RES_W'): {22: 'WNET', 183: 'IN_PRES', 24: 'POC', 19: 'FEED_VFLOW'},
+    ('COMPR', 'RES_W'): {22: 'WNET', 183: 'IN_PRES', 24: 'POC', 28: 'FEED_VFLOW'},
+    ('MCOMPR', 'MCMP_RES'): {22: 'WNET'},
+    ('MCOMPR', 'MCMP_PRF'): {32: 'B_PRES', 31: 'B_TEMP', 16: 'BRAKE_POWER'},
+    ('MCOMPR', 'COOL_PRF'): {143: 'COOL_TEMP', 1: 'QCALC'},
+    ('HEATER', 'RES_Q'): {1: 'QCALC', 31: 'B_TEMP', 32: 'B_PRES'},
+    ('HEATX', 'HTX_RES'): {944: 'HX_DUTY', 945: 'HX_AREAP', 955: 'HX_DTLM', 165: 'HOT_PRES', 170: 'COLD_PRES'},
+    ('RSTOIC', 'RES_Q'): {1: 'QCALC', 31: 'B_TEMP', 32: 'R_PRES'},
+    ('REQUIL', 'RES_Q'): {1: 'QCALC', 31: 'B_TEMP', 32: 'R_PRES'},
+    ('RYIELD', 'RES_Q'): {1: 'QCALC', 31: 'B_TEMP', 32: 'R_PRES'},
+    ('MATERIAL', 'RES_STR'): {7001: 'RES_TEMP', 7002: 'RES_PRES', 8103: 'RES_MASSFLOW', 204: 'RES_VOLFLOW',
+                              8101: 'RES_MOLEFLOW', 7003: 'RES_VFRAC'},
+    ('', 'USAGE'): {182: 'UTL_IN_TEMP', 1021: 'UTL_OUT_TEMP', 183: 'UTL_IN_PRES', 1022: 'UTL_OUT_PRES'},
+}
+
+# Output에 결과가 없을 때 입력값을 그대로 보여주는 노드 (Output 이름 → Input 이름)
+OUTPUT_FROM_INPUT = {
+    'UTL_ID': 'UTILITY_ID',
+}
+
+# 반복 행 문장의 첫 키워드가 이 패턴이면 행 인덱스로 사용합니다 (CL-STAGE, FEED-SID, PROD-STREAM ...)
+_ROW_INDEX_KEY_RE = re.compile(r'-(STAGE|SID|STREAM|NO)$')
+_UNITSET_RE = re.compile(r'BASESET\s*=\s*"?([^\s"]+)"?\s*\(([^)]*)\)')
+
+# =============================================================================
+# 노드 / 문서
+# =============================================================================
+
+class BkpNode:
+    """Aspen COM 트리 노드를 흉내 내는 노드 (Name / Value / UnitString / Elements / FindNode)"""
+    __slots__ = ('Name', 'Value', 'UnitString', '_children')
+
+    def __init__(self, name: str, value: Any = None, unit: Optional[str] = None):
+        self.Name = name
+        self.Value = value
+        self.UnitString = unit
+        self._children: Dict[str, "BkpNode"] = {}
+
+    @property
+    def Elements(self) -> List["BkpNode"]:
+        return list(self._children.values())
+
+    def child(self, name: str) -> "BkpNode":
+        """하위 노드를 반환합니다. 없으면 만듭니다."""
+        node = self._children.get(name)
+        if node is None:
+            node = self._children[name] = BkpNode(name)
+        return node
+
+    def set(self, path: str, value: Any, unit: Optional[str] = None) -> "BkpNode":
+        node = self
+        for part in path.split('\\'):
+            node = node.child(part)
+        node.Value = value
+        node.UnitString = unit
+        return node
+
+    def FindNode(self, path: str) -> Optional["BkpNode"]:
+        node = self
+        for part in path.strip('\\').split('\\'):
+            if part:
+                node = node._children.get(part)
+                if node is None:
+                    return None
+        return node
+
+    def __repr__(self) -> str:
+        return f"BkpNode({self.Name!r}, {self.Value!r})"
+
+class BkpDocument:
+    """Apwn.Document 대신 쓰는 오프라인 문서. InitFromArchive2로 .bkp를 읽어 Tree를 구성합니다."""
+    def __init__(self):
+        self.Tree = BkpNode('')
+        self.visible = 0
+        self.file_path: Optional[str] = None
+
+    def InitFromArchive2(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.Tree = build_tree(file_path)
+
+    def Close(self) -> None:
+        pass
+
+def open_document(file_path: str) -> BkpDocument:
+    """.bkp 파일로 오프라인 문서를 엽니다."""
+    document = BkpDocument()
+    document.InitFromArchive2(file_path)
+    return document
+
+# =============================================================================
+# 트리 구성
+# =============================================================================
+
+def build_tree(file_path: str) -> BkpNode:
+    """.bkp 파일의 입력/결과 섹션으로 \\Data 이하 트리를 만듭니다."""
+    root = BkpNode('')
+    data = root.child('Data')
+    with bkp_reader.BkpArchive(file_path) as archive:
+        _add_setup(data.child('Setup'), archive)
+        blocks = data.child('Blocks')
+        streams = data.child('Streams')
+        utilities = data.child('Utilities')
+
+        for name in archive.block_names():
+            node = blocks.child(name)
+            _add_input(node, archive.block_text(name))
+            _add_results(node, archive.result_records('block', name))
+        _add_connections(blocks, streams, archive)
+        for name in archive.stream_names():
+            node = streams.child(name)
+            _add_input(node, archive.stream_text(name))
+            _add_results(node, archive.result_records('stream', name))
+        for name in archive.utility_names():
+            node = utilities.child(name)
+            _add_input(node, archive.utility_text(name))
+            _add_results(node, archive.result_records('utility', name))
+    return root
+
+def _add_input(node: BkpNode, text: str) -> None:
+    """입력 문단의 키워드를 Input\\<KEY> (반복 행은 Input\\<KEY>\\<인덱스>) 노드로 추가합니다."""
+    if not text:
+        return
+    _, sentences = bkp_reader.parse_input_paragraph(text)
+    input_node = node.child('Input')
+    for sentence in sentences:
+        rows = [row for row in sentence.rows if row]
+        indexed = len(rows) > 1 or (rows and _ROW_INDEX_KEY_RE.search(rows[0][0].key) is not None)
+        for row in rows:
+            entries = row[1:] if indexed else row
+            for entry in entries:
+                key = entry.key.replace('-', '_')
+                path = f"{key}\\{row[0].value}" if indexed else key
+                input_node.set(path, entry.value, unit_string(entry.unit_type, entry.unit_code))
+
+def _add_results(node: BkpNode, records: List[bkp_reader.ResultRecord]) -> None:
+    """결과 레코드 중 RESULT_VARIABLES에 등록된 값을 Output 노드로 추가합니다."""
+    output = node.child('Output')
+    for record in records:
+        variables = RESULT_VARIABLES.get((record.model, record.variable))
+        if not variables:
+            continue
+        for field in record.fields:
+            name = variables.get(field.prop_id)
+            if name is None:
+                continue
+            path = name if field.index is None else f"{name}\\{field.index}"
+            output.set(path, field.value, unit_string(field.unit_type, field.unit_code))
+
+    input_node = node.FindNode('Input')
+    for output_name, input_name in OUTPUT_FROM_INPUT.items():
+        source = input_node.FindNode(input_name) if input_node else None
+        if source is not None and output.FindNode(output_name) is None:
+            output.set(output_name, source.Value, source.UnitString)
+
+def _add_connections(blocks: BkpNode, streams: BkpNode, archive: bkp_reader.BkpArchive) -> None:
+    """FLOWSHEET 문단의 IN/OUT 목록으로 Blocks\\<블록>\\Connections\\<스트림> 노드를 만듭니다."""
+    for block, ports in archive.block_connections().items():
+        connections = blocks.child(block).child('Connections')
+        for stream, port, direction in ports:
+            connections.set(stream, _port_label(port, direction))
+            streams.child(stream)
+
+def _port_label(port: str, direction: str) -> str:
+    """포트 ID('M0-1', 'Q1-2')를 COM Connections 값 형식('F(IN)', 'P(OUT)', 'HS(OUT)')으로 바꿉니다."""
+    if port.startswith('Q'):
+        prefix = 'HS'
+    elif port.startswith('W'):
+        prefix = 'WS'
+    else:
+        prefix = 'F' if direction == 'IN' else 'P'
+    return f"{prefix}({direction})"
+
+def _add_setup(setup: BkpNode, archive: bkp_reader.BkpArchive) -> None:
+    """Setup\\Global\\Input(INSET/OUTSET)과 Setup\\Units-Sets\\<세트>\\Unit-Types\\<타입> 노드를 만듭니다."""
+    global_input = setup.child('Global').child('Input')
+    for _, text in archive.paragraphs('SETUP', 'GLOBAL'):
+        _, sentences = bkp_reader.parse_input_paragraph(text)
+        for sentence in sentences:
+            for row in sentence.rows:
+                for entry in row:
+                    global_input.set(entry.key.replace('-', '_'), entry.value)
+    # 출력 단위 세트를 따로 지정하지 않으면 입력 단위 세트를 그대로 씁니다.
+    if global_input.FindNode('OUTSET') is None and global_input.FindNode('INSET') is not None:
+        global_input.set('OUTSET', global_input.FindNode('INSET').Value)
+
+    unit_sets = setup.child('Units-Sets')
+    codes_by_set: Dict[str, Tuple[str, List[int]]] = {}
+    for paragraph_id, text in archive.paragraphs('SETUP', 'UNITS-SET'):
+        match = _UNITSET_RE.search(text)
+        if len(paragraph_id) >= 3 and match:
+            codes = [int(c) for c in match.group(2).split() if c.lstrip('-').isdigit()]
+            codes_by_set[paragraph_id[2]] = (match.group(1), codes)
+
+    for set_name in list(BUILTIN_UNIT_SETS) + list(codes_by_set):
+        unit_types = unit_sets.child(set_name).child('Unit-Types')
+        for unit_type, position in UNIT_TYPE_POSITIONS.items():
+            code = _unit_code(set_name, position, codes_by_set)
+            unit = UNIT_CODES[unit_type].get(code) if code is not None else None
+            if unit is not None:
+                unit_types.set(unit_type, unit)
+
+def _unit_code(set_name: str, position: int, codes_by_set: Dict[str, Tuple[str, List[int]]]) -> Optional[int]:
+    """단위 세트의 특정 위치 코드. 코드 벡터에 없으면 BASESET을 따라갑니다."""
+    seen = set()
+    while set_name not in seen:
+        seen.add(set_name)
+        if set_name in codes_by_set:
+            base, codes = codes_by_set[set_name]
+            if position <= len(codes):
+                return codes[position - 1]
+            set_name = base
+        else:
+            return BUILTIN_UNIT_SETS.get(set_name)
+    return None
@@ -0,0 +1,214 @@
+"""
+COM 트리 접근 프로파일러 모듈
+
+Application을 ProfiledDocument로 감싸면 Tree의 FindNode / .Value / .Elements 접근마다
+경과 시간, 경로 템플릿(블록/스트림/유틸리티 이름과 단 번호를 {block} 등으로 치환), 성공 여부, 호출 함수를 기록합니다.
+format_report는 비싼 템플릿 순위, 같은 경로의 중복 읽기, 실패한 조회를 표로 정리합니다. (main.py --com-profile)
+COM 워커 문서는 메인 스레드 쪽(WorkerDocument)을 감싸야 호출 함수가 추출 코드로 기록되며, 일괄 읽기(read_nodes/read_subtrees)는 'Batch'로 기록합니다.
+"""
+
+from typing import Optional, Dict, List, Any, NamedTuple
+from collections import defaultdict
+import sys
+import time
+
+# =============================================================================
+# 접근 기록
+# =============================================================================
+
+class ComAccess(NamedTuple):
+    """트리 접근 한 번의 기록"""
+    op: str            # 'FindNode' | 'Value' | 'Elements' | 'Batch'
+    path: str
+    template: str
+    elapsed: float     # 초
+    ok: bool           # FindNode가 None을 반환하거나 예외가 나면 False
+    caller: str        # 'module.function'
+
+# 경로 템플릿: 이름이 오는 위치의 컬렉션 → 치환 이름
+_NAMED_COLLECTIONS = {
+    'Blocks': '{block}',
+    'Streams': '{stream}',
+    'Utilities': '{utility}',
+    'Connections': '{stream}',
+    'Units-Sets': '{unit_set}',
+}
+
+def path_template(path: str) -> str:
+    """
+    경로에서 블록/스트림/유틸리티/단위 세트 이름과 숫자(단 번호 등)를 치환한 템플릿
+    예: \\Data\\Blocks\\B1\\Output\\B_PRES\\2 → \\Data\\Blocks\\{block}\\Output\\B_PRES\\{n}
+    """
+    parts = path.split('\\')
+    for i in range(1, len(parts)):
+        if parts[i - 1] in _NAMED_COLLECTIONS and parts[i]:
+            parts[i] = _NAMED_COLLECTIONS[parts[i - 1]]
+        elif parts[i].isdigit():
+            parts[i] = '{n}'
+    return '\\'.join(parts)
+
+# 호출 함수로 보지 않는 프레임 (프로파일러, 재시도 정책, COM 워커, 노드 캐시, 스냅샷 트리의 전달 함수)
+_PLUMBING_MODULES = {__name__, 'com_retry', 'com_worker'}
+_PLUMBING_FUNCTIONS = {'_find_node', '_cached_find_node', '_read_live_node', 'get_data', 'FindNode', '_elements_of',
+                       'Value', 'Elements', 'read_node', 'read_nodes', 'walk', '<listcomp>', '<dictcomp>', '<genexpr>', '<lambda>'}
+
+def _caller() -> str:
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '?')
+        function = frame.f_code.co_name
+        if module not in _PLUMBING_MODULES and function not in _PLUMBING_FUNCTIONS:
+            return f"{module}.{function}"
+        frame = frame.f_back
+    return '?'
+
+class ComProfiler:
+    """접근 기록 모음"""
+    def __init__(self):
+        self.accesses: List[ComAccess] = []
+
+    def record(self, op: str, path: str, elapsed: float, ok: bool) -> None:
+        self.accesses.append(ComAccess(op, path, path_template(path), elapsed, ok, _caller()))
+
+    def clear(self) -> None:
+        self.accesses.clear()
+
+    @property
+    def total_time(self) -> float:
+        return sum(access.elapsed for access in self.accesses)
+
+# =============================================================================
+# 트리/문서 래퍼
+# =============================================================================
+
+class ProfiledNode:
+    """COM 트리 노드 래퍼. FindNode/Value/Elements는 시간을 재어 기록하고, 그 외 속성은 그대로 전달합니다."""
+    def __init__(self, node, path: str, profiler: ComProfiler):
+        self._node = node
+        self._path = path
+        self._profiler = profiler
+
+    def FindNode(self, path: str) -> Optional["ProfiledNode"]:
+        start = time.perf_counter()
+        try:
+            node = self._node.FindNode(path)
+        except Exception:
+            self._profiler.record('FindNode', path, time.perf_counter() - start, False)
+            raise
+        self._profiler.record('FindNode', path, time.perf_counter() - start, node is not None)
+        return ProfiledNode(node, path, self._profiler) if node is not None else None
+
+    @property
+    def Value(self) -> Any:
+        start = time.perf_counter()
+        try:
+            value = self._node.Value
+        except Exception:
+            self._profiler.record('Value', self._path, time.perf_counter() - start, False)
+            raise
+        self._profiler.record('Value', self._path, time.perf_counter() - start, True)
+        return value
+
+    @property
+    def Elements(self) -> List["ProfiledNode"]:
+        start = time.perf_counter()
+        try:
+            children = list(self._node.Elements)
+        except Exception:
+            self._profiler.record('Elements', self._path, time.perf_counter() - start, False)
+            raise
+        self._profiler.record('Elements', self._path, time.perf_counter() - start, True)
+        return [ProfiledNode(child, f"{self._path}\\{child.Name}", self._profiler) for child in children]
+
+    def _batch(self, read, items: List[Any], path_of) -> Any:
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = read(items)
+            ok = True
+        finally:
+            # 일괄 요청(COM 워커) 한 번의 시간을 경로 수로 나눠 경로마다 기록합니다.
+            elapsed = (time.perf_counter() - start) / max(len(items), 1)
+            for item in items:
+                self._profiler.record('Batch', path_of(item), elapsed, ok)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._node, name)
+        if name == 'read_nodes':
+            return lambda paths, *args: self._batch(lambda items: attribute(items, *args), list(paths), lambda path: path)
+        if name == 'read_subtrees':
+            return lambda roots: self._batch(attribute, list(roots), lambda root: root[0])
+        return attribute
+
+class ProfiledDocument:
+    """Application 래퍼. Tree 접근을 ComProfiler에 기록하고, 그 외 속성(Close, Engine 등)은 그대로 전달합니다."""
+    def __init__(self, Application, profiler: Optional[ComProfiler] = None):
+        self._application = Application
+        self.profiler = profiler if profiler is not None else ComProfiler()
+        self.Tree = ProfiledNode(Application.Tree, '', self.profiler)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._application, name)
+
+# =============================================================================
+# 리포트
+# =============================================================================
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:9.2f}"
+
+def _group(accesses: List[ComAccess], key) -> Dict[Any, List[ComAccess]]:
+    groups: Dict[Any, List[ComAccess]] = defaultdict(list)
+    for access in accesses:
+        groups[key(access)].append(access)
+    return groups
+
+def _top_callers(accesses: List[ComAccess], limit: int = 2) -> str:
+    counts: Dict[str, int] = defaultdict(int)
+    for access in accesses:
+        counts[access.caller.rsplit('.', 1)[-1]] += 1
+    return ', '.join(name for name, _ in sorted(counts.items(), key=lambda item: -item[1])[:limit])
+
+def format_report(profiler: ComProfiler, top: int = 15) -> str:
+    """비싼 템플릿 순위 / 중복 읽기 / 실패한 조회 리포트 문자열"""
+    accesses = profiler.accesses
+    total = profiler.total_time
+    lines = ["=" * 100, "COM PROFILE", "=" * 100]
+    if not accesses:
+        lines += ["  No COM tree accesses recorded.", "=" * 100]
+        return '\n'.join(lines)
+    by_op = _group(accesses, lambda access: access.op)
+    lines.append(f"  {len(accesses)} accesses, {total * 1000:.1f} ms total  ("
+                 + ', '.join(f"{op} {len(items)}" for op, items in sorted(by_op.items())) + ")")
+
+    # 1. 비싼 템플릿
+    lines += ["", f"  Most expensive templates (top {top})",
+              f"  {'op':<9} {'template':<52} {'calls':>6} {'total ms':>9} {'mean ms':>9} {'share':>6}  callers",
+              "  " + "─" * 96]
+    templates = sorted(_group(accesses, lambda access: (access.op, access.template)).items(),
+                       key=lambda item: -sum(access.elapsed for access in item[1]))
+    for (op, template), items in templates[:top]:
+        spent = sum(access.elapsed for access in items)
+        lines.append(f"  {op:<9} {template:<52} {len(items):>6} {_ms(spent)} {_ms(spent / len(items))} "
+                     f"{spent / total if total else 0:>6.0%}  {_top_callers(items)}")
+
+    # 2. 중복 읽기 (같은 경로, 같은 접근)
+    duplicates = [(key, items) for key, items in _group(accesses, lambda access: (access.op, access.path)).items() if len(items) > 1]
+    wasted = sum(sum(access.elapsed for access in items[1:]) for _, items in duplicates)
+    extra = sum(len(items) - 1 for _, items in duplicates)
+    lines += ["", f"  Duplicate reads: {extra} repeated accesses on {len(duplicates)} paths, {wasted * 1000:.1f} ms",
+              f"  {'op':<9} {'path':<52} {'reads':>6} {'extra ms':>9}  callers", "  " + "─" * 96]
+    duplicates.sort(key=lambda item: (-len(item[1]), -sum(access.elapsed for access in item[1])))
+    for (op, path), items in duplicates[:top]:
+        lines.append(f"  {op:<9} {path:<52} {len(items):>6} {_ms(sum(access.elapsed for access in items[1:]))}  {_top_callers(items)}")
+
+    # 3. 실패한 조회
+    failures = [access for access in accesses if not access.ok]
+    failed = sorted(_group(failures, lambda access: (access.op, access.template)).items(), key=lambda item: -len(item[1]))
+    lines += ["", f"  Failed lookups: {len(failures)} on {len(failed)} templates",
+              f"  {'op':<9} {'template':<52} {'count':>6}  example / callers", "  " + "─" * 96]
+    for (op, template), items in failed[:top]:
+        lines.append(f"  {op:<9} {template:<52} {len(items):>6}  {items[0].path}  ({_top_callers(items)})")
+    lines.append("=" * 100)
+    return '\n'.join(lines)
@@ -0,0 +1,129 @@
+"""
+COM 읽기 재시도/속도 조절 모듈
+
+라이브 트리 호출(FindNode / .Value / .Elements)이 예외를 내면 지수 백오프로 MAX_RETRY_ATTEMPTS번까지 다시 시도하고,
+끝내 실패하면 ComReadError를 냅니다. FindNode가 None을 돌려주는 '노드 없음'은 정상 결과로 재시도하지 않으므로,
+읽기 실패가 값 없음(None)으로 바뀌어 잘못된 비용이 계산되는 일이 없습니다.
+호출 사이 간격은 최근 오류율(지수 이동 평균)에 비례해 0에서 COM_CALL_INTERVAL까지 늘어나고, 오류가 줄면 다시 줄어듭니다.
+"""
+
+from typing import Optional, Dict, List, Any, Callable
+import time
+
+# 이 오류율(지수 이동 평균) 이상이면 호출 간격을 최대(max_interval)로 둡니다.
+THROTTLE_FULL_ERROR_RATE = 0.2
+# 오류율 이동 평균의 가중치 (최근 호출 약 1/α개를 반영)
+ERROR_RATE_ALPHA = 0.05
+
+class ComReadError(RuntimeError):
+    """재시도 후에도 실패한 COM 호출 (노드가 없는 것과 구분)"""
+    def __init__(self, path: str, operation: str, attempts: int, cause: BaseException):
+        super().__init__(f"{operation} {path} failed after {attempts} attempt(s): {cause}")
+        self.path = path
+        self.operation = operation
+        self.attempts = attempts
+        self.cause = cause
+
+# =============================================================================
+# 재시도 정책
+# =============================================================================
+
+class RetryPolicy:
+    """
+    - max_attempts: 호출당 최대 시도 횟수 (1이면 재시도 없음)
+    - backoff: 첫 재시도 전 대기(초). 재시도마다 두 배, max_backoff까지
+    - max_interval: 오류율이 높을 때 호출 사이에 두는 최대 간격(초)
+    경로별 실패 횟수(failures, 재시도된 실패 포함)와 최종 실패 경로(failed_paths)를 기록합니다.
+    """
+    def __init__(self, max_attempts: int = 3, backoff: float = 0.05, max_backoff: float = 2.0,
+                 max_interval: float = 0.1, sleep: Callable[[float], None] = time.sleep):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_interval = max_interval
+        self._sleep = sleep
+        self.error_rate = 0.0
+        self.calls = 0
+        self.retries = 0
+        self.failures: Dict[str, int] = {}
+        self.failed_paths: List[str] = []
+        self._last_call = 0.0
+
+    @property
+    def interval(self) -> float:
+        """현재 호출 간격(초): 오류율에 비례, 오류가 없으면 0"""
+        return self.max_interval * min(1.0, self.error_rate / THROTTLE_FULL_ERROR_RATE)
+
+    def _throttle(self) -> None:
+        interval = self.interval
+        if interval > 0:
+            wait = self._last_call + interval - time.monotonic()
+            if wait > 0:
+                self._sleep(wait)
+        self._last_call = time.monotonic()
+
+    def _observe(self, failed: bool) -> None:
+        self.error_rate += ERROR_RATE_ALPHA * ((1.0 if failed else 0.0) - self.error_rate)
+
+    def call(self, path: str, operation: str, fn: Callable[..., Any], *args) -> Any:
+        """fn(*args)를 실행합니다. 예외가 나면 백오프 후 다시 시도하고, 모두 실패하면 ComReadError"""
+        delay = self.backoff
+        for attempt in range(1, self.max_attempts + 1):
+            self._throttle()
+            self.calls += 1
+            try:
+                result = fn(*args)
+            except Exception as e:
+                self._observe(True)
+                self.failures[path] = self.failures.get(path, 0) + 1
+                if attempt == self.max_attempts:
+                    self.failed_paths.append(path)
+                    raise ComReadError(path, operation, attempt, e) from e
+                self.retries += 1
+                self._sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+                continue
+            self._observe(False)
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failed": len(self.failed_paths),
+            "error_rate": self.error_rate,
+            "interval": self.interval,
+            "failures_by_path": dict(sorted(self.failures.items(), key=lambda item: -item[1])),
+        }
+
+# =============================================================================
+# 재시도 노드 래퍼
+# =============================================================================
+
+class RetryingNode:
+    """라이브 노드 래퍼. Value/Elements 읽기와 하위 FindNode를 RetryPolicy를 거쳐 호출합니다."""
+    def __init__(self, node, path: str, policy: RetryPolicy):
+        self._node = node
+        self._path = path
+        self._policy = policy
+        self.Name = path.rsplit('\\', 1)[-1]
+
+    @property
+    def Value(self) -> Any:
+        return self._policy.call(self._path, 'Value', lambda: self._node.Value)
+
+    @property
+    def Elements(self) -> List["RetryingNode"]:
+        children = self._policy.call(self._path, 'Elements', lambda: list(self._node.Elements))
+        return [RetryingNode(child, f"{self._path}\\{child.Name}", self._policy) for child in children]
+
+    def FindNode(self, path: str) -> Optional["RetryingNode"]:
+        return find_node(self._node, path, self._policy)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._node, name)
+
+def find_node(tree, path: str, policy: RetryPolicy) -> Optional[RetryingNode]:
+    """tree.FindNode(path)를 재시도 정책으로 호출합니다. 노드가 없으면 None (재시도하지 않음)"""
+    node = policy.call(path, 'FindNode', tree.FindNode, path)
+    return RetryingNode(node, path, policy) if node is not None else None
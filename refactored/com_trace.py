@@ -0,0 +1,202 @@
+"""
+COM 세션 기록/재생 모듈
+
+RecordingDocument로 Application을 감싸면 Tree의 FindNode(존재 여부) / .Value / .Elements(하위 이름) 접근을
+경로별로 기록하고, gzip JSON 트레이스 파일로 저장합니다.
+ReplayDocument는 트레이스만으로 같은 접근에 같은 결과를 돌려주는 Application 대용이므로
+Aspen 없이(Linux 포함) 추출을 재현하는 테스트 픽스처나 벤치마크 입력으로 쓸 수 있습니다.
+트레이스에 없는 접근은 None(하위 목록은 빈 목록)을 돌려주고 missing에 기록합니다 (strict=True면 TraceMissError).
+"""
+
+from typing import Optional, Dict, List, Any
+from collections import Counter
+from dataclasses import dataclass, field
+import gzip
+import json
+import os
+import time
+
+# 트레이스 파일 형식이 바뀌면 올립니다.
+TRACE_FORMAT_VERSION = 1
+
+class TraceMissError(KeyError):
+    """재생 중 트레이스에 없는 접근 (strict 모드)"""
+
+# =============================================================================
+# 트레이스
+# =============================================================================
+
+@dataclass
+class ComTrace:
+    """
+    경로별 기록 {경로: {'found': bool, 'value': 값, 'elements': [하위 이름, ...]}}.
+    각 키는 그 접근이 실제로 일어난 경우에만 있습니다 (Elements로 얻은 노드는 'found' 대신 부모의 'elements'로 존재를 판단).
+    """
+    source: str = ''
+    nodes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    accesses: int = 0
+
+    def record(self, op: str, path: str, result: Any) -> None:
+        entry = self.nodes.setdefault(path, {})
+        if op == 'FindNode':
+            entry['found'] = result
+        elif op == 'Value':
+            entry['value'] = result
+        else:
+            entry['elements'] = result
+        self.accesses += 1
+
+    def found(self, path: str) -> Optional[bool]:
+        """
+        경로의 노드 존재 여부. FindNode로 기록되지 않았어도 부모의 하위 목록이 기록되어 있으면 그 목록으로 판단합니다.
+        알 수 없으면 None
+        """
+        entry = self.nodes.get(path)
+        if entry is not None and 'found' in entry:
+            return entry['found']
+        parent_path, _, name = path.rpartition('\\')
+        parent = self.nodes.get(parent_path)
+        if parent is not None and 'elements' in parent:
+            return name in parent['elements']
+        return None
+
+    def save(self, trace_path: str) -> int:
+        """트레이스를 gzip JSON으로 저장하고 파일 크기(바이트)를 반환합니다."""
+        payload = {'version': TRACE_FORMAT_VERSION, 'source': self.source, 'recorded_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                   'accesses': self.accesses, 'nodes': self.nodes}
+        os.makedirs(os.path.dirname(os.path.abspath(trace_path)), exist_ok=True)
+        tmp_path = f"{trace_path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'), default=str)
+        os.replace(tmp_path, trace_path)
+        return os.path.getsize(trace_path)
+
+    @classmethod
+    def load(cls, trace_path: str) -> "ComTrace":
+        """트레이스 파일을 읽습니다. 형식 버전이 다르면 ValueError"""
+        with gzip.open(trace_path, 'rt', encoding='utf-8') as f:
+            payload = json.load(f)
+        if payload.get('version') != TRACE_FORMAT_VERSION:
+            raise ValueError(f"unsupported trace format version {payload.get('version')} in {trace_path}")
+        return cls(payload.get('source', ''), payload.get('nodes', {}), payload.get('accesses', 0))
+
+# =============================================================================
+# 기록
+# =============================================================================
+
+class RecordingNode:
+    """COM 트리 노드 래퍼. FindNode/Value/Elements 결과를 트레이스에 기록하고, 그 외 속성은 그대로 전달합니다."""
+    def __init__(self, node, path: str, trace: ComTrace):
+        self._node = node
+        self._path = path
+        self._trace = trace
+
+    def FindNode(self, path: str) -> Optional["RecordingNode"]:
+        full_path = f"{self._path}\\{path}" if self._path else path
+        node = self._node.FindNode(path)
+        self._trace.record('FindNode', full_path, node is not None)
+        return RecordingNode(node, full_path, self._trace) if node is not None else None
+
+    @property
+    def Value(self) -> Any:
+        value = self._node.Value
+        self._trace.record('Value', self._path, value)
+        return value
+
+    @property
+    def Elements(self) -> List["RecordingNode"]:
+        children = list(self._node.Elements)
+        names = [str(child.Name) for child in children]
+        self._trace.record('Elements', self._path, names)
+        return [RecordingNode(child, f"{self._path}\\{name}", self._trace) for child, name in zip(children, names)]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._node, name)
+
+class RecordingDocument:
+    """
+    Application 래퍼. Tree 접근을 trace에 기록하며, save()나 Close()에서 trace_path로 저장합니다.
+    그 외 속성(Engine 등)은 그대로 전달합니다.
+    """
+    def __init__(self, Application, trace_path: str, source: str = ''):
+        self._application = Application
+        self.trace_path = trace_path
+        self.trace = ComTrace(source)
+        self.Tree = RecordingNode(Application.Tree, '', self.trace)
+
+    def save(self) -> int:
+        return self.trace.save(self.trace_path)
+
+    def Close(self) -> None:
+        self.save()
+        close = getattr(self._application, 'Close', None)
+        if close is not None:
+            close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._application, name)
+
+# =============================================================================
+# 재생
+# =============================================================================
+
+class ReplayNode:
+    """트레이스 위의 노드. 기록되지 않은 Value/Elements 접근은 문서의 missing에 남깁니다."""
+    def __init__(self, document: "ReplayDocument", path: str):
+        self._document = document
+        self._path = path
+        self.Name = path.rsplit('\\', 1)[-1]
+
+    def FindNode(self, path: str) -> Optional["ReplayNode"]:
+        full_path = f"{self._path}\\{path}" if self._path else path
+        found = self._document.trace.found(full_path)
+        if found is None:
+            self._document._miss('FindNode', full_path)
+            return None
+        return ReplayNode(self._document, full_path) if found else None
+
+    @property
+    def Value(self) -> Any:
+        entry = self._document.trace.nodes.get(self._path)
+        if entry is None or 'value' not in entry:
+            self._document._miss('Value', self._path)
+            return None
+        return entry['value']
+
+    @property
+    def Elements(self) -> List["ReplayNode"]:
+        entry = self._document.trace.nodes.get(self._path)
+        if entry is None or 'elements' not in entry:
+            self._document._miss('Elements', self._path)
+            return []
+        return [ReplayNode(self._document, f"{self._path}\\{name}") for name in entry['elements']]
+
+class ReplayDocument:
+    """
+    트레이스로 만든 Application 대용 (엔진 없음: run_simulation은 경고만 출력).
+    missing: 트레이스에 없던 접근 {(op, 경로): 횟수}. strict=True면 첫 누락에서 TraceMissError를 냅니다.
+    """
+    def __init__(self, trace: ComTrace, strict: bool = False):
+        self.trace = trace
+        self.strict = strict
+        self.missing: Counter = Counter()
+        self.Tree = ReplayNode(self, '')
+
+    def _miss(self, op: str, path: str) -> None:
+        if self.strict:
+            raise TraceMissError(f"{op} {path} is not in the trace")
+        self.missing[(op, path)] += 1
+
+    def format_missing(self, top: int = 20) -> str:
+        """트레이스에 없던 접근 요약 (많은 순)"""
+        lines = [f"Trace misses: {len(self.missing)} distinct accesses ({sum(self.missing.values())} total)"]
+        for (op, path), count in self.missing.most_common(top):
+            lines.append(f"  {count:5d}  {op:<9} {path}")
+        return "\n".join(lines)
+
+    def Close(self) -> None:
+        pass
+
+def open_replay(trace_path: str, strict: bool = False) -> ReplayDocument:
+    """트레이스 파일로 재생 문서를 엽니다."""
+    return ReplayDocument(ComTrace.load(trace_path), strict)
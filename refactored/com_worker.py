@@ -0,0 +1,237 @@
+"""
+COM 전용 워커 스레드 모듈
+
+Apwn.Document는 만든 스레드(STA 아파트)에서만 호출할 수 있으므로, 문서를 워커 스레드 하나가 열고 소유하며
+큐로 들어온 읽기 요청을 순서대로 처리해 concurrent.futures.Future로 결과를 돌려줍니다.
+메인 스레드는 요청을 제출해 두고 다른 계산(스트림 테이블 로드, 비용 계산, UI)을 계속할 수 있습니다.
+
+- ComWorker: 워커 스레드와 요청 큐 (submit / read_nodes / read_subtrees)
+- WorkerDocument: 기존 추출 코드가 그대로 쓸 수 있는 Application 대용 (Tree.FindNode는 워커에 요청 후 대기)
+- FakeComDocument: .bkp 오프라인 트리 위의 가짜 Apwn.Document. 만든 스레드 밖에서 호출하면 COM처럼 예외를 냅니다 (Linux 테스트용)
+"""
+
+from typing import Optional, Dict, List, Any, Callable, Iterable, Set, Tuple
+from concurrent.futures import Future
+import queue
+import threading
+import time
+
+try:
+    import pythoncom
+except ImportError:  # Windows/pywin32가 없는 환경: 아파트 초기화 없이 실행
+    pythoncom = None
+
+import bkp_tree
+from extraction_plan import NodeSnapshot, read_node, read_nodes, read_subtree
+
+# =============================================================================
+# 워커 스레드
+# =============================================================================
+
+class ComWorker:
+    """
+    문서를 소유하는 단일 워커 스레드.
+    open_document는 워커 스레드 안에서 호출되어 문서를 만들고(COM 객체는 만든 스레드에 묶임), 이후 모든 요청도 같은 스레드에서 실행됩니다.
+    ready는 문서 열기가 끝나면 완료되는 Future이며, 열기에 실패하면 그 예외를 담습니다.
+    """
+    def __init__(self, open_document: Callable[[], Any], name: str = 'aspen-com'):
+        self._requests: "queue.Queue[Optional[Tuple[Callable, tuple, Future]]]" = queue.Queue()
+        self._document = None
+        self.ready: Future = Future()
+        self._thread = threading.Thread(target=self._run, args=(open_document,), name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self, open_document: Callable[[], Any]) -> None:
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
+        try:
+            try:
+                self._document = open_document()
+            except BaseException as e:  # connect_to_aspen은 실패 시 sys.exit를 호출합니다.
+                self.ready.set_exception(e)
+                return
+            self.ready.set_result(self._document)
+            while True:
+                request = self._requests.get()
+                if request is None:
+                    break
+                fn, args, future = request
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(fn(self._document, *args))
+                except BaseException as e:
+                    future.set_exception(e)
+            try:
+                self._document.Close()
+            except Exception:
+                pass
+        finally:
+            self._document = None
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+    def submit(self, fn: Callable[..., Any], *args) -> Future:
+        """fn(document, *args)를 워커 스레드에서 실행하는 요청을 큐에 넣고 Future를 반환합니다."""
+        future: Future = Future()
+        if not self._thread.is_alive():
+            future.set_exception(RuntimeError("COM worker is not running"))
+            return future
+        self._requests.put((fn, args, future))
+        return future
+
+    def read_nodes(self, paths: Iterable[str], collections: Set[str] = frozenset()) -> Future:
+        """경로들을 한 번의 요청으로 읽습니다. 결과: {경로: NodeSnapshot}"""
+        return self.submit(lambda document, paths: read_nodes(document.Tree, paths, collections), list(paths))
+
+    def read_subtrees(self, roots: Iterable[Tuple[str, int]]) -> Future:
+        """(경로, 깊이) 목록의 하위 트리를 한 번의 요청으로 읽습니다. 결과: [(값, 순회한 노드 수), ...]"""
+        return self.submit(lambda document, roots: [read_subtree(document.Tree, path, depth) for path, depth in roots], list(roots))
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """남은 요청을 처리한 뒤 문서를 닫고 워커를 끝냅니다."""
+        if self._thread.is_alive():
+            self._requests.put(None)
+            self._thread.join(timeout)
+
+    def __enter__(self) -> "ComWorker":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+# =============================================================================
+# 메인 스레드용 문서 대용
+# =============================================================================
+
+class _RemoteNode:
+    """워커가 읽은 노드 스냅샷. Value/Elements가 아직 없으면 워커에 요청해 채웁니다."""
+    def __init__(self, tree: "WorkerTree", path: str, snapshot: Optional[NodeSnapshot] = None):
+        self._tree = tree
+        self._path = path
+        self._snapshot = snapshot
+        self.Name = path.rsplit('\\', 1)[-1]
+
+    @property
+    def Value(self) -> Any:
+        if self._snapshot is None:
+            self._snapshot = self._tree.read(self._path)
+        return self._snapshot.value
+
+    @property
+    def Elements(self) -> List["_RemoteNode"]:
+        if self._snapshot is None or self._snapshot.elements is None:
+            self._snapshot = self._tree.read(self._path, with_elements=True)
+        return [_RemoteNode(self._tree, f"{self._path}\\{name}") for name in self._snapshot.elements or ()]
+
+class WorkerTree:
+    """WorkerDocument.Tree. FindNode는 요청 후 결과를 기다리고, read_nodes/read_subtrees는 일괄 요청 한 번으로 처리합니다."""
+    def __init__(self, worker: ComWorker):
+        self._worker = worker
+
+    def read(self, path: str, with_elements: bool = False) -> NodeSnapshot:
+        return self._worker.submit(lambda document: read_node(document.Tree, path, with_elements)).result()
+
+    def FindNode(self, path: str) -> Optional[_RemoteNode]:
+        snapshot = self.read(path)
+        return _RemoteNode(self, path, snapshot) if snapshot.found else None
+
+    def read_nodes(self, paths: Iterable[str], collections: Set[str] = frozenset()) -> Dict[str, NodeSnapshot]:
+        return self._worker.read_nodes(paths, collections).result()
+
+    def read_subtrees(self, roots: Iterable[Tuple[str, int]]) -> List[Tuple[Dict[str, NodeSnapshot], int]]:
+        return self._worker.read_subtrees(roots).result()
+
+class WorkerDocument:
+    """
+    Application 대용. 추출 코드는 이 객체를 Application처럼 쓰고, 실제 COM 호출은 모두 워커 스레드에서 일어납니다.
+    워커에서 직접 실행할 작업은 worker.submit으로 제출합니다.
+    """
+    def __init__(self, worker: ComWorker):
+        self.worker = worker
+        self.Tree = WorkerTree(worker)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> "WorkerDocument":
+        """문서 열기가 끝날 때까지 기다립니다 (열기 실패 예외는 여기서 다시 발생)."""
+        self.worker.ready.result(timeout)
+        return self
+
+    def Close(self) -> None:
+        self.worker.close()
+
+def open_worker_document(open_document: Callable[[], Any]) -> WorkerDocument:
+    """워커 스레드에서 문서 열기를 시작하고 바로 WorkerDocument를 반환합니다 (열기는 백그라운드에서 진행)."""
+    return WorkerDocument(ComWorker(open_document))
+
+# =============================================================================
+# 가짜 COM 문서 (테스트용)
+# =============================================================================
+
+class WrongThreadError(RuntimeError):
+    """COM의 RPC_E_WRONG_THREAD에 해당: 문서를 만든 스레드가 아닌 곳에서 호출"""
+
+class _FakeComNode:
+    def __init__(self, node: bkp_tree.BkpNode, document: "FakeComDocument"):
+        self._node = node
+        self._document = document
+
+    @property
+    def Name(self) -> str:
+        return self._node.Name
+
+    @property
+    def Value(self) -> Any:
+        self._document._call()
+        return self._node.Value
+
+    @property
+    def UnitString(self) -> Optional[str]:
+        self._document._call()
+        return self._node.UnitString
+
+    @property
+    def Elements(self) -> List["_FakeComNode"]:
+        self._document._call()
+        return [_FakeComNode(child, self._document) for child in self._node.Elements]
+
+    def FindNode(self, path: str) -> Optional["_FakeComNode"]:
+        self._document._call()
+        node = self._node.FindNode(path)
+        return _FakeComNode(node, self._document) if node is not None else None
+
+class FakeComDocument:
+    """
+    순수 파이썬 Apwn.Document 대용. InitFromArchive2로 .bkp 오프라인 트리를 열고(또는 이미 만든 document를 받아),
+    모든 호출(FindNode/Value/Elements)에 latency(초)만큼 지연을 넣으며 만든 스레드 밖에서 호출하면 WrongThreadError를 냅니다.
+    """
+    def __init__(self, latency: float = 0.0, document: Optional[bkp_tree.BkpDocument] = None):
+        self._owner = threading.get_ident()
+        self.latency = latency
+        self.calls = 0
+        self._document: Optional[bkp_tree.BkpDocument] = document
+
+    def _call(self) -> None:
+        if threading.get_ident() != self._owner:
+            raise WrongThreadError("COM object called from a thread other than the one that created it")
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def InitFromArchive2(self, file_path: str) -> None:
+        self._call()
+        self._document = bkp_tree.open_document(file_path)
+
+    @property
+    def Tree(self) -> _FakeComNode:
+        self._call()
+        return _FakeComNode(self._document.Tree, self)
+
+    def Close(self) -> None:
+        self._call()
+        self._document = None
+
+def open_fake_document(file_path: str, latency: float = 0.0) -> FakeComDocument:
+    """가짜 COM 문서로 아카이브를 엽니다 (document_pool 등의 opener로 쓸 수 있는 최상위 함수)."""
+    document = FakeComDocument(latency)
+    document.InitFromArchive2(file_path)
+    return document
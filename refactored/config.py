@@ -12,6 +12,69 @@ DEFAULT_TARGET_YEAR = 2024
 ENABLE_DEBUG_OUTPUT = True
 DEFAULT_VERBOSITY = 1
 
+# Aspen 데이터 백엔드: "com" = Aspen Plus COM, "bkp" = .bkp 직접 파싱(오프라인, Aspen Plus 불필요),
+# "replay" = 기록해 둔 COM 트레이스 재생(RECORD_COM_TRACE 참고)
+ASPEN_BACKEND = "com"
+
+# 아카이브 메타데이터(블록 분류/단위 세트) 디스크 캐시: .bkp 내용 해시로 키잉, .bkp와 같은 폴더 하위에 저장
+ENABLE_ARCHIVE_CACHE = True
+ARCHIVE_CACHE_DIR = ".bkp_cache"
+# .bkp 폴더 스캔 시 캐시에 없는 파일이 이 개수 이상이면 프로세스 풀로 헤더를 병렬로 읽습니다.
+SCAN_PARALLEL_THRESHOLD = 32
+# 같은 .bkp의 이전 실행 스냅샷과 비교해 변경된 장치만 다시 추출/비용 계산합니다.
+# 이전 실행 결과를 재사용하므로 기본값은 끔입니다 (켠 경우의 흐름은 test_main.py에서 검증).
+ENABLE_INCREMENTAL_RUN = False
+# 스트림 결과(RES_TEMP/RES_PRES/RES_VOLFLOW)를 .bkp에서 한 번에 읽어 컬럼 테이블로 조회합니다.
+# (Aspen에서 다시 실행한 뒤 저장하지 않은 결과는 반영되지 않으므로, COM 값이 필요하면 끄세요.)
+# 기본값은 끔입니다 (단위 처리는 test_stream_table.py에서 검증).
+USE_STREAM_TABLE = False
+# 블록 Connections를 한 번씩 읽어 토폴로지 그래프(블록-스트림 이분 그래프)로 만들고, 연결 스트림/입출구 조회에 사용합니다.
+# 그래프를 미리 만드는 동안 모든 블록의 Connections를 읽으므로 기본값은 끔입니다 (끄면 장치마다 필요할 때 Connections를 읽음).
+USE_TOPOLOGY_GRAPH = False
+# 추출 대상 블록의 Output(필요하면 Input) 하위 트리를 Elements 순회 한 번으로 읽어 두고 개별 값 조회를 스냅샷에서 처리합니다.
+# 라이브 문서에서는 순회하는 하위 노드마다 .Name/.Value/.Elements가 각각 COM 호출이라, 장치가 읽지 않는 노드까지 읽어
+# 전체 COM 호출이 직접 읽기의 약 두 배가 됩니다 (benchmarks/bench_extraction_plan.py). 기본값은 끔입니다.
+PREFETCH_BLOCK_SUBTREES = False
+# 노드 캐시(data_manager의 모든 FindNode): 최대 항목 수(넘으면 LRU 제거)와 항목 유효 시간(초, None이면 만료 없음)
+# 실행 세대 안에서 같은 경로는 한 번만 읽으므로, 추출 전에 경로를 따로 모아 중복을 없애는 단계는 두지 않습니다.
+MAX_CACHE_SIZE = 1000
+NODE_CACHE_TTL = None
+# 노드 값 영구 저장소: (아카이브 내용 해시, 노드 경로) → 값을 아카이브 캐시 디렉토리의 SQLite 파일에 저장해 다음 세션에서 재사용
+# 이전 세션 값을 재사용하므로 기본값은 끔입니다 (켠 경우의 다시 추출/재사용 흐름은 test_main.py에서 검증).
+ENABLE_NODE_STORE = False
+NODE_STORE_FILE = "nodes.sqlite"
+# Aspen 문서를 전용 COM 워커 스레드(STA)가 열고 소유해 모든 COM 호출을 그 스레드에서 처리 (main.py)
+# 기본값은 끔입니다 (스레드 소유 검사와 프로파일 호출 함수는 test_com_worker.py에서 검증).
+USE_COM_WORKER = False
+# 문서 풀 병렬 추출: 블록 수가 PARALLEL_EXTRACTION_MIN_BLOCKS 이상이면 워커 프로세스 EXTRACTION_WORKERS개가 같은 아카이브를 각자 열어 나눠 추출 (1이면 끔)
+EXTRACTION_WORKERS = 1
+# 문서 풀 워커 수 상한 (워커마다 Aspen 인스턴스를 하나씩 열므로 코어 수와 관계없이 이 수까지만 엽니다)
+# 이 개발 환경은 1코어라 다중 코어 확장성은 측정하지 못했습니다 (benchmarks/bench_document_pool.py).
+MAX_EXTRACTION_WORKERS = 4
+PARALLEL_EXTRACTION_MIN_BLOCKS = 100
+# 지연 장치 추출: 장치 데이터를 프리뷰 표시/오버라이드/비용 계산에서 처음 접근할 때 추출 (목록 순회 시 LAZY_EXTRACTION_READAHEAD개씩 묶어 읽음)
+# 증분 실행 스냅샷은 모든 장치가 추출된 비용 계산 뒤에 저장합니다. COM 프로파일/트레이스 기록·재생 중에는 사용하지 않습니다.
+# 기본값은 끔입니다 (지연 목록의 deepcopy/오버라이드/pickle 동작은 test_lazy_devices.py에서 검증).
+LAZY_DEVICE_EXTRACTION = False
+LAZY_EXTRACTION_READAHEAD = 32
+# COM 읽기 재시도: 호출당 최대 시도 횟수, 첫 재시도 전 대기(초, 재시도마다 두 배),
+# 오류율이 높을 때 호출 사이에 두는 최대 간격(초, 오류가 없으면 간격 없음)
+MAX_RETRY_ATTEMPTS = 3
+COM_RETRY_BACKOFF = 0.05
+COM_CALL_INTERVAL = 0.1
+# COM 세션 기록: 켜면 트리 접근(FindNode/Value/Elements)을 기록해 아카이브 옆 트레이스 파일로 저장합니다 (main.py --record-trace).
+# 저장된 트레이스는 ASPEN_BACKEND = "replay" (main.py --replay-trace)로 Aspen 없이 재생할 수 있습니다.
+RECORD_COM_TRACE = False
+COM_TRACE_SUFFIX = ".trace.json.gz"
+# 배치 실행(batch_runner.py): 워커 프로세스 수(None이면 CPU 코어 수), 데이터 백엔드, 기본 결과 파일
+BATCH_MAX_WORKERS = None
+BATCH_BACKEND = "bkp"
+BATCH_RESULTS_FILE = "batch_results.json"
+# 실행 후 .bkp 옆에 요약 사이드카(<파일명>.summary.json)를 써서, 다음에 같은 .bkp를 열면 Aspen 연결 없이 프리뷰를 보여줍니다.
+# 저장된 결과를 Aspen 연결 없이 보여주므로 기본값은 끔입니다 (사이드카 프리뷰/다시 추출 흐름은 test_main.py에서 검증).
+ENABLE_SUMMARY_SIDECAR = False
+SUMMARY_SIDECAR_SUFFIX = ".summary.json"
+
 
 # =============================================================================
 # CEPCI 인덱스 데이터
@@ -0,0 +1,23 @@
+"""테스트 공용 도우미"""
+
+from collections import Counter
+
+
+class CountingDocument:
+    """
+    오프라인 문서의 FindNode 호출 수를 세는 래퍼 (Aspen 접근 여부/읽기 수 확인용)
+    calls: 전체 호출 수, paths: 경로별 호출 수, opened: 만들어진 래퍼 목록 (클래스 속성)
+    """
+    opened = []
+
+    def __init__(self, document):
+        self._tree = document.Tree
+        self.Tree = self
+        self.calls = 0
+        self.paths = Counter()
+        CountingDocument.opened.append(self)
+
+    def FindNode(self, path):
+        self.calls += 1
+        self.paths[path] += 1
+        return self._tree.FindNode(path)
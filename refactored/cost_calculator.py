@@ -982,6 +982,24 @@ def calculate_all_costs_with_data(all_device_data: List[Dict], cepci: CEPCIOptio
 
     return {"results": results, "total_bare_module_cost": total_bare_module_cost}
 
+def calculate_costs_incremental(all_device_data: List[Dict], cepci: CEPCIOptions, previous_devices: List[Dict], previous_results: List[Dict], Application=None) -> Dict[str, Any]:
+    """
+    이전 실행과 입력 딕셔너리가 완전히 같은 장치는 이전 비용 결과를 재사용하고, 나머지 장치만 다시 계산합니다.
+    (비용은 장치 딕셔너리와 CEPCI 옵션만으로 결정되므로, 호출자는 CEPCI가 같을 때만 이전 결과를 넘겨야 합니다.)
+    반환값은 calculate_all_costs_with_data와 같고, 'recalculated'에 다시 계산한 장치 이름 목록이 추가됩니다.
+    """
+    previous_by_name = {device.get("name"): device for device in previous_devices}
+    results_by_name = {result.get("name"): result for result in previous_results}
+    to_calculate = [device for device in all_device_data
+                    if previous_by_name.get(device.get("name")) != device or device.get("name") not in results_by_name]
+    fresh = calculate_all_costs_with_data(to_calculate, cepci, Application)["results"]
+    results_by_name.update({result.get("name"): result for result in fresh})
+
+    results = [results_by_name[device.get("name")] for device in all_device_data]
+    total_bare_module_cost = sum(result.get("bare_module_cost", 0.0) for result in results)
+    return {"results": results, "total_bare_module_cost": total_bare_module_cost,
+            "recalculated": [device.get("name") for device in to_calculate]}
+
 def get_equipment_cost_details(equipment_type: str, subtype: str) -> dict:
     return config.get_equipment_setting(equipment_type, subtype)
 
@@ -5,48 +5,137 @@ Aspen Plus 데이터 추출 및 분류 모듈
 장치를 카테고리별로 분류하는 기능을 제공합니다.
 """
 
-from typing import Optional, Dict, Any, List, Union
-import win32com.client as win32
+from typing import Optional, Dict, Any, List, Union, Mapping, Set
+try:
+    import win32com.client as win32
+except ImportError:  # Windows/Aspen Plus가 없는 환경: .bkp 오프라인 백엔드만 사용
+    win32 = None
 import os
 import sys
 import math
+import time
+from collections import OrderedDict
+from types import MappingProxyType
 
 import unit_converter
 import logger
 import config
+import bkp_reader
+import bkp_tree
+import archive_cache
+import archive_scanner
+import bkp_diff
+import stream_table
+import archive_summary
+import extraction_plan
+import node_store
+import com_retry
+import topology
+import com_trace
+import lazy_devices
 
 # =============================================================================
 # Aspen COM 통신 및 파일 관리
 # =============================================================================
 
 def find_aspen_file(current_dir: str) -> Optional[str]:
-    """현재 디렉토리에서 가장 최근에 수정된 .bkp 파일을 찾고 사용자에게 선택을 받습니다."""
-    all_bkps = [f for f in os.listdir(current_dir) if f.lower().endswith('.bkp')]
-    bkp_files = sorted(all_bkps, key=lambda f: os.path.getmtime(os.path.join(current_dir, f)), reverse=True)
+    """
+    현재 디렉토리의 .bkp 파일들을 헤더 요약(버전, 저장 시각, 블록 수, 블록 타입 분포)과
+    요약 사이드카의 마지막 총 비용과 함께 보여주고 사용자에게 선택을 받습니다.
+    기본 정렬은 수정 시각 내림차순이며, 정렬 키 문자(m/d/n/b/s)를 입력하면 표를 다시 정렬합니다.
+    """
+    cache_dir = os.path.join(current_dir, config.ARCHIVE_CACHE_DIR) if getattr(config, 'ENABLE_ARCHIVE_CACHE', False) else None
+    start = time.perf_counter()
+    archives = archive_scanner.scan_directory(current_dir, cache_dir)
+    # 요약 사이드카가 있는 파일은 마지막 총 비용을 함께 표시합니다 (크기/mtime만 확인, 해시 계산 없음).
+    last_costs = None
+    if getattr(config, 'ENABLE_SUMMARY_SIDECAR', False):
+        last_costs = {}
+        for info in archives:
+            summary = archive_summary.peek_summary(info.path)
+            last_costs[info.path] = summary.total_bare_module_cost if summary else None
+    logger.debug(f"Scanned {len(archives)} archive headers in {(time.perf_counter() - start) * 1000:.1f} ms")
 
-    if not bkp_files:
+    if not archives:
         print("경고: 현재 폴더에서 .bkp 파일을 찾지 못했습니다.")
         return None
 
-    print("\n감지된 .bkp 파일 목록:")
-    for i, fname in enumerate(bkp_files, 1):
-        print(f"  {i}. {fname}")
-
+    sort_key = 'm'
+    sort_help = ", ".join(f"{key}={label}" for key, (label, _, _) in archive_scanner.SORT_KEYS.items())
     while True:
-        try:
-            choice = input("사용할 .bkp 파일 번호를 선택하세요 (숫자): ").strip()
+        archives = archive_scanner.sort_archives(archives, sort_key)
+        print(f"\n감지된 .bkp 파일 목록 (정렬: {archive_scanner.SORT_KEYS[sort_key][0]}):")
+        print(archive_scanner.format_table(archives, last_costs))
+
+        while True:
+            choice = input(f"사용할 .bkp 파일 번호를 선택하세요 (숫자, 정렬 변경: {sort_help}): ").strip()
             if not choice:
                 return None
-            idx = int(choice)
-            if 1 <= idx <= len(bkp_files):
-                return os.path.join(current_dir, bkp_files[idx - 1])
-            else:
-                print("잘못된 번호입니다. 다시 입력해주세요.")
-        except ValueError:
-            print("숫자를 입력해주세요.")
+            if choice.lower() in archive_scanner.SORT_KEYS:
+                sort_key = choice.lower()
+                break
+            try:
+                idx = int(choice)
+            except ValueError:
+                print("숫자를 입력해주세요.")
+                continue
+            if 1 <= idx <= len(archives):
+                return archives[idx - 1].path
+            print("잘못된 번호입니다. 다시 입력해주세요.")
+
+def get_com_trace_path(file_path: str) -> str:
+    """아카이브 옆 COM 트레이스 경로 (예: case.bkp → case.trace.json.gz)"""
+    return os.path.splitext(file_path)[0] + getattr(config, 'COM_TRACE_SUFFIX', '.trace.json.gz')
+
+# 기록/재생 중인 COM 트레이스 문서 (connect_to_aspen이 설정, finish_com_trace가 마무리)
+_com_trace_document: Union[com_trace.RecordingDocument, com_trace.ReplayDocument, None] = None
 
-def connect_to_aspen(file_path: str):
-    """COM 객체를 통해 Aspen Plus 파일에 연결합니다."""
+def connect_to_aspen(file_path: str, backend: Optional[str] = None, record: Optional[bool] = None):
+    """
+    Aspen Plus 파일에 연결합니다.
+    backend(기본값 config.ASPEN_BACKEND)가 'bkp'이거나 pywin32가 없으면 COM 대신
+    .bkp를 직접 파싱한 오프라인 트리(bkp_tree)를 반환합니다. 추출 함수들은 두 경우 모두 같은 인터페이스로 동작합니다.
+    backend가 'replay'면 아카이브 옆 COM 트레이스(get_com_trace_path)로 이전 세션의 트리 접근을 재생합니다.
+    record(기본값 config.RECORD_COM_TRACE)가 켜져 있으면 문서의 트리 접근을 기록하고 finish_com_trace에서 트레이스로 저장합니다.
+    """
+    backend = backend or getattr(config, 'ASPEN_BACKEND', 'com')
+    record = getattr(config, 'RECORD_COM_TRACE', False) if record is None else record
+    # 노드 캐시/저장소 키는 문서 id이므로 새 문서를 열기 전에 이전 문서의 항목을 비웁니다.
+    global _node_store, _com_policy, _com_trace_document
+    clear_aspen_cache()
+    _node_store = None
+    _com_policy = _new_retry_policy()
+    _com_trace_document = None
+    if backend == 'replay':
+        trace_path = get_com_trace_path(file_path)
+        try:
+            _com_trace_document = com_trace.open_replay(trace_path)
+        except (OSError, ValueError) as e:
+            print(f"ERROR opening COM trace {trace_path}: {e}")
+            print("Record one first with --record-trace (or config.RECORD_COM_TRACE = True) on a machine with Aspen Plus.")
+            sys.exit(1)
+        print(f'\nReplaying COM trace {os.path.basename(trace_path)} ({len(_com_trace_document.trace.nodes)} nodes, Aspen Plus not used)')
+        return _com_trace_document
+    Application = _open_document(file_path, backend)
+    if record:
+        _com_trace_document = com_trace.RecordingDocument(Application, get_com_trace_path(file_path), os.path.basename(file_path))
+        return _com_trace_document
+    return Application
+
+def finish_com_trace() -> None:
+    """기록 중이면 트레이스를 저장하고, 재생 중이면 트레이스에 없던 접근을 보고합니다."""
+    if isinstance(_com_trace_document, com_trace.RecordingDocument):
+        size = _com_trace_document.save()
+        print(f"COM trace saved: {_com_trace_document.trace_path} ({_com_trace_document.trace.accesses} accesses, {size / 1e3:.0f} kB)")
+    elif isinstance(_com_trace_document, com_trace.ReplayDocument) and _com_trace_document.missing:
+        print(f"Warning: {_com_trace_document.format_missing()}")
+
+def _open_document(file_path: str, backend: str):
+    if backend == 'bkp' or win32 is None:
+        print('\nOpening .bkp archive offline (Aspen Plus COM not used)...')
+        Application = bkp_tree.open_document(file_path)
+        print('Offline Aspen tree built from the .bkp archive.')
+        return Application
     try:
         print('\nConnecting to Aspen Plus... Please wait...')
         Application = win32.Dispatch('Apwn.Document')
@@ -71,7 +160,7 @@ def get_block_names(Application) -> List[str]:
     """Blocks 하위의 가장 상위 노드(블록 이름)들을 수집하는 함수"""
     block_names = []
     try:
-        blocks_node = Application.Tree.FindNode("\\Data\\Blocks")
+        blocks_node = _find_node(Application, "\\Data\\Blocks")
         if blocks_node is None:
             print("Warning: Blocks node not found")
             return block_names
@@ -82,51 +171,36 @@ def get_block_names(Application) -> List[str]:
                 except:
                     pass
         return block_names
+    except com_retry.ComReadError:
+        raise
     except Exception as e:
         print(f"Error collecting block names: {str(e)}")
         return []
 
+BKP_BLOCK_CATEGORIES = bkp_reader.BKP_BLOCK_CATEGORIES
+
 def parse_bkp_file_for_blocks(file_path: str, block_names: List[str]) -> Dict[str, str]:
     """
-    .bkp 파일을 텍스트로 읽어서 주어진 블록 이름들의 카테고리를 파싱하는 함수
+    .bkp 파일의 블록 레코드를 한 번만 읽어 만든 인덱스로 주어진 블록 이름들의 카테고리를 조회하는 함수
+    (mmap으로 열어 헤더의 블록 레코드 구간만 디코딩하므로 파일 전체를 메모리에 올리지 않습니다)
     """
-    block_info = {}
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        lines = content.split('\n')
-        for block_name in block_names:
-            category = "Unknown"
-            for i, line in enumerate(lines):
-                if line.strip() == block_name:
-                    for j in range(i + 1, min(i + 5, len(lines))):
-                        next_line = lines[j].strip()
-                        if next_line in ['Heater', 'HeatX']:
-                            category = next_line
-                            break
-                        elif next_line in ['RadFrac', 'Distl', 'DWSTU']:
-                            category = next_line
-                            break
-                        elif next_line in ['RStoic', 'RCSTR', 'RPlug', 'RBatch', 'REquil', 'RYield']:
-                            category = next_line
-                            break
-                        elif next_line in ['Pump', 'Compr', 'MCompr', 'Vacuum', 'Flash', 'Sep', 'Mixer', 'FSplit', 'Valve']:
-                            category = next_line
-                            break
-                    break
-            block_info[block_name] = category
-        return block_info
+        with bkp_reader.BkpArchive(file_path) as archive:
+            block_categories = archive.block_categories(BKP_BLOCK_CATEGORIES)
     except Exception as e:
         print(f"Error parsing BKP file: {str(e)}")
         return {}
+    return {block_name: block_categories.get(block_name, "Unknown") for block_name in block_names}
 
 def get_current_unit_set(Application) -> Optional[str]:
     """현재 사용 중인 Unit Set을 가져오는 함수"""
     try:
-        outset_node = Application.Tree.FindNode("\\Data\\Setup\\Global\\Input\\OUTSET")
+        outset_node = _find_node(Application, "\\Data\\Setup\\Global\\Input\\OUTSET")
         if outset_node is None or outset_node.Value is None:
             return None
         return str(outset_node.Value)
+    except com_retry.ComReadError:
+        raise
     except Exception:
         return None
 
@@ -134,18 +208,180 @@ def get_unit_type_value(Application, unit_set_name: str, unit_type: str) -> Opti
     """특정 단위 타입의 값을 반환"""
     try:
         node_path = f"\\Data\\Setup\\Units-Sets\\{unit_set_name}\\Unit-Types\\{unit_type}"
-        node = Application.Tree.FindNode(node_path)
+        node = _find_node(Application, node_path)
         if node is not None and node.Value is not None:
             return str(node.Value)
+    except com_retry.ComReadError:
+        raise
     except:
         pass
     return None
 
+# 장치 데이터 추출에 쓰는 단위 타입
+DEVICE_UNIT_TYPES = ('POWER', 'PRESSURE', 'VOLUME', 'VOLUME-FLOW', 'ENTHALPY-FLO', 'HEAT-TRANS-C', 'TEMPERATURE')
+
+def resolve_unit_set(Application, unit_set_name: Optional[str]) -> Mapping[str, Optional[str]]:
+    """
+    단위 세트에서 DEVICE_UNIT_TYPES 타입만 경로로 읽어 {단위 타입: 단위 문자열} 읽기 전용 매핑으로 반환합니다.
+    세트에 없거나 재시도 후에도 읽지 못한(ComReadError) 타입은 None이며, 나머지 타입과 추출은 그대로 진행합니다.
+    추출 함수들은 이 매핑만 받아 쓰고 단위 노드를 다시 읽지 않습니다.
+    """
+    unit_types: Dict[str, Optional[str]] = dict.fromkeys(DEVICE_UNIT_TYPES)
+    if not unit_set_name:
+        return MappingProxyType(unit_types)
+    failed = []
+    for unit_type in DEVICE_UNIT_TYPES:
+        try:
+            unit_types[unit_type] = get_unit_type_value(Application, unit_set_name, unit_type)
+        except com_retry.ComReadError:
+            failed.append(unit_type)
+    if failed:
+        print(f"Warning: could not read unit types {', '.join(failed)} of unit set {unit_set_name}; their units are treated as unknown")
+    return MappingProxyType(unit_types)
+
+def _frozen_unit_types(unit_types: Mapping[str, Optional[str]]) -> Mapping[str, Optional[str]]:
+    """캐시/사이드카에서 읽은 dict 등을 읽기 전용 매핑으로 바꿉니다."""
+    return unit_types if isinstance(unit_types, MappingProxyType) else MappingProxyType(dict(unit_types))
+
+def get_unit_types(Application, unit_set_name: str) -> Dict[str, Optional[str]]:
+    """resolve_unit_set 결과를 dict로 반환 (아카이브 캐시/요약 파일에 저장할 수 있는 형태)"""
+    return dict(resolve_unit_set(Application, unit_set_name))
+
+def get_archive_cache_dir(file_path: str) -> str:
+    """아카이브 캐시 디렉토리 (.bkp와 같은 폴더의 config.ARCHIVE_CACHE_DIR)"""
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), config.ARCHIVE_CACHE_DIR)
+
+def load_archive_metadata(Application, file_path: str) -> Dict[str, Any]:
+    """
+    블록 분류, 현재 단위 세트, 단위 타입 값을 반환합니다.
+    config.ENABLE_ARCHIVE_CACHE가 켜져 있으면 아카이브 내용 해시로 디스크 캐시를 조회해,
+    .bkp가 이전 실행과 같으면 블록 파싱과 단위 노드 조회를 건너뜁니다.
+    반환값: {'block_info': {...}, 'unit_set': str, 'unit_types': {...}}
+    """
+    start = time.perf_counter()
+    cache = None
+    digest = None
+    if getattr(config, 'ENABLE_ARCHIVE_CACHE', False):
+        cache = archive_cache.ArchiveCache(get_archive_cache_dir(file_path))
+        digest = _node_store.digest if _attached_node_store(Application) else archive_cache.file_digest(file_path)
+        metadata = cache.load(file_path, digest)
+        if metadata is not None:
+            logger.info(f"Archive metadata cache hit (warm): {(time.perf_counter() - start) * 1000:.1f} ms")
+            return metadata
+
+    block_names = get_block_names(Application)
+    unit_set = get_current_unit_set(Application)
+    metadata = {
+        'block_info': parse_bkp_file_for_blocks(file_path, block_names),
+        'unit_set': unit_set,
+        'unit_types': get_unit_types(Application, unit_set) if unit_set else {},
+    }
+    if cache is not None:
+        cache.store(file_path, metadata, digest)
+    logger.info(f"Archive metadata {'cache miss (cold)' if cache else 'read'}: {(time.perf_counter() - start) * 1000:.1f} ms")
+    return metadata
+
+# 오프라인 스트림 결과 테이블 (설정되면 스트림 RES_TEMP/RES_PRES/RES_VOLFLOW를 COM 대신 여기서 조회)
+_stream_table: Optional[stream_table.StreamTable] = None
+
+def load_stream_table(file_path: str) -> Optional[stream_table.StreamTable]:
+    """.bkp 결과 섹션에서 스트림 결과 테이블을 한 번에 읽어 이후 스트림 값 조회에 사용합니다."""
+    global _stream_table
+    start = time.perf_counter()
+    try:
+        _stream_table = stream_table.load_stream_table(file_path)
+    except (OSError, ValueError) as e:
+        print(f"Warning: stream table not available, falling back to tree lookups: {e}")
+        _stream_table = None
+        return None
+    logger.info(f"Stream table: {len(_stream_table)} streams in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return _stream_table
+
+def build_stream_table(Application, unit_types: Mapping[str, Optional[str]],
+                       stream_columns: Optional[Dict[str, Set[str]]] = None) -> Optional[stream_table.StreamTable]:
+    """
+    {스트림: 컬럼들}의 각 결과 값을 한 번씩 읽어 스트림 결과 테이블로 씁니다 (stream_columns가 없으면 \\Data\\Streams 전체의 모든 컬럼).
+    값은 현재 단위 세트(unit_types) 단위로 저장합니다. .bkp 결과 섹션을 읽지 못했거나
+    시뮬레이션 재실행(advance_run_generation)으로 테이블이 무효화된 경우 extract_all_device_data가 호출합니다.
+    """
+    global _stream_table
+    start = time.perf_counter()
+    if stream_columns is None:
+        streams_node = _find_node(Application, "\\Data\\Streams")
+        if streams_node is None:
+            return None
+        stream_columns = {str(element.Name): set(stream_table.STREAM_COLUMNS) for element in streams_node.Elements}
+    units = {column: unit_types.get(unit_type) for column, unit_type in stream_table.STREAM_COLUMNS.items()}
+    _stream_table = stream_table.build_stream_table(
+        stream_columns, lambda stream, column: _read_raw_value(Application, f"\\Data\\Streams\\{stream}\\Output\\{column}"), units)
+    logger.info(f"Stream table (tree): {len(_stream_table)} streams, {sum(map(len, stream_columns.values()))} values "
+                f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return _stream_table
+
+def clear_stream_table():
+    global _stream_table
+    _stream_table = None
+
+def _read_stream_value(Application, stream_name: str, column: str, unit: Optional[str] = None) -> Optional[float]:
+    """스트림 결과 값 하나 (테이블에 있으면 unit으로 변환해 반환, 없으면 노드에서 원시값 읽기)"""
+    if _stream_table is not None and _stream_table.has(stream_name, column):
+        return _stream_table.value(stream_name, column, unit)
+    return _read_raw_value(Application, f"\\Data\\Streams\\{stream_name}\\Output\\{column}")
+
+def _max_stream_value(Application, stream_names: List[str], column: str, unit: Optional[str] = None) -> Optional[float]:
+    """여러 스트림 결과 값 중 0 이상인 최댓값 (모든 스트림이 테이블에 있으면 벡터 연산으로 계산)"""
+    if _stream_table is not None and stream_names and all(_stream_table.has(name, column) for name in stream_names):
+        value = _stream_table.max_value(stream_names, column, unit)
+    else:
+        values = [_read_stream_value(Application, name, column, unit) for name in stream_names]
+        value = max((v for v in values if v is not None), default=None)
+    return value if value is not None and value >= 0 else None
+
+# 플로우시트 토폴로지 그래프 (설정되면 블록 연결 스트림/입출구를 Connections 대신 여기서 조회)
+_topology: Optional[topology.FlowsheetGraph] = None
+
+def _read_block_ports(Application, block_name: str) -> List[tuple]:
+    """블록 Connections의 (스트림, 라벨) 목록. 라벨을 읽지 못한 포트는 빈 라벨입니다."""
+    ports = []
+    try:
+        connections_node = _find_node(Application, f"\\Data\\Blocks\\{block_name}\\Connections")
+        if not connections_node or not hasattr(connections_node, 'Elements'):
+            return ports
+        for stream_name in [element.Name for element in connections_node.Elements]:
+            try:
+                role_node = _find_node(Application, f"\\Data\\Blocks\\{block_name}\\Connections\\{stream_name}")
+                ports.append((stream_name, str(role_node.Value) if role_node and role_node.Value is not None else ''))
+            except com_retry.ComReadError:
+                raise
+            except Exception:
+                ports.append((stream_name, ''))
+    except com_retry.ComReadError:
+        raise
+    except Exception:
+        pass
+    return ports
+
+def load_topology(Application, block_names: List[str]) -> topology.FlowsheetGraph:
+    """블록마다 Connections를 한 번씩 읽어 토폴로지 그래프를 만들고, 이후 연결 스트림/입출구 조회에 사용합니다."""
+    global _topology
+    start = time.perf_counter()
+    _topology = topology.build_graph(block_names, lambda block_name: _read_block_ports(Application, block_name))
+    logger.info(f"Topology: {len(_topology.blocks)} blocks, {len(_topology.streams)} streams, "
+                f"{len(_topology.port_labels)} ports in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return _topology
+
+def get_topology() -> Optional[topology.FlowsheetGraph]:
+    return _topology
+
+def clear_topology():
+    global _topology
+    _topology = None
+
 def get_utility_names(Application) -> List[str]:
     """Utilities 하위의 유틸리티 이름들을 수집하는 함수"""
     utility_names = []
     try:
-        utilities_node = Application.Tree.FindNode("\\Data\\Utilities")
+        utilities_node = _find_node(Application, "\\Data\\Utilities")
         if utilities_node is None:
             print("Warning: Utilities node not found")
             return utility_names
@@ -156,16 +392,21 @@ def get_utility_names(Application) -> List[str]:
                 except:
                     pass
         return utility_names
+    except com_retry.ComReadError:
+        raise
     except Exception as e:
         print(f"Error collecting utility names: {str(e)}")
         return []
 
-def get_utility_data(Application, utility_name: str) -> Dict[str, Any]:
-    """특정 유틸리티의 데이터를 추출하는 함수"""
-    utility_data = {"name": utility_name, "error": None}
+def get_utility_data(Application, utility_name: str, temperature_unit: Optional[str]) -> Dict[str, Any]:
+    """
+    특정 유틸리티의 데이터를 추출하는 함수 (temperature_unit: 현재 단위 세트의 TEMPERATURE 단위)
+    재시도 후에도 COM 읽기가 실패하면(ComReadError) 값이 없는 유틸리티와 구분되도록 "com_read_failed": True로 기록합니다.
+    """
+    utility_data = {"name": utility_name, "error": None, "com_read_failed": False}
     try:
         # 유틸리티 기본 정보 추출
-        utility_node = Application.Tree.FindNode(f"\\Data\\Utilities\\{utility_name}")
+        utility_node = _find_node(Application, f"\\Data\\Utilities\\{utility_name}")
         if utility_node is None:
             utility_data["error"] = f"Utility node not found: {utility_name}"
             return utility_data
@@ -173,30 +414,36 @@ def get_utility_data(Application, utility_name: str) -> Dict[str, Any]:
         # Temperature 추출 - 입구온도와 출구온도
         inlet_temp_raw = _read_raw_value(Application, f"\\Data\\Utilities\\{utility_name}\\Output\\UTL_IN_TEMP")
         outlet_temp_raw = _read_raw_value(Application, f"\\Data\\Utilities\\{utility_name}\\Output\\UTL_OUT_TEMP")
-        temp_unit = get_unit_type_value(Application, get_current_unit_set(Application), 'TEMPERATURE')
         
         # 지정된 항목(입/출구 온도)만 반환
         utility_data.update({
             "inlet_temperature_value": inlet_temp_raw,
             "outlet_temperature_value": outlet_temp_raw,
-            "temperature_unit": temp_unit
+            "temperature_unit": temperature_unit
         })
         
+    except com_retry.ComReadError as e:
+        utility_data["error"] = f"COM read failed: {e}"
+        utility_data["com_read_failed"] = True
     except Exception as e:
         utility_data["error"] = str(e)
     return utility_data
 
 def _get_stream_names(Application, block_name: str) -> List[str]:
-    """블록에 연결된 모든 스트림 이름을 가져옵니다."""
+    """블록에 연결된 모든 스트림 이름을 가져옵니다 (토폴로지 그래프가 있으면 그래프에서 조회)."""
+    if _topology is not None and block_name in _topology:
+        return _topology.stream_names(block_name)
     stream_names = []
     try:
-        connections_node = Application.Tree.FindNode(f"\\Data\\Blocks\\{block_name}\\Connections")
+        connections_node = _find_node(Application, f"\\Data\\Blocks\\{block_name}\\Connections")
         if connections_node and hasattr(connections_node, 'Elements'):
             for element in connections_node.Elements:
                 try:
                     stream_names.append(element.Name)
                 except:
                     pass
+    except com_retry.ComReadError:
+        raise
     except Exception:
         pass
     return stream_names
@@ -207,33 +454,39 @@ def _get_stream_temperatures(Application, block_name: str, temperature_unit: str
     stream_names = _get_stream_names(Application, block_name)
     
     for stream_name in stream_names:
-        # 스트림 온도 추출 (RES_TEMP 노드 사용)
-        temp_raw = _read_raw_value(Application, f"\\Data\\Streams\\{stream_name}\\Output\\RES_TEMP")
+        # 스트림 온도 추출 (RES_TEMP: 스트림 테이블 또는 노드)
+        temp_raw = _read_stream_value(Application, stream_name, 'RES_TEMP', temperature_unit)
         if temp_raw is not None:
             stream_data[stream_name] = temp_raw
     
     return stream_data
 
 def _get_inlet_outlet_streams(Application, block_name: str) -> (Optional[str], Optional[str]):
-    """Connections 하위에서 각 스트림의 IN/OUT 라벨을 읽어 입구/출구 스트림명을 반환합니다."""
+    """Connections 하위에서 각 스트림의 IN/OUT 라벨을 읽어 입구/출구 스트림명을 반환합니다 (토폴로지 그래프가 있으면 그래프에서 조회)."""
+    if _topology is not None and block_name in _topology:
+        return _topology.inlet_outlet(block_name)
     inlet_name = None
     outlet_name = None
     try:
-        connections_node = Application.Tree.FindNode(f"\\Data\\Blocks\\{block_name}\\Connections")
+        connections_node = _find_node(Application, f"\\Data\\Blocks\\{block_name}\\Connections")
         if not connections_node or not hasattr(connections_node, 'Elements'):
             return None, None
         for element in connections_node.Elements:
             try:
                 stream_name = element.Name
-                role_node = Application.Tree.FindNode(f"\\Data\\Blocks\\{block_name}\\Connections\\{stream_name}")
+                role_node = _find_node(Application, f"\\Data\\Blocks\\{block_name}\\Connections\\{stream_name}")
                 role_val = str(role_node.Value).upper() if role_node and role_node.Value is not None else ''
                 # 예: "F(IN)", "P(OUT)" 등 → IN/OUT 판단
                 if 'IN' in role_val and inlet_name is None:
                     inlet_name = stream_name
                 elif 'OUT' in role_val and outlet_name is None:
                     outlet_name = stream_name
+            except com_retry.ComReadError:
+                raise
             except:
                 continue
+    except com_retry.ComReadError:
+        raise
     except Exception:
         return None, None
     return inlet_name, outlet_name
@@ -242,11 +495,13 @@ def _find_heater_utility(Application, block_name: str) -> Optional[str]:
     """Heater 블록에서 사용 중인 유틸리티 이름을 UTL_ID 노드에서 읽어옵니다."""
     try:
         utl_id_path = f"\\Data\\Blocks\\{block_name}\\Output\\UTL_ID"
-        node = Application.Tree.FindNode(utl_id_path)
+        node = _find_node(Application, utl_id_path)
         if node is None or node.Value is None:
             return None
         value = str(node.Value).strip()
         return value if value != '' else None
+    except com_retry.ComReadError:
+        raise
     except Exception:
         return None
 
@@ -261,8 +516,7 @@ def _get_heater_pressures(Application, block_name: str, pressure_unit: str) -> D
     # 셸 측: Heater 블록의 입구 스트림을 찾아 스트림 압력 사용
     inlet_name, _ = _get_inlet_outlet_streams(Application, block_name)
     if inlet_name:
-        shell_path = f"\\Data\\Streams\\{inlet_name}\\Output\\RES_PRES"
-        shell_pressure = _read_raw_value(Application, shell_path)
+        shell_pressure = _read_stream_value(Application, inlet_name, 'RES_PRES', pressure_unit)
 
     # 튜브 측: Heater에서 사용 중인 유틸리티의 입구 압력 사용
     utility_name = _find_heater_utility(Application, block_name)
@@ -295,11 +549,13 @@ def _find_intercooler_utility(Application, block_name: str, stage_num: int) -> O
     """다단 압축기 블록의 특정 스테이지에서 사용하는 인터쿨러 유틸리티 이름을 찾습니다."""
     try:
         cooler_utl_path = f"\\Data\\Blocks\\{block_name}\\Input\\COOLER_UTL\\{stage_num}"
-        node = Application.Tree.FindNode(cooler_utl_path)
+        node = _find_node(Application, cooler_utl_path)
         if node is None or node.Value is None:
             return None
         value = str(node.Value).strip()
         return value if value != '' else None
+    except com_retry.ComReadError:
+        raise
     except Exception:
         return None
 
@@ -339,7 +595,7 @@ def _calculate_lmtd_for_heater(Application, block_name: str, temperature_unit: s
         if not heater_utility:
             return None
 
-        utility_data = get_utility_data(Application, heater_utility)
+        utility_data = get_utility_data(Application, heater_utility, temperature_unit)
         utility_inlet_temp = utility_data.get("inlet_temperature_value")
         utility_outlet_temp = utility_data.get("outlet_temperature_value")
         utility_temp_unit = utility_data.get("temperature_unit")
@@ -391,6 +647,8 @@ def _calculate_lmtd_for_heater(Application, block_name: str, temperature_unit: s
         # LMTD는 온도차이이므로 K 단위로 반환 (절대온도 변환 금지)
         return lmtd_k
         
+    except com_retry.ComReadError:
+        raise
     except Exception as e:
         print(f"Error calculating LMTD for {block_name}: {e}", file=sys.stderr)
         return None
@@ -400,32 +658,263 @@ def _calculate_lmtd_for_heater(Application, block_name: str, temperature_unit: s
 # =============================================================================
 
 class AspenDataCache:
-    """Aspen Plus 데이터 캐싱 클래스"""
-    def __init__(self):
-        self._cache = {}
+    """
+    Aspen 노드 캐시 (LRU). 항목은 (문서 id, 노드 경로) → 노드 값 스냅샷(_CachedNode)입니다.
+    - max_size: 최대 항목 수. 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다 (None이면 무제한)
+    - ttl: 항목 유효 시간(초). 지난 항목은 다시 읽습니다 (None이면 만료 없음)
+    - generation: 시뮬레이션 실행 세대. 항목마다 저장 당시 세대를 기록하고, 세대가 바뀌면
+      결과(Output) 경로 항목만 무효로 봅니다. Input/Connections/Setup 등 입력·토폴로지 항목은 그대로 유효합니다.
+    키가 (문서 id, 노드 경로)이면 경로 접두사(예: \\Data\\Blocks\\*\\Output)별로 적중/실패/제거/무효화 횟수를 집계합니다.
+    """
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation = 0
+        self._cache: "OrderedDict[Any, tuple]" = OrderedDict()   # 키 → (저장 시각, 실행 세대, 값)
+        self._stats: Dict[str, Dict[str, int]] = {}
 
-    def get_data(self, key: str, extract_func, *args, **kwargs) -> Any:
-        """캐시에서 데이터를 가져오거나, 없으면 추출 후 저장합니다."""
-        if key not in self._cache:
-            self._cache[key] = extract_func(*args, **kwargs)
-        return self._cache[key]
+    def _count(self, key, event: str) -> None:
+        prefix = _path_prefix(key[-1] if isinstance(key, tuple) else str(key))
+        counters = self._stats.setdefault(prefix, {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0})
+        counters[event] += 1
+
+    def _is_valid(self, key, entry: tuple) -> bool:
+        saved_at, generation, _ = entry
+        if self.ttl is not None and time.monotonic() - saved_at > self.ttl:
+            return False
+        if generation != self.generation and isinstance(key, tuple) and _is_result_path(key[-1]):
+            self._count(key, "invalidations")
+            return False
+        return True
+
+    def get_data(self, key, extract_func, *args, **kwargs) -> Any:
+        """캐시에서 데이터를 가져오거나, 없으면(또는 만료/무효화되었으면) 추출 후 저장합니다."""
+        entry = self._cache.get(key)
+        if entry is not None and self._is_valid(key, entry):
+            self._cache.move_to_end(key)
+            self._count(key, "hits")
+            return entry[2]
+        self._count(key, "misses")
+        value = extract_func(*args, **kwargs)
+        self._cache[key] = (time.monotonic(), self.generation, value)
+        self._cache.move_to_end(key)
+        while self.max_size is not None and len(self._cache) > self.max_size:
+            evicted, _ = self._cache.popitem(last=False)
+            self._count(evicted, "evictions")
+        return value
+
+    def advance_generation(self) -> int:
+        """실행 세대를 올립니다. 이전 세대의 결과(Output) 항목은 다음 조회 때 다시 읽습니다."""
+        self.generation += 1
+        return self.generation
 
     def clear(self):
-        """캐시 초기화"""
+        """캐시 및 통계 초기화 (실행 세대는 유지)"""
         self._cache.clear()
+        self._stats.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        totals = {event: sum(counters[event] for counters in self._stats.values()) for event in ("hits", "misses", "evictions", "invalidations")}
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "cached_items": len(self._cache),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "generation": self.generation,
+            **totals,
+            "hit_rate": totals["hits"] / lookups if lookups else 0.0,
+            "by_prefix": {prefix: dict(counters) for prefix, counters in sorted(self._stats.items())},
+        }
+
+def _path_prefix(node_path: str) -> str:
+    """통계용 경로 접두사. 블록/스트림/유틸리티 이름은 *로 묶습니다 (예: \\Data\\Streams\\*\\Output)."""
+    parts = node_path.strip('\\').split('\\')
+    if len(parts) >= 3 and parts[0] == 'Data' and parts[1] in ('Blocks', 'Streams', 'Utilities'):
+        return '\\' + '\\'.join(parts[:2] + ['*'] + parts[3:4])
+    return '\\' + '\\'.join(parts[:3])
 
-_aspen_cache = AspenDataCache()
+def _is_result_path(node_path: str) -> bool:
+    """시뮬레이션 결과(Output 하위 트리) 경로인지 여부. 재실행하면 값이 바뀔 수 있는 항목입니다."""
+    return 'Output' in node_path.split('\\')
+
+_aspen_cache = AspenDataCache(getattr(config, 'MAX_CACHE_SIZE', None), getattr(config, 'NODE_CACHE_TTL', None))
 
 def clear_aspen_cache():
+    """노드 캐시와, 캐시된 Connections로 만든 토폴로지 그래프를 비웁니다."""
     _aspen_cache.clear()
+    clear_topology()
+
+def _new_retry_policy() -> com_retry.RetryPolicy:
+    return com_retry.RetryPolicy(max_attempts=getattr(config, 'MAX_RETRY_ATTEMPTS', 3),
+                                 backoff=getattr(config, 'COM_RETRY_BACKOFF', 0.05),
+                                 max_interval=getattr(config, 'COM_CALL_INTERVAL', 0.0))
+
+# 라이브 COM 호출 재시도/속도 조절 정책 (문서를 새로 열 때 초기화)
+_com_policy = _new_retry_policy()
+
+def get_com_retry_stats() -> Dict[str, Any]:
+    """COM 호출 수, 재시도/최종 실패 횟수, 현재 오류율과 호출 간격, 경로별 실패 횟수"""
+    return _com_policy.stats()
+
+def get_cache_stats() -> Dict[str, Any]:
+    """노드 캐시 항목 수, 실행 세대, 전체/경로 접두사별 적중·실패·제거·무효화 횟수"""
+    return _aspen_cache.stats()
+
+def get_run_generation() -> int:
+    return _aspen_cache.generation
+
+def advance_run_generation() -> int:
+    """
+    시뮬레이션을 다시 실행한 뒤 호출합니다. 캐시/노드 저장소의 결과(Output) 항목과 스트림 결과 테이블(다음 추출에서 트리로 다시 만듦)만 무효화하고,
+    입력·토폴로지(Input, Connections, 단위 세트) 항목은 유지하므로 재추출 시 바뀐 결과 노드만 다시 읽습니다.
+    """
+    clear_stream_table()
+    if _node_store is not None:
+        _node_store.invalidate_results(_is_result_path)
+    generation = _aspen_cache.advance_generation()
+    logger.debug(f"Simulation run generation: {generation}")
+    return generation
+
+def _run_engine(document) -> bool:
+    engine = getattr(document, 'Engine', None)
+    if engine is None:
+        return False
+    engine.Run2()
+    return True
+
+def run_simulation(Application) -> int:
+    """
+    Aspen 엔진으로 시뮬레이션을 다시 실행하고 실행 세대를 올립니다. (main.py --rerun)
+    COM 워커 문서면 엔진도 문서를 소유한 워커 스레드에서 실행하고 끝날 때까지 기다립니다.
+    엔진이 없는 오프라인(bkp)/트레이스 재생 문서는 값이 바뀌지 않으므로 경고만 출력하고 현재 세대를 반환합니다.
+    """
+    worker = getattr(Application, 'worker', None)
+    ran = worker.submit(_run_engine).result() if worker is not None else _run_engine(Application)
+    if not ran:
+        print("Warning: simulation engine not available for this document; cached results kept")
+        return get_run_generation()
+    return advance_run_generation()
 
-def get_cache_stats() -> Dict[str, int]:
-    return {"cached_items": len(_aspen_cache._cache)}
+_UNREAD = object()
+
+class _CachedNode:
+    """
+    노드 캐시 항목: 라이브 노드와 처음 읽은 Value/Elements.
+    같은 경로를 다시 조회하면 이 항목을 돌려주므로 값과 하위 목록도 COM을 다시 호출하지 않고 기억한 것을 씁니다.
+    읽기가 실패(ComReadError)하면 기억하지 않고 다음 접근에서 다시 읽습니다.
+    """
+    __slots__ = ('_node', 'Name', '_value', '_elements')
+
+    def __init__(self, node):
+        self._node = node
+        self.Name = node.Name
+        self._value = _UNREAD
+        self._elements = None
+
+    @property
+    def Value(self) -> Any:
+        if self._value is _UNREAD:
+            self._value = self._node.Value
+        return self._value
+
+    @property
+    def Elements(self) -> list:
+        if self._elements is None:
+            self._elements = list(self._node.Elements)
+        return self._elements
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._node, name)
+
+def _read_live_node(tree, node_path: str) -> Optional[_CachedNode]:
+    node = com_retry.find_node(tree, node_path, _com_policy)
+    return _CachedNode(node) if node is not None else None
+
+def _cached_find_node(Application, node_path: str):
+    """
+    노드 캐시를 거쳐 Application.Tree.FindNode를 호출합니다. 없는 노드(None)도 캐시합니다.
+    캐시 항목은 노드의 Value/Elements를 처음 읽을 때 기억하므로, 같은 경로의 값은 실행 세대 안에서 한 번만 읽습니다.
+    라이브 호출은 재시도 정책(_com_policy)을 거치며, 돌려받은 노드의 Value/Elements 읽기도 같은 정책으로 재시도합니다.
+    재시도 후에도 실패한 호출은 캐시하지 않고 com_retry.ComReadError로 전달됩니다.
+    """
+    return _aspen_cache.get_data((id(Application), node_path), _read_live_node, Application.Tree, node_path)
+
+def _find_node(Application, node_path: str):
+    """
+    data_manager의 모든 노드 조회 진입점.
+    노드 저장소가 연결된 문서는 저장된 값을 먼저 쓰고, 그 외에는 노드 캐시를 거쳐 FindNode를 호출합니다.
+    스냅샷 트리(하위 트리 일괄 수집)는 이미 메모리의 값이고 없는 경로는 노드 캐시를 거쳐 읽으므로 다시 캐시하지 않습니다.
+    """
+    stored = _attached_node_store(Application)
+    if stored is not None:
+        return stored.tree.FindNode(node_path)
+    tree = Application.Tree
+    if isinstance(tree, extraction_plan.SnapshotTree):
+        return tree.FindNode(node_path)
+    return _cached_find_node(Application, node_path)
+
+class _CachedDocument:
+    """Tree.FindNode가 노드 캐시를 거치는 문서 (하위 트리 수집/노드 저장소의 라이브 읽기용)"""
+    def __init__(self, Application):
+        self.Tree = self
+        self.source = Application
+
+    def FindNode(self, node_path: str):
+        return _cached_find_node(self.source, node_path)
+
+    def __getattr__(self, name: str):
+        # 일괄 읽기(read_nodes/read_subtrees) 등 원래 트리의 나머지 속성은 그대로 전달합니다.
+        return getattr(self.source.Tree, name)
+
+# =============================================================================
+# 노드 값 영구 저장소
+# =============================================================================
+
+# 현재 문서에 연결된 아카이브 노드 값 (open_node_store로 연결)
+_node_store: Optional[node_store.ArchiveNodes] = None
+
+def _attached_node_store(Application) -> Optional[node_store.ArchiveNodes]:
+    if _node_store is not None and _node_store.owner == id(Application):
+        return _node_store
+    return None
+
+def get_node_store_path(file_path: str) -> str:
+    """노드 저장소 파일 경로 (아카이브 캐시 디렉토리의 config.NODE_STORE_FILE)"""
+    return os.path.join(get_archive_cache_dir(file_path), getattr(config, 'NODE_STORE_FILE', 'nodes.sqlite'))
+
+def open_node_store(Application, file_path: str, digest: Optional[str] = None, reuse: bool = True) -> Optional[node_store.ArchiveNodes]:
+    """
+    config.ENABLE_NODE_STORE가 켜져 있으면 아카이브 내용 해시로 저장된 노드 값을 불러와 Application에 연결합니다.
+    이후 이 문서의 노드 조회는 저장된 값을 먼저 쓰고, 없는 경로만 노드 캐시를 거쳐 읽어 values에 추가합니다.
+    reuse가 거짓이면 저장된 값을 불러오지 않고 빈 값으로 시작하므로, 모든 노드를 문서에서 읽어 저장된 값을 교체합니다.
+    """
+    global _node_store
+    if not getattr(config, 'ENABLE_NODE_STORE', False):
+        return None
+    start = time.perf_counter()
+    digest = digest or archive_cache.file_digest(file_path)
+    values = node_store.NodeStore(get_node_store_path(file_path)).load(digest) if reuse else {}
+    nodes = node_store.ArchiveNodes(file_path, digest, values, loaded=len(values), owner=id(Application))
+    nodes.tree = extraction_plan.SnapshotTree(nodes.values, _CachedDocument(Application).Tree)
+    _node_store = nodes
+    logger.info(f"Node store: {len(values)} stored nodes loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return nodes
+
+def save_node_store() -> int:
+    """연결된 노드 값을 저장소에 씁니다 (새로 읽은 값이 없거나 재실행 후면 쓰지 않음). 저장한 행 수를 반환합니다."""
+    nodes = _node_store
+    if nodes is None or not nodes.persist or len(nodes.values) == nodes.loaded:
+        return 0
+    saved = node_store.NodeStore(get_node_store_path(nodes.file_path)).save(nodes)
+    if saved:
+        logger.info(f"Node store: {len(nodes.values) - nodes.loaded} new nodes saved ({saved} total)")
+        nodes.loaded = len(nodes.values)
+    return saved
 
 def _read_raw_value(Application, node_path: str) -> Optional[float]:
     """Aspen 노드에서 원시값만 읽어 반환합니다. 단위 변환은 수행하지 않습니다."""
     try:
-        node = Application.Tree.FindNode(node_path)
+        node = _find_node(Application, node_path)
         if node is None or node.Value is None:
             return None
         
@@ -435,6 +924,8 @@ def _read_raw_value(Application, node_path: str) -> Optional[float]:
             return None
             
         return float(raw_value)
+    except com_retry.ComReadError:
+        raise
     except Exception as e:
         print(f"Error reading node {node_path}: {e}", file=sys.stderr)
         return None
@@ -446,33 +937,9 @@ def _read_vessel_data(Application, block_name: str, pressure_unit: str, volume_u
     stream_names = _get_stream_names(Application, block_name)
     #
     
-    max_pressure = -1.0
-    max_flow = -1.0
-    
-    for stream_name in stream_names:
-        # 스트림별 부피유량 추출
-        flow_path = f"\\Data\\Streams\\{stream_name}\\Output\\RES_VOLFLOW"
-        flow_raw = _read_raw_value(Application, flow_path)
-        #
-        
-        # 스트림별 압력 추출
-        pressure_path = f"\\Data\\Streams\\{stream_name}\\Output\\RES_PRES"
-        pressure_raw = _read_raw_value(Application, pressure_path)
-        #
-
-        if pressure_raw is not None and pressure_raw > max_pressure:
-            max_pressure = pressure_raw
-        if flow_raw is not None and flow_raw > max_flow:
-            max_flow = flow_raw
-    
-    #
-    
-    if max_pressure >= 0:
-        extracted_data['max_pressure_value'] = max_pressure
-    if max_flow >= 0:
-        extracted_data['max_flow_value'] = max_flow
-        
-    #
+    # 스트림별 압력/부피유량 최댓값 (스트림 테이블이 있으면 COM 왕복 없이 인덱스로 조회)
+    extracted_data['max_pressure_value'] = _max_stream_value(Application, stream_names, 'RES_PRES', pressure_unit)
+    extracted_data['max_flow_value'] = _max_stream_value(Application, stream_names, 'RES_VOLFLOW', volumetric_flow_unit)
     return extracted_data
 
 def _read_reactor_data(Application, block_name: str, pressure_unit: str, volume_unit: str, volumetric_flow_unit: str) -> Dict[str, any]:
@@ -482,38 +949,21 @@ def _read_reactor_data(Application, block_name: str, pressure_unit: str, volume_
     stream_names = _get_stream_names(Application, block_name)
     #
     
-    max_pressure = -1.0
-    max_flow = -1.0
-    
     # 압력은 블록의 R_PRES 노드에서 추출
     pressure_path = f"\\Data\\Blocks\\{block_name}\\Output\\R_PRES"
     pressure_raw = _read_raw_value(Application, pressure_path)
-    #
-    
-    for stream_name in stream_names:
-        # 스트림별 부피유량 추출 (새로운 노드 경로 사용)
-        flow_path = f"\\Data\\Streams\\{stream_name}\\Output\\RES_VOLFLOW"
-        flow_raw = _read_raw_value(Application, flow_path)
-        #
-
-        if flow_raw is not None and flow_raw > max_flow:
-            max_flow = flow_raw
-    
-    #
     
     if pressure_raw is not None and pressure_raw >= 0:
         extracted_data['max_pressure_value'] = pressure_raw
-    if max_flow >= 0:
-        extracted_data['max_flow_value'] = max_flow
-        
-    #
+    # 스트림별 부피유량 최댓값 (스트림 테이블 또는 노드)
+    extracted_data['max_flow_value'] = _max_stream_value(Application, stream_names, 'RES_VOLFLOW', volumetric_flow_unit)
     return extracted_data
 
 def _extract_mcompr_stage_data(Application, block_name: str, power_unit: Optional[str], pressure_unit: Optional[str], heat_unit: Optional[str], temperature_unit: Optional[str]) -> Dict[int, Dict[str, Optional[float]]]:
     """MCompr 블록의 단계별 데이터를 추출하는 함수"""
     stage_data = {}
     try:
-        bpres_node = Application.Tree.FindNode(f"\\Data\\Blocks\\{block_name}\\Output\\B_PRES")
+        bpres_node = _find_node(Application, f"\\Data\\Blocks\\{block_name}\\Output\\B_PRES")
         if not bpres_node or not hasattr(bpres_node, 'Elements'):
             return {}
         
@@ -526,11 +976,11 @@ def _extract_mcompr_stage_data(Application, block_name: str, power_unit: Optiona
             cool_temp_path = f"\\Data\\Blocks\\{block_name}\\Output\\COOL_TEMP\\{stage_num}"
             q_calc_path = f"\\Data\\Blocks\\{block_name}\\Output\\QCALC\\{stage_num}"
             
-            pressure_raw = _aspen_cache.get_data(f"pressure_{block_name}_{stage_num}", _read_raw_value, Application, pressure_path)
-            power_raw = _aspen_cache.get_data(f"power_{block_name}_{stage_num}", _read_raw_value, Application, power_path)
-            temp_raw = _aspen_cache.get_data(f"temp_{block_name}_{stage_num}", _read_raw_value, Application, temp_path)
-            cool_temp_raw = _aspen_cache.get_data(f"cool_temp_{block_name}_{stage_num}", _read_raw_value, Application, cool_temp_path)
-            q_calc_raw = _aspen_cache.get_data(f"q_calc_{block_name}_{stage_num}", _read_raw_value, Application, q_calc_path)
+            pressure_raw = _read_raw_value(Application, pressure_path)
+            power_raw = _read_raw_value(Application, power_path)
+            temp_raw = _read_raw_value(Application, temp_path)
+            cool_temp_raw = _read_raw_value(Application, cool_temp_path)
+            q_calc_raw = _read_raw_value(Application, q_calc_path)
 
             # 인터쿨러 LMTD 계산 (Heater와 동일한 방식)
             intercooler_lmtd = None
@@ -540,7 +990,7 @@ def _extract_mcompr_stage_data(Application, block_name: str, power_unit: Optiona
                     cooler_utility = _find_intercooler_utility(Application, block_name, stage_num)
                     if cooler_utility:
                         # 유틸리티 온도 데이터 가져오기
-                        utility_data = get_utility_data(Application, cooler_utility)
+                        utility_data = get_utility_data(Application, cooler_utility, temperature_unit)
                         utility_inlet_temp = utility_data.get("inlet_temperature_value")
                         utility_outlet_temp = utility_data.get("outlet_temperature_value")
                         utility_temp_unit = utility_data.get("temperature_unit")
@@ -567,6 +1017,8 @@ def _extract_mcompr_stage_data(Application, block_name: str, power_unit: Optiona
                                             intercooler_lmtd = delta_t1
                                         else:
                                             intercooler_lmtd = (delta_t2 - delta_t1) / math.log(delta_t2 / delta_t1)
+            except com_retry.ComReadError:
+                raise
             except Exception as e:
                 intercooler_lmtd = None
 
@@ -585,6 +1037,8 @@ def _extract_mcompr_stage_data(Application, block_name: str, power_unit: Optiona
                 'utility_inlet_pressure_value': utility_inlet_pres if 'utility_inlet_pres' in locals() else None,
                 'utility_pressure_unit': pressure_unit
             }
+    except com_retry.ComReadError:
+        raise
     except Exception as e:
         print(f"Error extracting MCompr stage data for {block_name}: {e}", file=sys.stderr)
         import traceback
@@ -596,24 +1050,127 @@ def _extract_mcompr_stage_data(Application, block_name: str, power_unit: Optiona
 # 통합 데이터 추출 (프리뷰 및 계산용)
 # =============================================================================
 
-def extract_all_device_data(Application, block_info: Dict[str, str], unit_set_name: str) -> List[Dict]:
+# 추출 대상 장치 카테고리 (이 외의 블록은 비용 계산 대상이 아님)
+EXTRACTED_CATEGORIES = ('Pump', 'Compr', 'MCompr', 'Heater', 'HeatX', 'RStoic', 'RCSTR', 'RPlug', 'RBatch', 'REquil', 'RYield', 'Flash', 'Sep', 'RadFrac', 'Distl', 'DWSTU')
+
+# 하위 트리 일괄 수집 대상: 카테고리 → 추출 함수가 읽는 블록 섹션들
+# (Connections 순회 한 번으로 연결 스트림 이름과 IN/OUT 라벨을 함께 얻습니다. 증류탑은 노드를 읽지 않으므로 제외)
+# 깊이 2 = Output\B_PRES\<스테이지> 까지
+_REACTOR_CATEGORIES = ('RStoic', 'RCSTR', 'RPlug', 'RBatch', 'REquil', 'RYield')
+_PREFETCH_SECTIONS = {
+    'Pump': ('Output',),
+    'Compr': ('Output',),
+    'MCompr': ('Output', 'Input'),
+    'Heater': ('Output', 'Input', 'Connections'),
+    'HeatX': ('Output', 'Input'),
+    'Flash': ('Connections',),
+    'Sep': ('Connections',),
+    **{cat: ('Output', 'Connections') for cat in _REACTOR_CATEGORIES},
+}
+_PREFETCH_DEPTH = 2
+
+def _prefetch_sections(cat: str, with_connections: bool) -> tuple:
+    sections = _PREFETCH_SECTIONS.get(cat, ())
+    return sections + ('Connections',) if with_connections and 'Connections' not in sections else sections
+
+def _stream_columns_for_blocks(Application, block_info: Dict[str, str]) -> Dict[str, Set[str]]:
+    """
+    장치 추출 함수들이 읽는 스트림 결과 칸 {스트림: 컬럼들}. 여러 블록이 공유하는 스트림은 한 번만 들어갑니다.
+    - Heater: 연결 스트림 온도(LMTD). 입구 압력은 LMTD 계산이 된 히터만 읽으므로 테이블에 넣지 않고 필요할 때 노드에서 읽습니다.
+    - Flash/Sep: 연결 스트림 압력/부피유량, 반응기: 연결 스트림 부피유량
+    """
+    stream_columns: Dict[str, Set[str]] = {}
+    def need(stream_names, *columns):
+        for stream_name in stream_names:
+            stream_columns.setdefault(stream_name, set()).update(columns)
+    for name, cat in block_info.items():
+        if cat == 'Heater':
+            need(_get_stream_names(Application, name), 'RES_TEMP')
+        elif cat in ('Flash', 'Sep'):
+            need(_get_stream_names(Application, name), 'RES_PRES', 'RES_VOLFLOW')
+        elif cat in _REACTOR_CATEGORIES:
+            need(_get_stream_names(Application, name), 'RES_VOLFLOW')
+    return stream_columns
+
+def prefetch_block_subtrees(Application, block_info: Dict[str, str], plan: Optional[extraction_plan.ExtractionPlan] = None,
+                            with_connections: Optional[bool] = None) -> extraction_plan.ExtractionPlan:
+    """
+    추출 대상 블록마다 Output/Input/Connections 중 필요한 하위 트리를 한 번씩 순회해 스냅샷에 담습니다.
+    with_connections가 참이면 모든 블록의 Connections도 수집합니다 (None이면 토폴로지 그래프를 만들 예정일 때).
+    """
+    plan = plan if plan is not None else extraction_plan.ExtractionPlan()
+    if with_connections is None:
+        with_connections = _topology is None and getattr(config, 'USE_TOPOLOGY_GRAPH', False)
+    roots = [(f"\\Data\\Blocks\\{name}\\{section}", _PREFETCH_DEPTH)
+             for name, cat in block_info.items()
+             for section in _prefetch_sections(cat, with_connections)]
+    plan.prefetch(Application.Tree, roots)
+    return plan
+
+def extract_all_device_data(Application, block_info: Dict[str, str], unit_set_name: str, unit_types: Optional[Mapping[str, Optional[str]]] = None) -> List[Dict]:
     """
     모든 장치 데이터를 한 번에 추출하고 표준화된 딕셔너리 리스트로 반환합니다.
     이 함수는 Aspen COM 객체에 직접 접근하는 유일한 인터페이스 역할을 합니다.
+    unit_types(load_archive_metadata 결과 등)가 주어지면 단위 노드를 다시 읽지 않고, 없으면 resolve_unit_set으로 한 번 읽습니다.
+    config.PREFETCH_BLOCK_SUBTREES가 켜져 있으면 블록별 Output/Input 하위 트리를 한 번씩 순회해 스냅샷에 담고 그 스냅샷으로 추출합니다.
+    스냅샷에 없는 노드는 직접 읽습니다. 라이브 트리 읽기는 모두 노드 캐시(_find_node)를 거칩니다.
+    config.USE_STREAM_TABLE이 켜져 있고 스트림 결과 테이블이 없으면 장치들이 읽을 스트림 결과 칸으로 테이블을 한 번 만들어(build_stream_table)
+    모든 장치가 함께 씁니다 (히터와 플래시 드럼이 공유하는 스트림도 한 번만 읽음).
+    config.USE_TOPOLOGY_GRAPH가 켜져 있고 토폴로지 그래프가 없으면 block_info 블록들의 Connections로 먼저 만듭니다(load_topology).
+    노드 저장소(open_node_store)가 연결되어 있으면 저장된 값에 없는 노드만 읽습니다.
     """
-    all_devices_data = []
-    
     # 단위 세트 정보 추출
-    power_unit = get_unit_type_value(Application, unit_set_name, 'POWER')
-    pressure_unit = get_unit_type_value(Application, unit_set_name, 'PRESSURE')
-    volume_unit = get_unit_type_value(Application, unit_set_name, 'VOLUME')
-    volumetric_flow_unit = get_unit_type_value(Application, unit_set_name, 'VOLUME-FLOW')
-    heat_unit = get_unit_type_value(Application, unit_set_name, 'ENTHALPY-FLO')
-    heat_transfer_coeff_unit = get_unit_type_value(Application, unit_set_name, 'HEAT-TRANS-C')
-    temperature_unit = get_unit_type_value(Application, unit_set_name, 'TEMPERATURE')
+    unit_types = resolve_unit_set(Application, unit_set_name) if unit_types is None else _frozen_unit_types(unit_types)
+    return _extract_batched(Application, block_info, unit_types, build_shared=True)
+
+def extract_device_data_lazy(Application, block_info: Dict[str, str], unit_set_name: str,
+                             unit_types: Optional[Mapping[str, Optional[str]]] = None) -> lazy_devices.LazyDeviceList:
+    """
+    extract_all_device_data와 같은 장치 목록을 지연 목록으로 반환합니다. 장치 데이터는 그 장치를 표시/오버라이드/비용 계산하며
+    처음 접근할 때 추출해 기억하고, 목록을 순회하면 config.LAZY_EXTRACTION_READAHEAD개씩 묶어 추출합니다 (하위 트리 수집이 켜져 있으면 묶음 단위로 수집).
+    토폴로지 그래프/스트림 테이블은 전체 블록을 읽어야 하므로 여기서 만들지 않습니다 (이미 있으면 사용).
+    반환된 목록은 Application이 열려 있는 동안만 추출할 수 있습니다.
+    """
+    unit_types = resolve_unit_set(Application, unit_set_name) if unit_types is None else _frozen_unit_types(unit_types)
+    return lazy_devices.LazyDeviceList(
+        block_info, lambda chunk: _extract_batched(Application, chunk, unit_types, build_shared=False),
+        EXTRACTED_CATEGORIES, getattr(config, 'LAZY_EXTRACTION_READAHEAD', 1))
+
+def _extract_batched(Application, block_info: Dict[str, str], unit_types: Mapping[str, Optional[str]], build_shared: bool) -> List[Dict]:
+    """block_info 장치들을 (켜져 있으면 하위 트리 수집 스냅샷 위에서) 추출합니다. build_shared면 토폴로지 그래프/스트림 테이블도 만듭니다."""
+    if not isinstance(Application, extraction_plan.PlannedDocument):
+        source = _CachedDocument(Application)
+        # 노드 저장소가 연결되어 있으면 저장된 값을 스냅샷으로 시작하고, 새로 읽은 값은 저장소 values에 그대로 쌓입니다.
+        stored = _attached_node_store(Application)
+        plan = extraction_plan.ExtractionPlan(values=stored.values) if stored is not None else None
+        try:
+            if getattr(config, 'PREFETCH_BLOCK_SUBTREES', False):
+                plan = prefetch_block_subtrees(source, block_info, plan, with_connections=None if build_shared else False)
+            # 토폴로지/스트림 테이블은 하위 트리 스냅샷이 있으면 그 위에서 만듭니다 (스냅샷에 없는 노드만 라이브로 읽음).
+            document = plan.document(source) if plan is not None else Application
+            if build_shared and _topology is None and getattr(config, 'USE_TOPOLOGY_GRAPH', False):
+                load_topology(document, list(block_info))
+            if build_shared and _stream_table is None and getattr(config, 'USE_STREAM_TABLE', False):
+                build_stream_table(document, unit_types, _stream_columns_for_blocks(document, block_info))
+        except com_retry.ComReadError as e:
+            # 일괄 읽기가 실패하면 장치별 직접 추출로 진행합니다 (실패한 장치만 오류로 기록됨).
+            print(f"Warning: batched read failed, extracting devices individually: {e}")
+        if plan is not None:
+            Application = plan.document(source)
+    return _extract_devices(Application, block_info, unit_types)
+
+def _extract_devices(Application, block_info: Dict[str, str], unit_types: Mapping[str, Optional[str]]) -> List[Dict]:
+    all_devices_data = []
+    power_unit = unit_types.get('POWER')
+    pressure_unit = unit_types.get('PRESSURE')
+    volume_unit = unit_types.get('VOLUME')
+    volumetric_flow_unit = unit_types.get('VOLUME-FLOW')
+    heat_unit = unit_types.get('ENTHALPY-FLO')
+    heat_transfer_coeff_unit = unit_types.get('HEAT-TRANS-C')
+    temperature_unit = unit_types.get('TEMPERATURE')
     
     for name, cat in block_info.items():
-        if cat in ('Pump', 'Compr', 'MCompr', 'Heater', 'HeatX', 'RStoic', 'RCSTR', 'RPlug', 'RBatch', 'REquil', 'RYield', 'Flash', 'Sep', 'RadFrac', 'Distl', 'DWSTU'):
+        if cat in EXTRACTED_CATEGORIES:
             try:
                 device_data = _extract_device_data(Application, name, cat, power_unit, pressure_unit, volumetric_flow_unit, heat_unit, heat_transfer_coeff_unit, temperature_unit, volume_unit)
                 all_devices_data.append(device_data)
@@ -637,21 +1194,41 @@ def extract_all_device_data(Application, block_info: Dict[str, str], unit_set_na
         
     return all_devices_data
 
-def extract_all_utility_data(Application) -> List[Dict[str, Any]]:
+def extract_changed_device_data(Application, block_info: Dict[str, str], unit_set_name: str, unit_types: Optional[Mapping[str, Optional[str]]], previous_devices: List[Dict], affected: set) -> List[Dict]:
+    """
+    affected에 속한 블록만 다시 추출하고, 나머지 블록은 이전 실행의 장치 데이터를 재사용해 블록 순서대로 합칩니다.
+    (affected는 bkp_diff.ArchiveDiff.affected_blocks 결과)
+    """
+    changed_info = {name: cat for name, cat in block_info.items() if name in affected}
+    fresh = extract_all_device_data(Application, changed_info, unit_set_name, unit_types) if changed_info else []
+    return bkp_diff.merge_device_data(list(block_info), previous_devices, fresh)
+
+def extract_all_utility_data(Application, unit_types: Optional[Mapping[str, Optional[str]]] = None) -> List[Dict[str, Any]]:
     """
     모든 유틸리티 데이터를 추출합니다.
+    unit_types(load_archive_metadata 결과 등)가 없으면 현재 단위 세트를 resolve_unit_set으로 한 번 읽습니다.
     """
+    try:
+        if unit_types is None:
+            unit_types = resolve_unit_set(Application, get_current_unit_set(Application))
+        utility_names = get_utility_names(Application)
+    except com_retry.ComReadError as e:
+        # 유틸리티 정보는 비용 계산에 필요하지 않으므로 읽지 못해도 실행을 멈추지 않습니다.
+        print(f"Warning: could not read utilities: {e}")
+        return []
+    temperature_unit = unit_types.get('TEMPERATURE')
     utilities_data = []
-    utility_names = get_utility_names(Application)
     
     for utility_name in utility_names:
-        utility_data = get_utility_data(Application, utility_name)
+        utility_data = get_utility_data(Application, utility_name, temperature_unit)
         utilities_data.append({
             "name": utility_name,  # UTILITY_ 접두사 제거
             "category": "Utility",
             "utility_data": utility_data
         })
-        
+    failed = [utility["name"] for utility in utilities_data if utility["utility_data"].get("com_read_failed")]
+    if failed:
+        print(f"Warning: COM read failed for {len(failed)} utilities: {', '.join(failed)}")
     return utilities_data
 
 
@@ -0,0 +1,95 @@
+"""
+문서 풀 병렬 추출 모듈
+
+같은 아카이브를 워커 프로세스마다 하나씩(connect_to_aspen 또는 지정한 opener로) 열어 두고,
+block_info를 워커 수만큼 나눈(shard) 뒤 각 워커가 자기 문서로 extract_all_device_data를 실행합니다.
+결과 장치 레코드는 원래 block_info 순서로 합치므로, 워커 수와 완료 순서에 관계없이 순차 추출과 같은 결과가 나옵니다.
+
+문서를 여는 방식(backend/opener)은 바꿀 수 있어, 샤딩/병합 로직은 Linux에서도 오프라인(bkp) 트리나
+가짜 COM 문서(com_worker.FakeComDocument)로 검증할 수 있습니다.
+"""
+
+from typing import Optional, Dict, List, Any, Callable
+from concurrent.futures import ProcessPoolExecutor
+import io
+import os
+from contextlib import redirect_stdout
+
+import config
+import data_manager
+
+# =============================================================================
+# 샤딩 / 병합
+# =============================================================================
+
+def shard_blocks(block_info: Dict[str, str], shards: int) -> List[Dict[str, str]]:
+    """
+    block_info를 shards개로 나눕니다. 추출 대상 카테고리(COM 읽기가 필요한 블록)를 먼저 라운드로빈으로 나눠 부하를 맞추고,
+    나머지(무시/미분류 블록)를 이어서 나눕니다. 각 조각 안에서는 원래 순서를 유지하며 빈 조각은 만들지 않습니다.
+    """
+    shards = max(1, min(shards, len(block_info)))
+    ordered = ([item for item in block_info.items() if item[1] in data_manager.EXTRACTED_CATEGORIES]
+               + [item for item in block_info.items() if item[1] not in data_manager.EXTRACTED_CATEGORIES])
+    parts: List[Dict[str, str]] = [{} for _ in range(shards)]
+    for i, (name, cat) in enumerate(ordered):
+        parts[i % shards][name] = cat
+    position = {name: i for i, name in enumerate(block_info)}
+    return [dict(sorted(part.items(), key=lambda item: position[item[0]])) for part in parts if part]
+
+def merge_devices(block_info: Dict[str, str], shard_results: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """조각별 장치 레코드를 block_info 순서로 합칩니다."""
+    position = {name: i for i, name in enumerate(block_info)}
+    devices = [device for result in shard_results for device in result]
+    return sorted(devices, key=lambda device: position.get(device.get('name'), len(position)))
+
+# =============================================================================
+# 워커 프로세스
+# =============================================================================
+
+# 워커 프로세스가 연 문서 (프로세스당 하나, 초기화 함수에서 엽니다)
+_worker_document = None
+
+def _open_with_backend(file_path: str, backend: Optional[str]):
+    return data_manager.connect_to_aspen(file_path, backend=backend)
+
+def _init_worker(file_path: str, backend: Optional[str], opener: Optional[Callable[[str], Any]]) -> None:
+    """워커 프로세스 초기화: 아카이브 문서를 열고, 설정되어 있으면 스트림 테이블을 읽습니다."""
+    global _worker_document
+    with redirect_stdout(io.StringIO()):
+        _worker_document = opener(file_path) if opener is not None else _open_with_backend(file_path, backend)
+        if getattr(config, 'USE_STREAM_TABLE', False):
+            data_manager.load_stream_table(file_path)
+
+def _extract_shard(block_info: Dict[str, str], unit_set: Optional[str], unit_types: Dict[str, Optional[str]]) -> List[Dict[str, Any]]:
+    with redirect_stdout(io.StringIO()):
+        return data_manager.extract_all_device_data(_worker_document, block_info, unit_set, unit_types)
+
+# =============================================================================
+# 병렬 추출
+# =============================================================================
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """
+    워커 수: workers, config.EXTRACTION_WORKERS, CPU 코어 수 순으로 정하고 config.MAX_EXTRACTION_WORKERS로 제한합니다.
+    워커마다 Aspen 인스턴스를 하나씩 열므로 코어 수만큼 열지 않도록 상한을 둡니다.
+    """
+    workers = workers or getattr(config, 'EXTRACTION_WORKERS', None) or os.cpu_count() or 1
+    limit = getattr(config, 'MAX_EXTRACTION_WORKERS', None)
+    return max(1, min(workers, limit) if limit else workers)
+
+def extract_device_data_parallel(file_path: str, block_info: Dict[str, str], unit_set: Optional[str],
+                                 unit_types: Dict[str, Optional[str]], workers: Optional[int] = None,
+                                 backend: Optional[str] = None, opener: Optional[Callable[[str], Any]] = None) -> List[Dict[str, Any]]:
+    """
+    워커 프로세스 workers개(resolve_workers, 최대 config.MAX_EXTRACTION_WORKERS)가 각자 문서를 열어 block_info 조각을 추출합니다.
+    opener(file_path → 문서, 피클 가능한 최상위 함수)가 주어지면 connect_to_aspen(backend) 대신 사용합니다.
+    워커에서 난 예외(문서 열기 실패 등)는 그대로 전달되므로, 호출 측에서 순차 추출로 되돌릴 수 있습니다.
+    """
+    shards = shard_blocks(block_info, resolve_workers(workers))
+    if not shards:
+        return []
+    with ProcessPoolExecutor(max_workers=len(shards), initializer=_init_worker,
+                             initargs=(file_path, backend, opener)) as pool:
+        futures = [pool.submit(_extract_shard, shard, unit_set, unit_types) for shard in shards]
+        results = [future.result() for future in futures]
+    return merge_devices(block_info, results)
@@ -0,0 +1,217 @@
+"""
+노드 스냅샷 및 일괄 노드 읽기 모듈
+
+경로 → NodeSnapshot 맵(스냅샷)과 그 위의 FindNode(SnapshotTree)를 제공합니다.
+블록 하위 트리 일괄 수집(config.PREFETCH_BLOCK_SUBTREES), 노드 저장소(node_store), COM 워커의 일괄 읽기가 이 스냅샷을 씁니다.
+같은 경로를 여러 번 읽는 중복은 data_manager의 노드 캐시(LRU, config.MAX_CACHE_SIZE)가 이미 실행 세대 안에서 한 번으로 줄이므로,
+추출 전에 필요한 경로를 따로 모으는 단계는 두지 않습니다.
+"""
+
+from typing import Optional, Dict, List, Set, Any, NamedTuple, Iterable, Tuple
+from dataclasses import dataclass, field
+
+import logger
+from com_retry import ComReadError
+
+# =============================================================================
+# 노드 스냅샷
+# =============================================================================
+
+class NodeSnapshot(NamedTuple):
+    """경로 하나를 읽은 결과. found=False면 FindNode가 None을 반환한 경로"""
+    found: bool
+    value: Any = None
+    elements: Optional[Tuple[str, ...]] = None   # 하위 노드 이름 (Elements를 읽은 경로만)
+
+def read_node(tree, path: str, with_elements: bool = False) -> NodeSnapshot:
+    """라이브 트리에서 경로 하나를 읽습니다 (FindNode 1회)."""
+    try:
+        node = tree.FindNode(path)
+    except ComReadError:
+        raise
+    except Exception as e:
+        logger.debug(f"Snapshot read: FindNode({path}) failed: {e}")
+        return NodeSnapshot(False)
+    if node is None:
+        return NodeSnapshot(False)
+    try:
+        value = node.Value
+    except ComReadError:
+        raise
+    except Exception as e:
+        logger.debug(f"Snapshot read: {path}.Value failed: {e}")
+        value = None
+    elements = None
+    if with_elements:
+        try:
+            elements = tuple(str(element.Name) for element in node.Elements)
+        except ComReadError:
+            raise
+        except Exception as e:
+            logger.debug(f"Snapshot read: {path}.Elements failed: {e}")
+            elements = ()
+    return NodeSnapshot(True, value, elements)
+
+def read_nodes(tree, paths: Iterable[str], collections: Set[str] = frozenset()) -> Dict[str, NodeSnapshot]:
+    """
+    경로들을 한 번의 패스로 읽습니다. collections에 속한 경로는 하위 노드 이름도 읽습니다.
+    트리가 일괄 읽기(read_nodes, 예: COM 워커)를 제공하면 요청 한 번으로 읽습니다.
+    """
+    batch = getattr(tree, 'read_nodes', None)
+    if batch is not None:
+        return batch(list(paths), collections)
+    return {path: read_node(tree, path, path in collections) for path in paths}
+
+def read_subtree(tree, path: str, depth: int = 2) -> Tuple[Dict[str, NodeSnapshot], int]:
+    """
+    path 노드를 FindNode 1회로 찾고 Elements를 순회해 하위 depth단계까지의 값을 한 번에 읽습니다.
+    (레거시 equipment_costs.AspenDataCache._extract_block_data의 Output 일괄 수집과 같은 방식)
+    반환값: ({경로: NodeSnapshot}, 순회한 하위 노드 수). 가장 깊은 단계 노드의 하위 목록은 읽지 않습니다(elements=None).
+    """
+    try:
+        root = tree.FindNode(path)
+    except ComReadError:
+        raise
+    except Exception as e:
+        logger.debug(f"Subtree read: FindNode({path}) failed: {e}")
+        root = None
+    if root is None:
+        return {path: NodeSnapshot(False)}, 0
+    values: Dict[str, NodeSnapshot] = {}
+    visited = 0
+
+    def walk(node, node_path: str, level: int) -> None:
+        nonlocal visited
+        try:
+            value = node.Value
+        except ComReadError:
+            raise
+        except Exception as e:
+            logger.debug(f"Subtree read: {node_path}.Value failed: {e}")
+            value = None
+        if level >= depth:
+            values[node_path] = NodeSnapshot(True, value, None)
+            return
+        names = []
+        try:
+            children = list(node.Elements)
+        except ComReadError:
+            raise
+        except Exception as e:
+            logger.debug(f"Subtree read: {node_path}.Elements failed: {e}")
+            children = []
+        for child in children:
+            try:
+                name = str(child.Name)
+            except ComReadError:
+                raise
+            except Exception as e:
+                logger.debug(f"Subtree read: child name under {node_path} failed: {e}")
+                continue
+            names.append(name)
+            visited += 1
+            walk(child, f"{node_path}\\{name}", level + 1)
+        values[node_path] = NodeSnapshot(True, value, tuple(names))
+
+    walk(root, path, 0)
+    return values, visited
+
+class _SnapshotElement:
+    """Elements 순회 시 돌려주는 하위 노드 (이름만 가짐)"""
+    __slots__ = ('Name',)
+
+    def __init__(self, name: str):
+        self.Name = name
+
+class SnapshotNode:
+    """스냅샷 값으로 만든 노드. Value/Elements/Name만 제공합니다."""
+    def __init__(self, tree: "SnapshotTree", path: str, snapshot: NodeSnapshot):
+        self._tree = tree
+        self._path = path
+        self._snapshot = snapshot
+        self.Name = path.rsplit('\\', 1)[-1]
+        self.Value = snapshot.value
+
+    @property
+    def Elements(self) -> List[_SnapshotElement]:
+        names = self._snapshot.elements
+        if names is None:
+            names = self._tree._elements_of(self._path)
+        return [_SnapshotElement(name) for name in names]
+
+class SnapshotTree:
+    """
+    경로 → NodeSnapshot 맵 위의 FindNode. 스냅샷에 없는 경로는 라이브 트리에서 읽어 스냅샷에 추가합니다 (fallbacks로 집계).
+    하위 목록을 읽은 노드(하위 트리 일괄 수집, Connections 등) 아래에서 목록에 없는 경로는 라이브 트리를 읽지 않고 None입니다.
+    """
+    def __init__(self, values: Dict[str, NodeSnapshot], live_tree):
+        self._values = values
+        self._live_tree = live_tree
+        self.hits = 0
+        self.fallbacks = 0
+
+    def _known_missing(self, path: str) -> bool:
+        """부모 노드의 하위 목록을 읽었고 그 목록에 없는 경로(또는 부모가 없는 경로)는 읽지 않아도 없는 노드입니다."""
+        parent_path, _, name = path.rpartition('\\')
+        parent = self._values.get(parent_path)
+        if parent is None:
+            return False
+        return not parent.found or (parent.elements is not None and name not in parent.elements)
+
+    def FindNode(self, path: str):
+        snapshot = self._values.get(path)
+        if snapshot is None and self._known_missing(path):
+            self.hits += 1
+            return None
+        if snapshot is None:
+            self.fallbacks += 1
+            snapshot = self._values[path] = read_node(self._live_tree, path)
+        else:
+            self.hits += 1
+        return SnapshotNode(self, path, snapshot) if snapshot.found else None
+
+    def _elements_of(self, path: str) -> Tuple[str, ...]:
+        self.fallbacks += 1
+        snapshot = self._values[path] = read_node(self._live_tree, path, with_elements=True)
+        return snapshot.elements or ()
+
+class PlannedDocument:
+    """Application 대신 추출 함수에 넘기는 문서. Tree는 스냅샷, 없는 경로는 원래 Application에서 읽습니다."""
+    def __init__(self, values: Dict[str, NodeSnapshot], Application):
+        self.Tree = SnapshotTree(values, Application.Tree)
+        self.source = Application
+
+# =============================================================================
+# 하위 트리 일괄 수집
+# =============================================================================
+
+@dataclass
+class ExtractionPlan:
+    """
+    일괄 수집한 스냅샷 값.
+    - subtree_reads / element_reads: 하위 트리 일괄 수집(prefetch)의 FindNode 호출 수 / 순회한 하위 노드 수
+    """
+    values: Dict[str, NodeSnapshot] = field(default_factory=dict)
+    subtree_reads: int = 0
+    element_reads: int = 0
+
+    @property
+    def paths(self) -> List[str]:
+        return list(self.values)
+
+    def prefetch(self, tree, roots: Iterable[Tuple[str, int]]) -> None:
+        """
+        (경로, 깊이) 목록의 하위 트리를 일괄 수집해 스냅샷에 추가합니다. 이미 읽은 경로는 덮어쓰지 않습니다.
+        트리가 일괄 읽기(read_subtrees, 예: COM 워커)를 제공하면 요청 한 번으로 읽습니다.
+        """
+        pending = [(path, depth) for path, depth in dict.fromkeys(roots) if path not in self.values]
+        batch = getattr(tree, 'read_subtrees', None)
+        results = batch(pending) if batch is not None else [read_subtree(tree, path, depth) for path, depth in pending]
+        for values, visited in results:
+            for node_path, snapshot in values.items():
+                self.values.setdefault(node_path, snapshot)
+            self.subtree_reads += 1
+            self.element_reads += visited
+
+    def document(self, Application) -> PlannedDocument:
+        return PlannedDocument(self.values, Application)
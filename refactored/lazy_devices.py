@@ -0,0 +1,168 @@
+"""
+지연 장치 목록 모듈
+
+block_info 순서대로 장치 레코드(dict와 같은 인터페이스)를 담되, 추출 대상 카테고리 장치의 데이터는
+그 장치의 이름/카테고리 외 키에 처음 접근할 때(프리뷰 표시, 오버라이드, 비용 계산) 추출해 기억합니다.
+앞 장치에 이어 다음 장치에 접근하면(목록 순회) 이후 장치들을 readahead개씩 묶어 한 번에 추출합니다.
+
+- LazyDevice: 장치 하나 (MutableMapping). 'name'/'category'는 추출 없이 바로 읽힘
+- LazyDeviceList: 장치 목록 (Sequence). deepcopy는 추출하지 않고 같은 추출 결과를 공유하며, pickle은 일반 list/dict로 저장
+"""
+
+from typing import Optional, Dict, List, Any, Callable, Iterable, Iterator
+from collections.abc import MutableMapping, Sequence
+import copy
+
+# =============================================================================
+# 장치
+# =============================================================================
+
+class LazyDevice(MutableMapping):
+    """
+    장치 레코드 하나. 처음 접근할 때 목록의 추출 결과(원본)를 복사해 자기 데이터로 쓰므로,
+    오버라이드로 값을 바꿔도 원본과 다른 사본(deepcopy한 목록)에는 영향이 없습니다.
+    """
+    __slots__ = ('_devices', 'name', 'category', '_data')
+
+    def __init__(self, devices: "LazyDeviceList", name: str, category: str, data: Optional[Dict[str, Any]] = None):
+        self._devices = devices
+        self.name = name
+        self.category = category
+        self._data = data
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = copy.deepcopy(self._devices._extract(self.name))
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        if self._data is None:
+            if key == 'name':
+                return self.name
+            if key == 'category':
+                return self.category
+        return self._load()[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._load()[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._load()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def copy(self) -> Dict[str, Any]:
+        """dict.copy와 같은 얕은 복사 (일반 dict)"""
+        return dict(self._load())
+
+    def __deepcopy__(self, memo) -> "LazyDevice":
+        return LazyDevice(self._devices, self.name, self.category, copy.deepcopy(self._data, memo))
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
+
+    def __repr__(self) -> str:
+        if self._data is None:
+            return f"LazyDevice({self.name!r}, {self.category!r}, not extracted)"
+        return repr(self._data)
+
+# =============================================================================
+# 장치 목록
+# =============================================================================
+
+class LazyDeviceList(Sequence):
+    """
+    block_info 순서의 장치 목록
+    - extract({블록: 카테고리}) → 같은 순서의 장치 레코드 목록 (data_manager의 일괄 추출 함수)
+    - lazy_categories: 처음 접근할 때 추출하는 카테고리. 그 외 블록(Unknown, Mixer 등 노드를 읽지 않는 레코드)은 만들 때 한 번에 추출합니다.
+    - readahead: 순회 중(직전 장치 다음 장치에 접근) 한 번에 추출할 장치 수
+    """
+    def __init__(self, block_info: Dict[str, str], extract: Callable[[Dict[str, str]], List[Dict[str, Any]]],
+                 lazy_categories: Iterable[str], readahead: int = 1):
+        lazy_categories = set(lazy_categories)
+        self._block_info = dict(block_info)
+        self._extract_batch = extract
+        self._readahead = max(1, readahead)
+        self._order = list(self._block_info)
+        self._position = {name: i for i, name in enumerate(self._order)}
+        self._extracted: Dict[str, Dict[str, Any]] = {}
+        eager = {name: cat for name, cat in self._block_info.items() if cat not in lazy_categories}
+        if eager:
+            self._remember(eager, extract(eager))
+        # 첫 장치부터 접근하면 순회로 봅니다.
+        self._last_index = -1
+        self._devices = [LazyDevice(self, name, self._extracted[name].get('category', cat) if name in self._extracted else cat)
+                         for name, cat in self._block_info.items()]
+
+    def _remember(self, block_info: Dict[str, str], devices: List[Dict[str, Any]]) -> None:
+        for name, device in zip(block_info, devices):
+            self._extracted[name] = device
+
+    def _extract(self, name: str) -> Dict[str, Any]:
+        """장치의 추출 결과(원본). 없으면 그 장치(순회 중이면 이후 아직 추출하지 않은 장치 readahead개까지)를 추출합니다."""
+        index = self._position[name]
+        sequential = index == self._last_index + 1
+        self._last_index = index
+        if name not in self._extracted:
+            names = [name]
+            if sequential:
+                for following in self._order[index + 1:index + 1 + 4 * self._readahead]:
+                    if len(names) >= self._readahead:
+                        break
+                    if following not in self._extracted:
+                        names.append(following)
+            chunk = {n: self._block_info[n] for n in names}
+            self._remember(chunk, self._extract_batch(chunk))
+        return self._extracted[name]
+
+    # --- Sequence ---
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __getitem__(self, index):
+        return self._devices[index]
+
+    def __iter__(self) -> Iterator[LazyDevice]:
+        return iter(self._devices)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (list, tuple, LazyDeviceList)):
+            return NotImplemented
+        return list(self._devices) == list(other)
+
+    __hash__ = None
+
+    # --- 상태 ---
+
+    @property
+    def extracted_count(self) -> int:
+        """추출된 장치 수 (노드를 읽지 않는 레코드 포함)"""
+        return len(self._extracted)
+
+    def materialize(self) -> List[Dict[str, Any]]:
+        """모든 장치를 추출해 일반 dict 목록으로 반환합니다."""
+        return [device.copy() for device in self._devices]
+
+    def __deepcopy__(self, memo) -> "LazyDeviceList":
+        """추출하지 않는 사본: 추출 결과(원본)는 공유하고, 장치별로 이미 가진 데이터만 복사합니다."""
+        clone = LazyDeviceList.__new__(LazyDeviceList)
+        clone.__dict__.update(self.__dict__)
+        clone._last_index = -1
+        clone._devices = [LazyDevice(clone, device.name, device.category, copy.deepcopy(device._data, memo))
+                          for device in self._devices]
+        return clone
+
+    def __reduce__(self):
+        return list, (self.materialize(),)
+
+    def __repr__(self) -> str:
+        return f"LazyDeviceList({len(self)} devices, {self.extracted_count} extracted)"
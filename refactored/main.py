@@ -3,14 +3,15 @@
 이 모듈은 전체 프로그램의 워크플로우를 제어합니다.
 """
 
+import argparse
 import os
 import sys
 import time
 from threading import Thread
 import pickle
+import copy
 from typing import Optional, Dict, List, Any
 from dataclasses import dataclass, field
-import win32com.client as win32
 import math
 
 import config
@@ -18,6 +19,12 @@ import unit_converter
 import data_manager
 import cost_calculator
 import logger
+import bkp_diff
+import archive_summary
+import com_profiler
+import com_worker
+import document_pool
+import lazy_devices
 
 # =============================================================================
 # 스피너 클래스 (시각적 피드백 제공)
@@ -260,12 +267,31 @@ def print_utility_info(utilities_data: List[Dict]):
             elif outlet_temp_val is not None:
                 details.append(f"Outlet Temp={outlet_temp_val} {temp_unit}")
         
+        if utility_data.get("error"):
+            details.append(f"ERROR: {utility_data['error']}")
         details_str = " | ".join(details) if details else "No data"
         print(f"  - {utility_name:<20} | {details_str}")
     
     print("=" * 80)
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Aspen Plus equipment cost estimation")
+    parser.add_argument('--com-profile', action='store_true',
+                        help='record every Tree FindNode/Value/Elements access and print a COM hotspot report after extraction')
+    trace_mode = parser.add_mutually_exclusive_group()
+    trace_mode.add_argument('--record-trace', action='store_true',
+                            help='record this session\'s tree accesses to a trace file next to the .bkp (<name>.trace.json.gz)')
+    trace_mode.add_argument('--replay-trace', action='store_true',
+                            help='replay the trace recorded next to the .bkp instead of connecting to Aspen Plus')
+    parser.add_argument('--rerun', action='store_true',
+                        help='run the simulation in Aspen Plus before extracting; results are read again from the tree, inputs and topology are reused')
+    args = parser.parse_args(argv)
+    profiler = com_profiler.ComProfiler() if args.com_profile else None
+    if args.record_trace or getattr(config, 'RECORD_COM_TRACE', False):
+        # 트레이스에 전체 트리 접근이 담기도록 저장된 노드 값/메타데이터 캐시를 쓰지 않습니다.
+        config.ENABLE_NODE_STORE = False
+        config.ENABLE_ARCHIVE_CACHE = False
+
     current_dir = os.path.dirname(os.path.abspath(__file__))
 
     # 1. 파일 선택 및 Aspen Plus 연결
@@ -273,12 +299,59 @@ def main():
     if not file_path:
         sys.exit("파일을 선택하지 않았거나 찾을 수 없습니다.")
 
-    Application = data_manager.connect_to_aspen(file_path)
+    # 1.5. 요약 사이드카 (같은 내용의 .bkp로 이전에 실행했다면 Aspen 연결 없이 캐시된 프리뷰 표시)
+    #      다시 추출을 선택하면 이전 실행 스냅샷/저장된 노드 값/이전 비용 결과도 쓰지 않고 전체를 추출·계산합니다.
+    #      --rerun이면 결과가 .bkp와 달라지므로 사이드카와 이전 실행 스냅샷을 읽지도 쓰지도 않습니다.
+    cached_summary: Optional[archive_summary.ArchiveSummary] = None
+    refresh = False
+    reuse_archive_results = not args.rerun
+    if reuse_archive_results and getattr(config, 'ENABLE_SUMMARY_SIDECAR', False):
+        start = time.perf_counter()
+        cached_summary = archive_summary.load_summary(file_path)
+        if cached_summary is not None:
+            logger.info(f"Summary sidecar loaded: {(time.perf_counter() - start) * 1000:.1f} ms")
+            print(archive_summary.format_preview(cached_summary))
+            refresh_choice = input("Aspen에서 데이터를 다시 추출하시겠습니까? (y/n, 기본 n): ").strip().lower()
+            if refresh_choice == 'y':
+                cached_summary = None
+                refresh = True
 
     # 2. 장치 분류 및 단위 세트 추출
-    block_names = data_manager.get_block_names(Application)
-    block_info = data_manager.parse_bkp_file_for_blocks(file_path, block_names)
-    current_unit_set = data_manager.get_current_unit_set(Application)
+    #    (.bkp 내용이 이전 실행과 같으면 디스크 캐시에서 바로 불러옵니다)
+    if cached_summary is not None:
+        Application = None
+        metadata = {'block_info': cached_summary.block_info, 'unit_set': cached_summary.unit_set, 'unit_types': cached_summary.unit_types}
+    else:
+        def open_document():
+            return data_manager.connect_to_aspen(file_path, backend='replay' if args.replay_trace else None,
+                                                 record=True if args.record_trace else None)
+        worker_document: Optional[com_worker.WorkerDocument] = None
+        if getattr(config, 'USE_COM_WORKER', False):
+            # 문서는 COM 워커 스레드가 열고 소유합니다 (모든 COM 호출이 그 스레드에서 실행). 여는 동안 메인 스레드는 아래 작업을 계속합니다.
+            Application = worker_document = com_worker.open_worker_document(open_document)
+        else:
+            Application = open_document()
+        if profiler is not None:
+            # 메인 스레드 쪽 문서를 감싸야 접근마다 호출한 추출 함수가 기록됩니다 (워커 안에서 감싸면 모두 워커 루프로 기록됨).
+            Application = com_profiler.ProfiledDocument(Application, profiler)
+        if getattr(config, 'USE_STREAM_TABLE', False):
+            # 스트림 결과(온도/압력/부피유량)를 .bkp에서 한 번에 읽어 COM 대신 인덱스로 조회합니다.
+            data_manager.load_stream_table(file_path)
+        if worker_document is not None:
+            worker_document.wait_ready()
+        # 같은 내용의 .bkp로 저장된 노드 값이 있으면 COM 대신 사용합니다 (다시 추출이면 읽지 않고 이번 값으로 교체).
+        data_manager.open_node_store(Application, file_path, reuse=not refresh)
+        metadata = data_manager.load_archive_metadata(Application, file_path)
+        if args.rerun:
+            # 블록 분류/단위 세트(입력)는 재실행으로 바뀌지 않으므로 그대로 두고, 결과(Output) 캐시만 무효화됩니다.
+            spinner = Spinner("시뮬레이션을 다시 실행하는 중입니다...")
+            spinner.start()
+            try:
+                data_manager.run_simulation(Application)
+            finally:
+                spinner.stop("시뮬레이션 실행 완료!")
+    block_info = metadata['block_info']
+    current_unit_set = metadata['unit_set']
 
     # 2.5. Verbosity 설정 (사용자 입력, 기본값은 config.DEFAULT_VERBOSITY)
     try:
@@ -288,14 +361,78 @@ def main():
     except Exception:
         pass
 
+    # 2.7. 이전 실행과 비교 (같은 .bkp의 마지막 실행 스냅샷이 있으면 변경된 블록/스트림만 다시 추출)
+    previous_run: Optional[bkp_diff.RunSnapshot] = None
+    affected_blocks = None
+    if cached_summary is None and reuse_archive_results and getattr(config, 'ENABLE_INCREMENTAL_RUN', False):
+        fingerprint = bkp_diff.fingerprint_archive(file_path)
+        snapshot_file = bkp_diff.snapshot_path(data_manager.get_archive_cache_dir(file_path), file_path)
+        previous_run = bkp_diff.RunSnapshot.load(snapshot_file) if not refresh else None
+        if previous_run is not None and previous_run.unit_set == current_unit_set:
+            diff = bkp_diff.diff_fingerprints(previous_run.fingerprint, fingerprint)
+            affected_blocks = diff.affected_blocks(fingerprint)
+            print("\n이전 실행 대비 변경 사항:" if not diff.is_empty else "\n이전 실행 대비 변경 사항 없음")
+            for line in diff.summary_lines():
+                print(f"  - {line}")
+            print(f"다시 추출할 장치: {len(affected_blocks)}개 / 전체 {len(block_info)}개")
+
     # 3. 데이터 추출 및 프리뷰
-    spinner = Spinner("데이터를 추출하는 중입니다...")
-    spinner.start()
-    try:
-        all_devices_base = data_manager.extract_all_device_data(Application, block_info, current_unit_set)
-        utilities_data = data_manager.extract_all_utility_data(Application)
-    finally:
-        spinner.stop("데이터 추출 완료!")
+    #    (지연 추출이면 장치 데이터는 프리뷰 표시/오버라이드/비용 계산에서 처음 접근할 때 추출합니다.
+    #     COM 프로파일과 트레이스 기록/재생은 추출 단계가 끝날 때 마무리하므로(finish_com_trace, 프로파일 리포트) 전체를 미리 추출합니다.)
+    com_session_observed = (profiler is not None or args.record_trace or args.replay_trace
+                            or getattr(config, 'RECORD_COM_TRACE', False))
+    lazy_extraction = getattr(config, 'LAZY_DEVICE_EXTRACTION', False) and not com_session_observed
+    parallel_extraction = (getattr(config, 'EXTRACTION_WORKERS', 1) > 1
+                           and len(block_info) >= getattr(config, 'PARALLEL_EXTRACTION_MIN_BLOCKS', 100))
+    if parallel_extraction and cached_summary is None and com_session_observed:
+        # 워커 프로세스는 문서를 각자 열므로 프로파일러/트레이스 래퍼가 적용되지 않습니다.
+        print("Warning: parallel extraction does not support --com-profile or COM trace record/replay; extracting sequentially")
+        parallel_extraction = False
+    if cached_summary is not None:
+        all_devices_base = copy.deepcopy(cached_summary.devices)
+        utilities_data = cached_summary.utilities
+    else:
+        spinner = Spinner("데이터를 추출하는 중입니다...")
+        spinner.start()
+        try:
+            if affected_blocks is not None:
+                all_devices_base = data_manager.extract_changed_device_data(Application, block_info, current_unit_set, metadata['unit_types'], previous_run.all_devices, affected_blocks)
+            elif parallel_extraction:
+                # 블록이 많으면 워커 프로세스마다 같은 아카이브를 열어 블록을 나눠 추출합니다.
+                try:
+                    all_devices_base = document_pool.extract_device_data_parallel(file_path, block_info, current_unit_set, metadata['unit_types'])
+                except Exception as e:
+                    print(f"Warning: parallel extraction failed, extracting sequentially: {e}")
+                    all_devices_base = data_manager.extract_all_device_data(Application, block_info, current_unit_set, metadata['unit_types'])
+            elif lazy_extraction:
+                all_devices_base = data_manager.extract_device_data_lazy(Application, block_info, current_unit_set, metadata['unit_types'])
+            else:
+                all_devices_base = data_manager.extract_all_device_data(Application, block_info, current_unit_set, metadata['unit_types'])
+            utilities_data = data_manager.extract_all_utility_data(Application, metadata['unit_types'])
+            data_manager.save_node_store()
+        finally:
+            spinner.stop("데이터 추출 완료!")
+        data_manager.finish_com_trace()
+        if profiler is not None:
+            # Aspen 트리 접근은 추출 단계에서 끝나므로 여기서 리포트를 출력합니다.
+            print("\n" + com_profiler.format_report(profiler))
+    extracted_devices = copy.deepcopy(all_devices_base)
+
+    run_snapshot = None
+    if cached_summary is None and reuse_archive_results and getattr(config, 'ENABLE_INCREMENTAL_RUN', False):
+        run_snapshot = bkp_diff.RunSnapshot(
+            aspen_file=file_path,
+            fingerprint=fingerprint,
+            unit_set=current_unit_set,
+            all_devices=copy.deepcopy(all_devices_base),
+            utilities=utilities_data,
+            costed_devices=previous_run.costed_devices if previous_run else [],
+            cost_results=previous_run.cost_results if previous_run else [],
+            cepci=previous_run.cepci if previous_run else None,
+        )
+        # 지연 추출 목록은 저장하면 모든 장치를 추출하므로, 비용 계산 뒤에 저장합니다.
+        if not isinstance(all_devices_base, lazy_devices.LazyDeviceList):
+            run_snapshot.save(snapshot_file)
 
     session: Optional[PreviewSession] = None
     
@@ -635,7 +772,24 @@ def main():
     
     final_devices_to_calc = all_devices_preview
     # 비용 계산 실행 (상세 출력은 결과 생성 후 별도 섹션에서 표시)
-    cost_results = cost_calculator.calculate_all_costs_with_data(final_devices_to_calc, cepci_options)
+    if run_snapshot is not None and run_snapshot.cost_results and run_snapshot.cepci == cepci_options:
+        # 이전 실행과 입력이 같은 장치는 이전 비용 결과를 재사용
+        cost_results = cost_calculator.calculate_costs_incremental(final_devices_to_calc, cepci_options, run_snapshot.costed_devices, run_snapshot.cost_results)
+        print(f"비용 재계산 장치: {len(cost_results['recalculated'])}개 / 전체 {len(final_devices_to_calc)}개")
+    else:
+        cost_results = cost_calculator.calculate_all_costs_with_data(final_devices_to_calc, cepci_options)
+    if run_snapshot is not None:
+        run_snapshot.costed_devices = copy.deepcopy(final_devices_to_calc)
+        run_snapshot.cost_results = cost_results["results"]
+        run_snapshot.cepci = cepci_options
+        run_snapshot.save(snapshot_file)
+    if isinstance(all_devices_base, lazy_devices.LazyDeviceList):
+        # 프리뷰/비용 계산 중에 읽은 노드 값을 저장합니다.
+        data_manager.save_node_store()
+    if reuse_archive_results and getattr(config, 'ENABLE_SUMMARY_SIDECAR', False):
+        archive_summary.write_summary(file_path, metadata, extracted_devices, utilities_data, cost_results,
+                                      final_devices_to_calc, cepci_options.target_index,
+                                      digest=cached_summary.digest if cached_summary else None)
 
     # verbosity에 따른 상세 계산 결과(장치비 계산 과정 포함)를 먼저 표시
     def print_verbose_cost_details(cost_results: Dict[str, Any]):
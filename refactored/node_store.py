@@ -0,0 +1,131 @@
+"""
+노드 값 영구 저장소 모듈 (SQLite)
+
+FindNode로 읽은 노드 값(존재 여부, 값, 하위 노드 이름)을 (아카이브 내용 해시, 노드 경로)로 키잉해
+아카이브 캐시 디렉토리의 SQLite 파일에 저장합니다.
+같은 내용의 .bkp를 다시 열면 저장된 값을 한 번의 쿼리로 불러와 노드 스냅샷(extraction_plan.SnapshotTree)으로 쓰므로,
+바뀌지 않은 아카이브의 두 번째 세션은 COM 읽기가 거의 필요 없습니다.
+"""
+
+from typing import Optional, Dict, Callable
+from dataclasses import dataclass, field
+import json
+import os
+import sqlite3
+import time
+
+from extraction_plan import NodeSnapshot, SnapshotTree
+
+# 테이블 형식이 바뀌면 올려서 이전 저장소를 다시 만듭니다 (PRAGMA user_version).
+NODE_STORE_FORMAT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    digest   TEXT NOT NULL,
+    path     TEXT NOT NULL,
+    found    INTEGER NOT NULL,
+    value    TEXT,
+    elements TEXT,
+    PRIMARY KEY (digest, path)
+);
+CREATE TABLE IF NOT EXISTS archives (
+    file_path TEXT PRIMARY KEY,
+    digest    TEXT NOT NULL,
+    saved_at  TEXT NOT NULL
+);
+"""
+
+# =============================================================================
+# 아카이브별 노드 값
+# =============================================================================
+
+@dataclass
+class ArchiveNodes:
+    """
+    한 아카이브(내용 해시)의 노드 값. 저장소에서 불러온 값과 이번 세션에 새로 읽은 값이 values에 함께 쌓입니다.
+    - owner / tree: 연결된 Application의 id와, values 위에서 없는 경로만 라이브로 읽는 SnapshotTree
+    - persist: 시뮬레이션을 다시 실행하면 값이 아카이브 내용과 달라지므로 False가 되어 저장하지 않습니다.
+    """
+    file_path: str
+    digest: str
+    values: Dict[str, NodeSnapshot] = field(default_factory=dict)
+    loaded: int = 0
+    persist: bool = True
+    owner: Optional[int] = None
+    tree: Optional[SnapshotTree] = None
+
+    def invalidate_results(self, is_result_path: Callable[[str], bool]) -> int:
+        """결과 경로 값을 버리고 이후 저장을 중단합니다. 버린 경로 수를 반환합니다."""
+        stale = [path for path in self.values if is_result_path(path)]
+        for path in stale:
+            del self.values[path]
+        self.persist = False
+        return len(stale)
+
+# =============================================================================
+# SQLite 저장소
+# =============================================================================
+
+def _encode_value(value) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+class NodeStore:
+    """(아카이브 내용 해시, 노드 경로) → NodeSnapshot 저장소. 작업마다 연결을 열고 닫습니다."""
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != NODE_STORE_FORMAT_VERSION:
+            conn.executescript("DROP TABLE IF EXISTS nodes; DROP TABLE IF EXISTS archives;")
+            conn.execute(f"PRAGMA user_version = {NODE_STORE_FORMAT_VERSION}")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def load(self, digest: str) -> Dict[str, NodeSnapshot]:
+        """해시에 해당하는 모든 노드 값을 불러옵니다. 저장소를 열 수 없으면 경고 후 빈 딕셔너리"""
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute("SELECT path, found, value, elements FROM nodes WHERE digest = ?", (digest,)).fetchall()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: could not read node store: {e}")
+            return {}
+        values = {}
+        for path, found, value, elements in rows:
+            try:
+                values[path] = NodeSnapshot(bool(found), json.loads(value) if value is not None else None,
+                                            tuple(json.loads(elements)) if elements is not None else None)
+            except ValueError:
+                continue
+        return values
+
+    def save(self, nodes: ArchiveNodes) -> int:
+        """
+        아카이브의 노드 값을 저장하고 저장한 행 수를 반환합니다.
+        같은 경로의 아카이브가 이전에 다른 해시로 저장되어 있었다면(내용 변경), 다른 경로가 쓰지 않는 이전 해시의 행은 지웁니다.
+        """
+        file_path = os.path.abspath(nodes.file_path)
+        rows = [(nodes.digest, path, int(snapshot.found),
+                 _encode_value(snapshot.value) if snapshot.value is not None else None,
+                 json.dumps(list(snapshot.elements), ensure_ascii=False) if snapshot.elements is not None else None)
+                for path, snapshot in nodes.values.items()]
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    previous = conn.execute("SELECT digest FROM archives WHERE file_path = ?", (file_path,)).fetchone()
+                    conn.execute("INSERT OR REPLACE INTO archives VALUES (?, ?, ?)",
+                                 (file_path, nodes.digest, time.strftime('%Y-%m-%d %H:%M:%S')))
+                    if previous is not None and previous[0] != nodes.digest:
+                        conn.execute("DELETE FROM nodes WHERE digest = ? AND digest NOT IN (SELECT digest FROM archives)", (previous[0],))
+                    conn.executemany("INSERT OR REPLACE INTO nodes VALUES (?, ?, ?, ?, ?)", rows)
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: could not write node store: {e}")
+            return 0
+        return len(rows)
@@ -0,0 +1,173 @@
+"""
+스트림 결과 컬럼 테이블 모듈
+
+.bkp 아카이브의 결과 요약 섹션에서 모든 물질 스트림의 RES_STR 레코드를 한 번에 읽어
+스트림 이름 인덱스와 온도/압력/부피유량 NumPy 벡터(단위 포함)로 구성합니다.
+아카이브를 읽을 수 없으면 라이브 트리에서 필요한 스트림/컬럼만 한 번씩 읽어 같은 테이블을 만들 수 있습니다(build_stream_table).
+용기/반응기/히터 계산에서 스트림 값을 COM 왕복 없이 인덱스로 조회할 수 있습니다.
+"""
+
+from typing import Optional, Dict, List, Iterable, Tuple, Callable
+import numpy as np
+
+import bkp_reader
+import bkp_tree
+import unit_converter
+
+# =============================================================================
+# 컬럼 정의
+# =============================================================================
+
+# 컬럼 이름(= COM Output 노드 이름) → 단위 타입
+STREAM_COLUMNS = {
+    'RES_TEMP': 'TEMPERATURE',
+    'RES_PRES': 'PRESSURE',
+    'RES_VOLFLOW': 'VOLUME-FLOW',
+}
+
+_STREAM_RECORD = ('MATERIAL', 'RES_STR')
+
+# =============================================================================
+# 테이블
+# =============================================================================
+
+class StreamTable:
+    """
+    스트림 결과 컬럼 테이블
+    - names: 스트림 이름 배열, index: 이름 → 행 번호
+    - columns: {컬럼: float64 벡터 (값 없음은 NaN)}, units: {컬럼: 단위 문자열 (None이면 모름: 단위를 지정한 조회는 NaN)}
+    - loaded: {컬럼: bool 벡터} 읽은 칸 표시 (None이면 모든 칸을 읽은 테이블). 읽지 않은 칸은 has()가 False입니다.
+    """
+    def __init__(self, names: List[str], columns: Dict[str, np.ndarray], units: Dict[str, Optional[str]],
+                 loaded: Optional[Dict[str, np.ndarray]] = None):
+        self.names = np.array(names, dtype=object)
+        self.index = {name: i for i, name in enumerate(names)}
+        self.columns = columns
+        self.units = units
+        self.loaded = loaded
+        self._converted: Dict[Tuple[str, str], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def has(self, name: str, column: str) -> bool:
+        """스트림 name의 column 칸을 읽었는지 (값이 없어 NaN인 칸도 읽은 것으로 봅니다)"""
+        i = self.index.get(name)
+        if i is None:
+            return False
+        return self.loaded is None or bool(self.loaded[column][i])
+
+    def column(self, column: str, unit: Optional[str] = None) -> np.ndarray:
+        """
+        컬럼 벡터. unit이 저장 단위와 다르면 변환한 벡터를 (단위별로 한 번만 계산해) 반환합니다.
+        unit을 지정했는데 저장 단위를 모르거나 변환할 수 없으면 모든 값이 NaN입니다.
+        """
+        values = self.columns[column]
+        stored_unit = self.units.get(column)
+        if unit is None or unit == stored_unit:
+            return values
+        if stored_unit is None:
+            # 저장 단위를 모르면 요청한 단위의 값이라고 할 수 없으므로 값 없음(NaN)으로 돌려줍니다.
+            return np.full(len(values), np.nan)
+        key = (column, unit)
+        if key not in self._converted:
+            # 단위 변환은 모두 1차(affine) 변환이므로 0과 1의 변환값으로 벡터 전체를 변환합니다.
+            unit_type = STREAM_COLUMNS[column]
+            offset = unit_converter.convert_units(0.0, stored_unit, unit, unit_type)
+            one = unit_converter.convert_units(1.0, stored_unit, unit, unit_type)
+            if offset is None or one is None:
+                return np.full(len(values), np.nan)
+            self._converted[key] = values * (one - offset) + offset
+        return self._converted[key]
+
+    def indices(self, names: Iterable[str]) -> np.ndarray:
+        """테이블에 있는 스트림들의 행 번호 (없는 이름은 제외)"""
+        return np.array([self.index[name] for name in names if name in self.index], dtype=np.intp)
+
+    def value(self, name: str, column: str, unit: Optional[str] = None) -> Optional[float]:
+        """스트림 하나의 값. 스트림이 없거나 값이 없으면 None"""
+        i = self.index.get(name)
+        if i is None:
+            return None
+        value = self.column(column, unit)[i]
+        return None if np.isnan(value) else float(value)
+
+    def max_value(self, names: Iterable[str], column: str, unit: Optional[str] = None) -> Optional[float]:
+        """여러 스트림 값 중 최댓값 (값이 하나도 없으면 None)"""
+        idx = self.indices(names)
+        if idx.size == 0:
+            return None
+        values = self.column(column, unit)[idx]
+        if np.all(np.isnan(values)):
+            return None
+        return float(np.nanmax(values))
+
+# =============================================================================
+# 아카이브에서 로드
+# =============================================================================
+
+def load_stream_table(file_path: str) -> StreamTable:
+    """
+    아카이브의 결과 섹션에서 모든 물질 스트림의 RES_STR 레코드를 읽어 StreamTable을 만듭니다.
+    컬럼 단위는 처음 단위를 알 수 있는 값의 단위이고, 단위 코드를 해석할 수 없는 값은 NaN으로 둡니다.
+    """
+    variables = bkp_tree.RESULT_VARIABLES[_STREAM_RECORD]
+    wanted = {prop_id: name for prop_id, name in variables.items() if name in STREAM_COLUMNS}
+
+    names: List[str] = []
+    rows: Dict[str, List[float]] = {column: [] for column in STREAM_COLUMNS}
+    units: Dict[str, Optional[str]] = {column: None for column in STREAM_COLUMNS}
+    with bkp_reader.BkpArchive(file_path) as archive:
+        for stream in archive.stream_names():
+            row: Dict[str, float] = {}
+            found = False
+            for record in archive.result_records('stream', stream, (_STREAM_RECORD[1],)):
+                if (record.model, record.variable) != _STREAM_RECORD:
+                    continue
+                found = True
+                for field in record.fields:
+                    column = wanted.get(field.prop_id)
+                    if column is None or field.index is not None or not isinstance(field.value, (int, float)):
+                        continue
+                    unit = bkp_tree.unit_string(field.unit_type, field.unit_code)
+                    if unit is None:
+                        continue  # 단위를 알 수 없는 값은 다른 칸과 같은 단위로 볼 수 없어 비워 둡니다 (NaN).
+                    value = float(field.value)
+                    if units[column] is None:
+                        units[column] = unit
+                    elif unit != units[column]:
+                        value = unit_converter.convert_units(value, unit, units[column], STREAM_COLUMNS[column])
+                    if value is not None:
+                        row[column] = value
+            if not found:
+                continue
+            names.append(stream)
+            for column in STREAM_COLUMNS:
+                rows[column].append(row.get(column, np.nan))
+
+    columns = {column: np.array(values, dtype=np.float64) for column, values in rows.items()}
+    return StreamTable(names, columns, units)
+
+# =============================================================================
+# 트리에서 로드
+# =============================================================================
+
+def build_stream_table(stream_columns: Dict[str, Iterable[str]], read_value: Callable[[str, str], Optional[float]],
+                       units: Dict[str, Optional[str]]) -> StreamTable:
+    """
+    {스트림: 필요한 컬럼들}의 각 칸을 read_value(스트림, 컬럼)으로 한 번씩 읽어 StreamTable을 만듭니다.
+    read_value는 units 단위의 값(없으면 None)을 돌려줍니다. 요청하지 않은 칸은 loaded가 False입니다.
+    """
+    names = list(stream_columns)
+    columns = {column: np.full(len(names), np.nan) for column in STREAM_COLUMNS}
+    loaded = {column: np.zeros(len(names), dtype=bool) for column in STREAM_COLUMNS}
+    for i, stream in enumerate(names):
+        for column in stream_columns[stream]:
+            value = read_value(stream, column)
+            loaded[column][i] = True
+            if value is not None:
+                columns[column][i] = float(value)
+    return StreamTable(names, columns, {column: units.get(column) for column in STREAM_COLUMNS}, loaded)
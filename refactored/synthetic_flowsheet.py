@@ -0,0 +1,391 @@
+"""
+합성 플로우시트 생성 모듈
+
+실제 아카이브보다 훨씬 큰(1만~10만 블록) 플로우시트에서 파이프라인이 어떻게 동작하는지 보기 위해,
+시드로 재현 가능한 가상의 공정을 만들어 Aspen COM과 같은 \\Data 트리(bkp_tree.BkpNode)로 구성합니다.
+블록은 스트림으로 이어지며(앞 블록의 출구 스트림을 다음 블록이 입구로 받음), 스트림 온도/압력/부피유량이
+블록을 지날 때마다 갱신되므로 히터 LMTD, 용기/반응기 부피, 펌프/압축기 압력 판정이 실제처럼 계산됩니다.
+
+- Pump / Compr(압축기, 팬, 터빈) / MCompr(스테이지, 인터쿨러 유틸리티) / Heater(유틸리티) / HeatX
+- Flash / Sep / 반응기(RStoic, RCSTR, RPlug, REquil, RYield) / RadFrac
+- 비용 계산 대상이 아닌 Mixer / FSplit / Valve
+- 스트림 결과(RES_TEMP/RES_PRES/RES_VOLFLOW), 유틸리티 결과, 기본 단위 세트(SI/ENG/MET)
+
+open_synthetic_document로 호출마다 지연을 넣은 가짜 COM 문서(com_worker.FakeComDocument)를 얻어
+data_manager.extract_all_device_data / cost_calculator.calculate_all_costs_with_data에 그대로 넘길 수 있습니다.
+블록 분류/단위 세트는 .bkp 파일이 없으므로 SyntheticFlowsheet.metadata()(load_archive_metadata와 같은 형태)로 얻습니다.
+"""
+
+from typing import Optional, Dict, List, Any, Tuple
+from dataclasses import dataclass, field
+import math
+import random
+
+import bkp_tree
+import com_worker
+import unit_converter
+
+# 카테고리별 블록 비율 (실제 공정 플로우시트의 대략적인 구성)
+DEFAULT_CATEGORY_MIX = {
+    'Heater': 0.24, 'HeatX': 0.08, 'Pump': 0.12, 'Compr': 0.06, 'MCompr': 0.03,
+    'Flash': 0.08, 'Sep': 0.04,
+    'RStoic': 0.02, 'RCSTR': 0.01, 'RPlug': 0.01, 'REquil': 0.01, 'RYield': 0.01,
+    'RadFrac': 0.04, 'Mixer': 0.10, 'FSplit': 0.06, 'Valve': 0.09,
+}
+
+# 블록 이름 접두사
+_PREFIXES = {
+    'Heater': 'E', 'HeatX': 'HX', 'Pump': 'P', 'Compr': 'K', 'MCompr': 'MK', 'Flash': 'F', 'Sep': 'SP',
+    'RStoic': 'R', 'RCSTR': 'R', 'RPlug': 'R', 'REquil': 'R', 'RYield': 'R',
+    'RadFrac': 'T', 'Mixer': 'M', 'FSplit': 'SPL', 'Valve': 'V',
+}
+
+# 유틸리티: 이름 → (입구 온도 K, 출구 온도 K, 입구 압력 bar)
+UTILITIES = {
+    'LPSTEAM': (433.15, 432.15, 6.0),
+    'HPSTEAM': (523.15, 522.15, 40.0),
+    'CW': (303.15, 313.15, 4.0),
+    'REFRIG': (250.15, 255.15, 2.0),
+}
+
+# 생성 중 값의 기준 단위 (트리에는 단위 세트 단위로 변환해 기록)
+_BASE_UNITS = {
+    'TEMPERATURE': 'K', 'PRESSURE': 'bar', 'POWER': 'kW', 'ENTHALPY-FLO': 'kW',
+    'VOLUME-FLOW': 'cum/hr', 'HEAT-TRANS-C': 'Watt/sqm-K',
+}
+
+# 스트림 상태 범위
+MIN_PRESSURE_BAR = 1.0
+MAX_PRESSURE_BAR = 250.0
+MIN_FLOW_CUM_HR = 0.1
+# 입구를 기존 출구 스트림에서 고를 확률과, 고를 때 보는 최근 출구 스트림 수 (작을수록 긴 직렬 공정)
+_CONNECT_PROBABILITY = 0.85
+_RECENT_STREAMS = 20
+# 유량 → 열량 환산 (밀도 800 kg/m³, 비열 2.5 kJ/kg·K 가정): kW = cum/hr × ΔT × _HEAT_CAPACITY
+_HEAT_CAPACITY = 800.0 * 2.5 / 3600.0
+
+# =============================================================================
+# 결과
+# =============================================================================
+
+@dataclass
+class SyntheticFlowsheet:
+    """생성된 플로우시트: \\Data 트리와 블록 분류(block_info), 출력 단위 세트"""
+    tree: bkp_tree.BkpNode
+    block_info: Dict[str, str]
+    unit_set: str
+    unit_types: Dict[str, Optional[str]]
+    stream_names: List[str] = field(default_factory=list)
+    seed: int = 0
+
+    def metadata(self) -> Dict[str, Any]:
+        """load_archive_metadata와 같은 형태 {'block_info', 'unit_set', 'unit_types'}"""
+        return {'block_info': dict(self.block_info), 'unit_set': self.unit_set, 'unit_types': dict(self.unit_types)}
+
+    def category_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for cat in self.block_info.values():
+            counts[cat] = counts.get(cat, 0) + 1
+        return counts
+
+    def document(self) -> bkp_tree.BkpDocument:
+        """트리를 그대로 쓰는 오프라인 문서 (호출 지연 없음)"""
+        document = bkp_tree.BkpDocument()
+        document.Tree = self.tree
+        return document
+
+def open_synthetic_document(flowsheet: SyntheticFlowsheet, latency: float = 0.0) -> com_worker.FakeComDocument:
+    """플로우시트 트리 위의 가짜 COM 문서. 모든 호출(FindNode/Value/Elements)에 latency(초)만큼 지연을 넣습니다."""
+    return com_worker.FakeComDocument(latency, flowsheet.document())
+
+# =============================================================================
+# 생성
+# =============================================================================
+
+class _Builder:
+    """블록을 하나씩 추가하며 스트림 상태 {스트림: [온도 K, 압력 bar, 부피유량 cum/hr]}를 이어 가는 생성기"""
+    def __init__(self, rng: random.Random, unit_set: str):
+        self.rng = rng
+        self.root = bkp_tree.BkpNode('')
+        self.unit_types = _write_setup(self.root, unit_set)
+        data = self.root.child('Data')
+        self.blocks = data.child('Blocks')
+        self.streams = data.child('Streams')
+        self.utilities = data.child('Utilities')
+        self.state: Dict[str, List[float]] = {}
+        self.open_streams: List[str] = []
+        self.block_info: Dict[str, str] = {}
+
+    # --- 값 기록 ---
+
+    def _convert(self, value: float, unit_type: str) -> Tuple[float, Optional[str]]:
+        unit = self.unit_types.get(unit_type)
+        base = _BASE_UNITS[unit_type]
+        if unit is None or unit == base:
+            return value, unit
+        return unit_converter.convert_units(value, base, unit, unit_type), unit
+
+    def put(self, node: bkp_tree.BkpNode, path: str, value: float, unit_type: str) -> None:
+        converted, unit = self._convert(value, unit_type)
+        node.set(path, round(converted, 6), unit)
+
+    def put_delta_temperature(self, node: bkp_tree.BkpNode, path: str, value_k: float) -> None:
+        """온도 차(K)를 현재 온도 단위의 차로 기록합니다 (F/R이면 1.8배)."""
+        unit = self.unit_types.get('TEMPERATURE')
+        node.set(path, round(value_k * 1.8 if unit in ('F', 'R') else value_k, 6), unit)
+
+    # --- 스트림 ---
+
+    def new_stream(self, temperature: float, pressure: float, flow: float) -> str:
+        name = f"S{len(self.state) + 1}"
+        self.state[name] = [min(max(temperature, 200.0), 900.0),
+                            min(max(pressure, MIN_PRESSURE_BAR), MAX_PRESSURE_BAR), max(flow, MIN_FLOW_CUM_HR)]
+        return name
+
+    def feed(self) -> str:
+        rng = self.rng
+        return self.new_stream(rng.uniform(290.0, 350.0), rng.uniform(1.0, 5.0),
+                               min(max(rng.lognormvariate(math.log(40.0), 0.8), 2.0), 400.0))
+
+    def take_inlet(self) -> str:
+        """최근 출구 스트림 중 하나를 입구로 가져오거나(연결), 새 원료 스트림을 만듭니다."""
+        if self.open_streams and self.rng.random() < _CONNECT_PROBABILITY:
+            i = self.rng.randrange(max(0, len(self.open_streams) - _RECENT_STREAMS), len(self.open_streams))
+            self.open_streams[i], self.open_streams[-1] = self.open_streams[-1], self.open_streams[i]
+            return self.open_streams.pop()
+        return self.feed()
+
+    def connect(self, block: bkp_tree.BkpNode, inlets: List[str], outlets: List[str], product: bool = False) -> None:
+        """Connections 라벨을 기록하고 출구 스트림을 다음 블록들이 받을 수 있게 둡니다 (product면 제품으로 끝남)."""
+        connections = block.child('Connections')
+        for name in inlets:
+            connections.set(name, 'F(IN)')
+        for name in outlets:
+            connections.set(name, 'P(OUT)')
+        if not product:
+            self.open_streams.extend(outlets)
+
+    def write_streams(self) -> None:
+        for name, (temperature, pressure, flow) in self.state.items():
+            node = self.streams.child(name)
+            self.put(node, 'Output\\RES_TEMP', temperature, 'TEMPERATURE')
+            self.put(node, 'Output\\RES_PRES', pressure, 'PRESSURE')
+            self.put(node, 'Output\\RES_VOLFLOW', flow, 'VOLUME-FLOW')
+
+    def write_utilities(self) -> None:
+        for name, (inlet_t, outlet_t, inlet_p) in UTILITIES.items():
+            node = self.utilities.child(name)
+            self.put(node, 'Output\\UTL_IN_TEMP', inlet_t, 'TEMPERATURE')
+            self.put(node, 'Output\\UTL_OUT_TEMP', outlet_t, 'TEMPERATURE')
+            self.put(node, 'Output\\UTL_IN_PRES', inlet_p, 'PRESSURE')
+
+    # --- 블록 ---
+
+    def add_block(self, index: int, cat: str) -> None:
+        name = f"{_PREFIXES[cat]}{index + 1}"
+        self.block_info[name] = cat
+        block = self.blocks.child(name)
+        if cat in ('RStoic', 'RCSTR', 'RPlug', 'REquil', 'RYield'):
+            self._reactor(block)
+        else:
+            getattr(self, f"_{cat.lower()}")(block)
+
+    def _pump(self, block):
+        rng = self.rng
+        inlet = self.take_inlet()
+        t, p, flow = self.state[inlet]
+        # 고압 스트림은 압력 상승을 작게
+        rise = rng.uniform(1.0, 5.0) if p > 150.0 else rng.uniform(2.0, 25.0)
+        power = flow / 3600.0 * rise * 100.0 / rng.uniform(0.55, 0.8)
+        outlet = self.new_stream(t + 0.5, p + rise, flow)
+        # 펌프의 IN_PRES는 압력 상승분(data_manager가 POC - IN_PRES로 입구 압력을 구함)
+        self.put(block, 'Output\\WNET', power, 'POWER')
+        self.put(block, 'Output\\IN_PRES', rise, 'PRESSURE')
+        self.put(block, 'Output\\POC', self.state[outlet][1], 'PRESSURE')
+        self.put(block, 'Output\\FEED_VFLOW', flow, 'VOLUME-FLOW')
+        self.connect(block, [inlet], [outlet])
+
+    def _compr(self, block):
+        rng = self.rng
+        kind = rng.random()
+        if kind < 0.07:
+            # 팬: 공기 흡입(새 원료) → 제품 (압력 상승 0.16 bar 이하)
+            inlet = self.new_stream(rng.uniform(285.0, 305.0), 1.01325, rng.uniform(1.5, 60.0) * 3600.0)
+            t, p, flow = self.state[inlet]
+            rise = rng.uniform(0.02, 0.15)
+            outlet = self.new_stream(t + 2.0, p + rise, flow)
+            power = flow / 3600.0 * rise * 100.0 / 0.7
+            product = True
+        else:
+            inlet = self.take_inlet()
+            t, p, flow = self.state[inlet]
+            product = False
+            if (kind < 0.12 and p >= 2.0) or p > 150.0:
+                # 터빈: 팽창, WNET 음수
+                ratio = min(rng.uniform(1.5, 4.0), p / MIN_PRESSURE_BAR)
+                outlet = self.new_stream(t / ratio ** 0.25, p / ratio, flow * ratio)
+                power = -rng.uniform(100.0, 1400.0)
+            else:
+                ratio = min(rng.uniform(1.5, 3.5), MAX_PRESSURE_BAR / p)
+                outlet = self.new_stream(t * ratio ** 0.25, p * ratio, flow / ratio)
+                power = rng.uniform(450.0, 2800.0)
+        self.put(block, 'Output\\WNET', power, 'POWER')
+        self.put(block, 'Output\\IN_PRES', self.state[inlet][1], 'PRESSURE')
+        self.put(block, 'Output\\POC', self.state[outlet][1], 'PRESSURE')
+        self.put(block, 'Output\\FEED_VFLOW', self.state[inlet][2], 'VOLUME-FLOW')
+        self.connect(block, [inlet], [outlet], product)
+
+    def _mcompr(self, block):
+        rng = self.rng
+        inlet = self.take_inlet()
+        t, p, flow = self.state[inlet]
+        stages = rng.randint(2, 4)
+        ratio = max(min(rng.uniform(1.8, 3.0), (MAX_PRESSURE_BAR / p) ** (1.0 / stages)), 1.1)
+        suction_t, pressure, total_power = t, p, 0.0
+        for stage in range(1, stages + 1):
+            pressure *= ratio
+            discharge_t = max(suction_t * ratio ** 0.286, 340.0)
+            cool_t = rng.uniform(315.0, 322.0)
+            power = rng.uniform(450.0, 2500.0)
+            total_power += power
+            self.put(block, f'Output\\B_PRES\\{stage}', pressure, 'PRESSURE')
+            self.put(block, f'Output\\B_TEMP\\{stage}', discharge_t, 'TEMPERATURE')
+            self.put(block, f'Output\\BRAKE_POWER\\{stage}', power, 'POWER')
+            self.put(block, f'Output\\COOL_TEMP\\{stage}', cool_t, 'TEMPERATURE')
+            self.put(block, f'Output\\QCALC\\{stage}', -power * rng.uniform(0.6, 0.9), 'ENTHALPY-FLO')
+            block.set(f'Input\\COOLER_UTL\\{stage}', 'CW')
+            suction_t = cool_t
+        self.put(block, 'Output\\WNET', total_power, 'POWER')
+        outlet = self.new_stream(suction_t, pressure, flow / ratio ** stages)
+        self.connect(block, [inlet], [outlet])
+
+    def _heater(self, block):
+        rng = self.rng
+        inlet = self.take_inlet()
+        t, p, flow = self.state[inlet]
+        heating = t < 400.0 and rng.random() < 0.6 or t < 318.0
+        if heating:
+            target = t + rng.uniform(10.0, 80.0)
+            utility = 'LPSTEAM' if target < UTILITIES['LPSTEAM'][1] - 10.0 else 'HPSTEAM'
+            outlet_t = min(target, UTILITIES[utility][1] - 10.0)
+        elif t > 330.0:
+            utility = 'CW'
+            outlet_t = max(t - rng.uniform(10.0, 100.0), 318.0)
+        else:
+            utility = 'REFRIG'
+            outlet_t = max(t - rng.uniform(5.0, 30.0), 265.0)
+        outlet = self.new_stream(outlet_t, p - rng.uniform(0.0, 0.3), flow)
+        outlet_t, outlet_p = self.state[outlet][:2]
+        self.put(block, 'Output\\QCALC', flow * (outlet_t - t) * _HEAT_CAPACITY, 'ENTHALPY-FLO')
+        self.put(block, 'Output\\B_TEMP', outlet_t, 'TEMPERATURE')
+        self.put(block, 'Output\\B_PRES', outlet_p, 'PRESSURE')
+        block.set('Input\\UTILITY_ID', utility)
+        block.set('Output\\UTL_ID', utility)
+        self.connect(block, [inlet], [outlet])
+
+    def _heatx(self, block):
+        rng = self.rng
+        first, second = self.take_inlet(), self.take_inlet()
+        hot, cold = (first, second) if self.state[first][0] >= self.state[second][0] else (second, first)
+        hot_t, hot_p, hot_flow = self.state[hot]
+        cold_t, cold_p, cold_flow = self.state[cold]
+        approach = max(hot_t - cold_t, 10.0)
+        duty = min(hot_flow, cold_flow) * _HEAT_CAPACITY * approach * rng.uniform(0.3, 0.7)
+        hot_out = self.new_stream(max(hot_t - duty / (hot_flow * _HEAT_CAPACITY), cold_t + 5.0), hot_p - rng.uniform(0.0, 0.5), hot_flow)
+        cold_out = self.new_stream(min(cold_t + duty / (cold_flow * _HEAT_CAPACITY), hot_t - 5.0), cold_p - rng.uniform(0.0, 0.5), cold_flow)
+        self.put(block, 'Output\\HX_DUTY', max(duty, 1.0), 'ENTHALPY-FLO')
+        self.put_delta_temperature(block, 'Output\\HX_DTLM', max(approach * rng.uniform(0.3, 0.6), 5.0))
+        self.put(block, 'Output\\HOT_PRES', hot_p, 'PRESSURE')
+        self.put(block, 'Output\\COLD_PRES', cold_p, 'PRESSURE')
+        self.put(block, 'Input\\U', rng.uniform(300.0, 1000.0), 'HEAT-TRANS-C')
+        self.connect(block, [hot, cold], [hot_out, cold_out])
+
+    def _split(self, block, vapor_scale: float = 1.0):
+        """입구 하나를 두 출구로 나눕니다 (Flash/Sep/FSplit). vapor_scale: 첫 출구(기상)의 부피 팽창"""
+        inlet = self.take_inlet()
+        t, p, flow = self.state[inlet]
+        fraction = self.rng.uniform(0.1, 0.9)
+        outlets = [self.new_stream(t, p, flow * fraction * vapor_scale), self.new_stream(t, p, flow * (1.0 - fraction))]
+        self.connect(block, [inlet], outlets)
+
+    def _flash(self, block):
+        self._split(block, vapor_scale=self.rng.uniform(1.0, 3.0))
+
+    def _sep(self, block):
+        self._split(block)
+
+    def _fsplit(self, block):
+        self._split(block)
+
+    def _reactor(self, block):
+        rng = self.rng
+        inlet = self.take_inlet()
+        t, p, flow = self.state[inlet]
+        outlet = self.new_stream(max(t + rng.uniform(-20.0, 80.0), 280.0), p - rng.uniform(0.0, 1.0), flow)
+        outlet_t = self.state[outlet][0]
+        self.put(block, 'Output\\QCALC', flow * (outlet_t - t) * _HEAT_CAPACITY, 'ENTHALPY-FLO')
+        self.put(block, 'Output\\B_TEMP', outlet_t, 'TEMPERATURE')
+        self.put(block, 'Output\\R_PRES', p, 'PRESSURE')
+        self.connect(block, [inlet], [outlet])
+
+    def _radfrac(self, block):
+        inlet = self.take_inlet()
+        t, p, flow = self.state[inlet]
+        fraction = self.rng.uniform(0.2, 0.8)
+        outlets = [self.new_stream(t - 20.0, p, flow * fraction), self.new_stream(t + 30.0, p + 0.2, flow * (1.0 - fraction))]
+        self.connect(block, [inlet], outlets)
+
+    def _mixer(self, block):
+        inlets = [self.take_inlet(), self.take_inlet()]
+        flows = [self.state[name][2] for name in inlets]
+        total = sum(flows)
+        t = sum(self.state[name][0] * f for name, f in zip(inlets, flows)) / total
+        outlet = self.new_stream(t, min(self.state[name][1] for name in inlets), total)
+        self.connect(block, inlets, [outlet])
+
+    def _valve(self, block):
+        inlet = self.take_inlet()
+        t, p, flow = self.state[inlet]
+        ratio = self.rng.uniform(0.3, 0.9)
+        outlet = self.new_stream(t - 2.0, p * ratio, flow)
+        self.connect(block, [inlet], [outlet])
+
+def _write_setup(root: bkp_tree.BkpNode, unit_set: str) -> Dict[str, Optional[str]]:
+    """Setup\\Global\\Input(INSET/OUTSET)과 기본 단위 세트들의 Unit-Types를 기록하고 unit_set의 {단위 타입: 단위}를 반환합니다."""
+    setup = root.child('Data').child('Setup')
+    setup.set('Global\\Input\\INSET', unit_set)
+    setup.set('Global\\Input\\OUTSET', unit_set)
+    selected: Dict[str, Optional[str]] = {}
+    for set_name, code in bkp_tree.BUILTIN_UNIT_SETS.items():
+        unit_types = setup.child('Units-Sets').child(set_name).child('Unit-Types')
+        for unit_type in bkp_tree.UNIT_TYPE_POSITIONS:
+            unit = bkp_tree.UNIT_CODES[unit_type].get(code)
+            if unit is not None:
+                unit_types.set(unit_type, unit)
+            if set_name == unit_set:
+                selected[unit_type] = unit
+    return selected
+
+def generate_flowsheet(n_blocks: int, seed: int = 0, unit_set: str = 'SI',
+                       mix: Optional[Dict[str, float]] = None) -> SyntheticFlowsheet:
+    """
+    블록 n_blocks개짜리 합성 플로우시트를 만듭니다. 같은 (n_blocks, seed, unit_set, mix)면 같은 트리입니다.
+    - unit_set: 출력 단위 세트 (bkp_tree.BUILTIN_UNIT_SETS 중 하나). 모든 결과 값은 이 세트 단위로 기록됩니다.
+    - mix: {카테고리: 비율} (기본 DEFAULT_CATEGORY_MIX)
+    """
+    if unit_set not in bkp_tree.BUILTIN_UNIT_SETS:
+        raise ValueError(f"unit_set must be one of {', '.join(bkp_tree.BUILTIN_UNIT_SETS)}: {unit_set}")
+    mix = mix or DEFAULT_CATEGORY_MIX
+    unknown = set(mix) - set(_PREFIXES)
+    if unknown:
+        raise ValueError(f"unsupported categories in mix: {', '.join(sorted(unknown))}")
+
+    rng = random.Random(seed)
+    categories = list(mix)
+    weights = [mix[cat] for cat in categories]
+    builder = _Builder(rng, unit_set)
+    for index, cat in enumerate(rng.choices(categories, weights, k=n_blocks)):
+        builder.add_block(index, cat)
+    builder.write_streams()
+    builder.write_utilities()
+    return SyntheticFlowsheet(builder.root, builder.block_info, unit_set, builder.unit_types, list(builder.state), seed)
@@ -0,0 +1,44 @@
+"""archive_cache / data_manager.load_archive_metadata 테스트"""
+
+import os
+import shutil
+
+import pytest
+
+import bkp_tree
+import config
+import data_manager
+from conftest import CountingDocument
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'ENABLE_ARCHIVE_CACHE', True)
+    monkeypatch.setattr(config, 'ENABLE_NODE_STORE', False)
+    path = tmp_path / "case.bkp"
+    shutil.copyfile(os.path.join(HERE, "MIX_HEFA_20250716_after_HI_v1.bkp"), path)
+    data_manager.clear_aspen_cache()
+    yield str(path)
+    data_manager.clear_aspen_cache()
+
+def test_cold_reads_tree_and_warm_does_not(archive):
+    document = CountingDocument(bkp_tree.open_document(archive))
+    cold = data_manager.load_archive_metadata(document, archive)
+    assert document.calls > 0
+    assert cold['unit_set'] == 'FORHI'
+
+    data_manager.clear_aspen_cache()
+    document.calls = 0
+    assert data_manager.load_archive_metadata(document, archive) == cold
+    assert document.calls == 0
+
+def test_changed_archive_is_read_again(archive):
+    document = CountingDocument(bkp_tree.open_document(archive))
+    data_manager.load_archive_metadata(document, archive)
+    with open(archive, 'ab') as f:
+        f.write(b'\r\n')
+    data_manager.clear_aspen_cache()
+    document.calls = 0
+    data_manager.load_archive_metadata(document, archive)
+    assert document.calls > 0
@@ -0,0 +1,37 @@
+"""bkp_reader 블록 레코드 인덱스 테스트"""
+
+import os
+
+import bkp_reader
+import data_manager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+_HEADER = 'MM "41.0" FLAVOR "NO" VERSION "41.0" DATETIME "Mon Sep  1 19:59:17 2025"\r\n'
+
+def _write_archive(tmp_path, records: str) -> str:
+    path = tmp_path / "case.bkp"
+    path.write_bytes((_HEADER + records + '? SETUP MAIN ? \\ "RUN-CLASS" RUN-CLASS = FLOWSHEET \\\r\n').encode())
+    return str(path)
+
+def test_category_found_on_later_record_line(tmp_path):
+    # 모델 타입이 이름 바로 다음 줄이 아니라 레코드의 뒤쪽 줄에 있는 경우
+    path = _write_archive(tmp_path,
+                          '>VERSION 0\r\nB1\r\nPump\r\nBuilt-In\r\nPUMP\r\n'
+                          '>VERSION 0\r\nB2\r\nUserModel\r\nBuilt-In\r\nHeater\r\n'
+                          '>VERSION 0\r\nB3\r\nCustom\r\nBuilt-In\r\nCUSTOM\r\n')
+    categories = bkp_reader.index_block_categories(path, data_manager.BKP_BLOCK_CATEGORIES)
+    assert categories == {'B1': 'Pump', 'B2': 'Heater'}
+    assert data_manager.parse_bkp_file_for_blocks(path, ['B1', 'B2', 'B3']) == {'B1': 'Pump', 'B2': 'Heater', 'B3': 'Unknown'}
+
+def test_record_scan_stops_at_next_record(tmp_path):
+    # 짧은 레코드 다음 레코드의 줄을 앞 블록의 카테고리로 읽지 않습니다.
+    path = _write_archive(tmp_path, '>VERSION 0\r\nB1\r\nCustom\r\n>VERSION 0\r\nB2\r\nFlash\r\nBuilt-In\r\nFLASH\r\n')
+    assert bkp_reader.index_block_categories(path, data_manager.BKP_BLOCK_CATEGORIES) == {'B2': 'Flash'}
+    assert bkp_reader.read_header(path).block_types == {'B1': 'Custom', 'B2': 'Flash'}
+
+def test_index_matches_sample_archive():
+    path = os.path.join(HERE, "MIX_HEFA_20250716_after_HI_v1.bkp")
+    block_types = bkp_reader.index_block_types(path)
+    categories = bkp_reader.index_block_categories(path, data_manager.BKP_BLOCK_CATEGORIES)
+    assert categories == {name: model for name, model in block_types.items() if model in data_manager.BKP_BLOCK_CATEGORIES}
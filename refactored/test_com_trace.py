@@ -0,0 +1,46 @@
+"""com_trace 기록/재생 테스트: 기록한 트레이스만으로 같은 추출 결과를 재현"""
+
+import os
+
+import pytest
+
+import bkp_tree
+import com_trace
+import config
+import data_manager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_BKP = os.path.join(HERE, "MIX_HEFA_20250716_after_HI_v1.bkp")
+
+@pytest.fixture(autouse=True)
+def live_reads(monkeypatch):
+    for flag in ('USE_STREAM_TABLE', 'ENABLE_NODE_STORE', 'ENABLE_ARCHIVE_CACHE'):
+        monkeypatch.setattr(config, flag, False)
+    data_manager.clear_aspen_cache()
+    yield
+    data_manager.clear_aspen_cache()
+
+def _extract(Application):
+    data_manager.clear_aspen_cache()
+    metadata = data_manager.load_archive_metadata(Application, SAMPLE_BKP)
+    devices = data_manager.extract_all_device_data(Application, metadata['block_info'], metadata['unit_set'], metadata['unit_types'])
+    return metadata, devices, data_manager.extract_all_utility_data(Application, metadata['unit_types'])
+
+def test_replay_reproduces_recorded_extraction(tmp_path):
+    trace_path = str(tmp_path / "case.trace.json.gz")
+    recording = com_trace.RecordingDocument(bkp_tree.open_document(SAMPLE_BKP), trace_path, 'case.bkp')
+    recorded = _extract(recording)
+    assert recording.save() > 0
+
+    replay = com_trace.open_replay(trace_path, strict=True)
+    assert _extract(replay) == recorded
+    assert not replay.missing
+
+def test_replay_reports_accesses_missing_from_trace(tmp_path):
+    trace_path = str(tmp_path / "case.trace.json.gz")
+    com_trace.ComTrace('case.bkp').save(trace_path)
+    replay = com_trace.open_replay(trace_path)
+    assert replay.Tree.FindNode("\\Data\\Blocks") is None
+    assert replay.missing[('FindNode', "\\Data\\Blocks")] == 1
+    with pytest.raises(com_trace.TraceMissError):
+        com_trace.open_replay(trace_path, strict=True).Tree.FindNode("\\Data\\Blocks")
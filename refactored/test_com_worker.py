@@ -0,0 +1,67 @@
+"""com_worker 스레드 소유 / com_profiler 호출 함수 기록 테스트"""
+
+import os
+import threading
+
+import pytest
+
+import com_profiler
+import com_worker
+import config
+import data_manager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_BKP = os.path.join(HERE, "MIX_HEFA_20250716_after_HI_v1.bkp")
+BLOCKS = "\\Data\\Blocks"
+
+def _in_thread(fn):
+    result = {}
+    def run():
+        try:
+            result['value'] = fn()
+        except Exception as e:
+            result['error'] = e
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    return result
+
+@pytest.fixture
+def clean_cache(monkeypatch):
+    for flag in ('USE_STREAM_TABLE', 'ENABLE_NODE_STORE', 'ENABLE_ARCHIVE_CACHE'):
+        monkeypatch.setattr(config, flag, False)
+    data_manager.clear_aspen_cache()
+    yield
+    data_manager.clear_aspen_cache()
+
+def test_fake_document_rejects_other_threads():
+    document = com_worker.open_fake_document(SAMPLE_BKP)
+    assert document.Tree.FindNode(BLOCKS) is not None
+    result = _in_thread(lambda: document.Tree.FindNode(BLOCKS))
+    assert isinstance(result['error'], com_worker.WrongThreadError)
+
+def test_worker_document_serves_other_threads():
+    document = com_worker.open_worker_document(lambda: com_worker.open_fake_document(SAMPLE_BKP)).wait_ready()
+    try:
+        names = [node.Name for node in document.Tree.FindNode(BLOCKS).Elements]
+        assert names
+        result = _in_thread(lambda: [node.Name for node in document.Tree.FindNode(BLOCKS).Elements])
+        assert result == {'value': names}
+    finally:
+        document.Close()
+
+def test_profiler_around_worker_document_records_extraction_callers(clean_cache, monkeypatch):
+    monkeypatch.setattr(config, 'PREFETCH_BLOCK_SUBTREES', True)
+    document = com_worker.open_worker_document(lambda: com_worker.open_fake_document(SAMPLE_BKP)).wait_ready()
+    profiler = com_profiler.ComProfiler()
+    Application = com_profiler.ProfiledDocument(document, profiler)
+    try:
+        metadata = data_manager.load_archive_metadata(Application, SAMPLE_BKP)
+        data_manager.extract_all_device_data(Application, metadata['block_info'], metadata['unit_set'], metadata['unit_types'])
+    finally:
+        document.Close()
+    callers = {access.caller.split('.')[0] for access in profiler.accesses}
+    assert callers <= {'data_manager', 'extraction_plan'}, callers
+    # 워커의 일괄 하위 트리 읽기도 기록됩니다.
+    assert any(access.op == 'Batch' for access in profiler.accesses)
+    assert any(access.caller == 'data_manager._read_raw_value' for access in profiler.accesses)
@@ -0,0 +1,152 @@
+"""data_manager 노드 읽기 테스트 (가짜 트리 사용)"""
+
+import pytest
+
+import com_retry
+import config
+import data_manager
+
+class FakeNode:
+    def __init__(self, tree, path, value=None, children=()):
+        self._tree = tree
+        self._path = path
+        self.Name = path.rsplit('\\', 1)[-1]
+        self._value = value
+        self._children = children
+
+    @property
+    def Value(self):
+        self._tree.value_reads[self._path] = self._tree.value_reads.get(self._path, 0) + 1
+        if self._path in self._tree.failing:
+            raise OSError("RPC server unavailable")
+        return self._value
+
+    @property
+    def Elements(self):
+        return [self._tree.FindNode(f"{self._path}\\{name}") for name in self._children]
+
+class FakeTree:
+    """{경로: 값} 또는 {경로: [하위 이름]} 맵으로 만든 트리. FindNode/Value 호출 수를 경로별로 셉니다."""
+    def __init__(self, values):
+        self.values = values
+        self.failing = set()
+        self.find_calls = {}
+        self.value_reads = {}
+
+    def FindNode(self, path):
+        self.find_calls[path] = self.find_calls.get(path, 0) + 1
+        if path not in self.values:
+            return None
+        value = self.values[path]
+        if isinstance(value, list):
+            return FakeNode(self, path, None, value)
+        return FakeNode(self, path, value)
+
+class FakeDocument:
+    def __init__(self, values):
+        self.Tree = FakeTree(values)
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(config, 'ENABLE_NODE_STORE', False)
+    monkeypatch.setattr(data_manager, '_com_policy', com_retry.RetryPolicy(max_attempts=2, backoff=0, max_interval=0))
+    data_manager.clear_aspen_cache()
+    yield
+    data_manager.clear_aspen_cache()
+
+OUTPUT = "\\Data\\Blocks\\P1\\Output\\WNET"
+INPUT = "\\Data\\Blocks\\P1\\Input\\U"
+
+def test_node_cache_keeps_values():
+    document = FakeDocument({OUTPUT: 12.5, INPUT: 850.0})
+    for _ in range(3):
+        assert data_manager._read_raw_value(document, OUTPUT) == 12.5
+    assert document.Tree.find_calls[OUTPUT] == 1
+    assert document.Tree.value_reads[OUTPUT] == 1
+    assert data_manager.get_cache_stats()['hits'] == 2
+
+def test_run_generation_rereads_only_results():
+    document = FakeDocument({OUTPUT: 12.5, INPUT: 850.0})
+    data_manager._read_raw_value(document, OUTPUT)
+    data_manager._read_raw_value(document, INPUT)
+    document.Tree.values[OUTPUT] = 20.0
+    data_manager.advance_run_generation()
+    assert data_manager._read_raw_value(document, OUTPUT) == 20.0
+    assert data_manager._read_raw_value(document, INPUT) == 850.0
+    assert document.Tree.value_reads == {OUTPUT: 2, INPUT: 1}
+
+def test_failed_value_read_is_not_cached():
+    document = FakeDocument({OUTPUT: 12.5})
+    document.Tree.failing.add(OUTPUT)
+    with pytest.raises(com_retry.ComReadError):
+        data_manager._read_raw_value(document, OUTPUT)
+    document.Tree.failing.clear()
+    assert data_manager._read_raw_value(document, OUTPUT) == 12.5
+
+class FakeEngine:
+    def __init__(self, document, results):
+        self._document = document
+        self._results = results
+        self.runs = 0
+
+    def Run2(self):
+        self.runs += 1
+        self._document.Tree.values.update(self._results)
+
+def test_run_simulation_rereads_changed_results():
+    document = FakeDocument({OUTPUT: 12.5, INPUT: 850.0})
+    document.Engine = FakeEngine(document, {OUTPUT: 20.0})
+    assert data_manager._read_raw_value(document, OUTPUT) == 12.5
+    generation = data_manager.get_run_generation()
+    assert data_manager.run_simulation(document) == generation + 1
+    assert document.Engine.runs == 1
+    assert data_manager._read_raw_value(document, OUTPUT) == 20.0
+
+def test_run_simulation_without_engine_keeps_cache(capsys):
+    document = FakeDocument({OUTPUT: 12.5})
+    data_manager._read_raw_value(document, OUTPUT)
+    generation = data_manager.get_run_generation()
+    assert data_manager.run_simulation(document) == generation
+    assert "engine not available" in capsys.readouterr().out
+    data_manager._read_raw_value(document, OUTPUT)
+    assert document.Tree.value_reads[OUTPUT] == 1
+
+UTILITY = "\\Data\\Utilities\\CW"
+
+def test_utility_read_failure_is_recorded_separately(capsys):
+    document = FakeDocument({UTILITY: ['Output'], f"{UTILITY}\\Output\\UTL_IN_TEMP": 20.0,
+                             f"{UTILITY}\\Output\\UTL_OUT_TEMP": 25.0})
+    ok = data_manager.get_utility_data(document, 'CW', 'C')
+    assert ok['error'] is None and not ok['com_read_failed']
+    assert ok['outlet_temperature_value'] == 25.0
+
+    data_manager.clear_aspen_cache()
+    document.Tree.failing.add(f"{UTILITY}\\Output\\UTL_OUT_TEMP")
+    failed = data_manager.get_utility_data(document, 'CW', 'C')
+    assert failed['com_read_failed']
+    assert failed['error'].startswith("COM read failed")
+
+    missing = data_manager.get_utility_data(document, 'HPS', 'C')
+    assert missing['error'] and not missing['com_read_failed']
+
+UNIT_TYPES = "\\Data\\Setup\\Units-Sets\\SI\\Unit-Types"
+
+def test_unit_set_reads_device_types_and_falls_back_per_type(capsys):
+    values = {f"{UNIT_TYPES}\\{unit_type}": f"unit-{unit_type}" for unit_type in data_manager.DEVICE_UNIT_TYPES}
+    values[f"{UNIT_TYPES}\\MASS-FLOW"] = 'kg/hr'
+    document = FakeDocument(values)
+    document.Tree.failing.add(f"{UNIT_TYPES}\\PRESSURE")
+    unit_types = data_manager.resolve_unit_set(document, 'SI')
+    assert unit_types['PRESSURE'] is None
+    assert unit_types['TEMPERATURE'] == 'unit-TEMPERATURE'
+    assert set(unit_types) == set(data_manager.DEVICE_UNIT_TYPES)
+    # 장치 추출에 쓰는 타입만 한 번씩 조회합니다.
+    assert set(document.Tree.find_calls) == {f"{UNIT_TYPES}\\{unit_type}" for unit_type in data_manager.DEVICE_UNIT_TYPES}
+    assert "PRESSURE" in capsys.readouterr().out
+
+def test_utility_extraction_survives_unit_set_failure(capsys):
+    outset = "\\Data\\Setup\\Global\\Input\\OUTSET"
+    document = FakeDocument({outset: 'SI'})
+    document.Tree.failing.add(outset)
+    assert data_manager.extract_all_utility_data(document) == []
+    assert "could not read utilities" in capsys.readouterr().out
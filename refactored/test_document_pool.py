@@ -0,0 +1,26 @@
+"""document_pool 워커 수 제한 / 샤딩 / 병합 테스트"""
+
+import os
+
+import config
+import document_pool
+
+BLOCK_INFO = {'B1': 'Heater', 'M1': 'Mixer', 'B2': 'Pump', 'B3': 'Flash', 'V1': 'Valve'}
+
+def test_worker_count_is_capped(monkeypatch):
+    monkeypatch.setattr(config, 'MAX_EXTRACTION_WORKERS', 2)
+    monkeypatch.setattr(config, 'EXTRACTION_WORKERS', None)
+    monkeypatch.setattr(os, 'cpu_count', lambda: 64)
+    assert document_pool.resolve_workers() == 2
+    assert document_pool.resolve_workers(8) == 2
+    assert document_pool.resolve_workers(1) == 1
+    monkeypatch.setattr(config, 'MAX_EXTRACTION_WORKERS', None)
+    assert document_pool.resolve_workers() == 64
+
+def test_shards_keep_order_and_merge_back():
+    shards = document_pool.shard_blocks(BLOCK_INFO, 2)
+    assert sorted(name for shard in shards for name in shard) == sorted(BLOCK_INFO)
+    for shard in shards:
+        assert list(shard) == [name for name in BLOCK_INFO if name in shard]
+    results = [[{'name': name} for name in shard] for shard in reversed(shards)]
+    assert [device['name'] for device in document_pool.merge_devices(BLOCK_INFO, results)] == list(BLOCK_INFO)
@@ -0,0 +1,55 @@
+"""extraction_plan 테스트: 노드 캐시의 경로 중복 제거와 하위 트리 수집 추출 결과"""
+
+import os
+
+import pytest
+
+import bkp_tree
+import config
+import data_manager
+from conftest import CountingDocument
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_BKP = os.path.join(HERE, "MIX_HEFA_20250716_after_HI_v1.bkp")
+
+@pytest.fixture
+def document(monkeypatch):
+    for flag in ('USE_STREAM_TABLE', 'USE_TOPOLOGY_GRAPH', 'ENABLE_NODE_STORE', 'ENABLE_ARCHIVE_CACHE', 'PREFETCH_BLOCK_SUBTREES'):
+        monkeypatch.setattr(config, flag, False)
+    data_manager.clear_aspen_cache()
+    data_manager.clear_stream_table()
+    yield CountingDocument(bkp_tree.open_document(SAMPLE_BKP))
+    data_manager.clear_aspen_cache()
+
+def _extract(document, monkeypatch, prefetch, cache_size):
+    monkeypatch.setattr(config, 'PREFETCH_BLOCK_SUBTREES', prefetch)
+    monkeypatch.setattr(data_manager._aspen_cache, 'max_size', cache_size)
+    data_manager.clear_aspen_cache()
+    metadata = data_manager.load_archive_metadata(document, SAMPLE_BKP)
+    document.calls = 0
+    document.paths.clear()
+    devices = data_manager.extract_all_device_data(document, metadata['block_info'], metadata['unit_set'], metadata['unit_types'])
+    return devices, document.calls
+
+def test_node_cache_reads_each_path_once(document, monkeypatch):
+    uncached, uncached_calls = _extract(document, monkeypatch, False, 0)
+    assert max(document.paths.values()) > 1
+    cached, cached_calls = _extract(document, monkeypatch, False, None)
+    assert cached == uncached
+    assert max(document.paths.values()) == 1
+    assert cached_calls == len(document.paths) < uncached_calls
+
+def test_subtree_prefetch_gives_same_devices(document, monkeypatch):
+    direct, _ = _extract(document, monkeypatch, False, None)
+    prefetched, _ = _extract(document, monkeypatch, True, None)
+    assert prefetched == direct
+def test_topology_graph_gives_same_devices(document, monkeypatch):
+    direct, _ = _extract(document, monkeypatch, False, None)
+    monkeypatch.setattr(config, 'USE_TOPOLOGY_GRAPH', True)
+    data_manager.clear_topology()
+    try:
+        with_graph, _ = _extract(document, monkeypatch, False, None)
+        assert data_manager.get_topology() is not None
+    finally:
+        data_manager.clear_topology()
+    assert with_graph == direct
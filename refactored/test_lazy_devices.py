@@ -0,0 +1,56 @@
+"""lazy_devices 테스트: 지연 추출, deepcopy 사본과 원본의 분리"""
+
+import copy
+import pickle
+
+import lazy_devices
+
+BLOCK_INFO = {'P1': 'Pump', 'M1': 'Mixer', 'H1': 'Heater', 'P2': 'Pump'}
+
+class Extractor:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, block_info):
+        self.batches.append(list(block_info))
+        return [{'name': name, 'category': cat, 'power': float(i)} for i, (name, cat) in enumerate(block_info.items())]
+
+def _devices(readahead=1):
+    extract = Extractor()
+    return lazy_devices.LazyDeviceList(BLOCK_INFO, extract, {'Pump', 'Heater'}, readahead), extract
+
+def test_only_eager_categories_are_extracted_up_front():
+    devices, extract = _devices()
+    assert extract.batches == [['M1']]
+    assert devices[0]['name'] == 'P1' and not devices[0].loaded
+    assert devices[2]['power'] is not None
+    assert extract.batches[-1] == ['H1']
+
+def test_readahead_extracts_following_devices_while_iterating():
+    devices, extract = _devices(readahead=2)
+    [device['power'] for device in devices]
+    assert extract.batches == [['M1'], ['P1', 'H1'], ['P2']]
+
+def test_deepcopy_does_not_extract_and_isolates_overrides():
+    devices, extract = _devices()
+    devices[0]['power']
+    batches = len(extract.batches)
+    clone = copy.deepcopy(devices)
+    assert len(extract.batches) == batches
+    assert not clone[3].loaded
+
+    clone[0]['power'] = 99.0
+    clone[3]['material'] = 'SS'
+    assert devices[0]['power'] != 99.0
+    assert 'material' not in devices[3]
+    # 사본에서 추출한 결과는 원본과 공유하므로 원본에서 다시 추출하지 않습니다.
+    assert extract.batches[-1] == ['P2']
+    assert len(extract.batches) == batches + 1
+    assert devices[3]['power'] == clone[3]['power']
+    assert len(extract.batches) == batches + 1
+
+def test_pickle_saves_plain_records():
+    devices, _ = _devices()
+    restored = pickle.loads(pickle.dumps(devices))
+    assert type(restored) is list and all(type(device) is dict for device in restored)
+    assert restored == devices.materialize()
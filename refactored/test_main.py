@@ -0,0 +1,106 @@
+"""main.py 실행 흐름 테스트 (오프라인 .bkp 백엔드, 입력은 스크립트로 대체)"""
+
+import builtins
+import os
+import shutil
+
+import pytest
+
+import archive_summary
+import bkp_tree
+import config
+import cost_calculator
+import data_manager
+import document_pool
+import main
+from conftest import CountingDocument
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    path = tmp_path / "case.bkp"
+    shutil.copyfile(os.path.join(HERE, "MIX_HEFA_20250716_after_HI_v1.bkp"), path)
+    monkeypatch.setattr(data_manager, 'find_aspen_file', lambda current_dir: str(path))
+    monkeypatch.setattr(config, 'ASPEN_BACKEND', 'bkp')
+    open_document = bkp_tree.open_document
+    monkeypatch.setattr(bkp_tree, 'open_document', lambda file_path: CountingDocument(open_document(file_path)))
+    for flag, value in {'ENABLE_SUMMARY_SIDECAR': True, 'ENABLE_INCREMENTAL_RUN': True, 'ENABLE_NODE_STORE': True,
+                        'ENABLE_ARCHIVE_CACHE': False, 'LAZY_DEVICE_EXTRACTION': False, 'USE_COM_WORKER': False,
+                        'USE_STREAM_TABLE': False, 'RECORD_COM_TRACE': False}.items():
+        monkeypatch.setattr(config, flag, value)
+    CountingDocument.opened = []
+    yield str(path)
+    data_manager.clear_aspen_cache()
+    data_manager.clear_stream_table()
+
+def run_main(monkeypatch, answers, argv=()):
+    answers = iter(answers)
+    monkeypatch.setattr(builtins, 'input', lambda prompt='': next(answers))
+    main.main(list(argv))
+
+# 프롬프트 순서: (요약 사이드카가 있으면 다시 추출 여부), 상세 레벨, 세션 불러오기, 오버라이드 장치, 세션 저장, 계산 진행
+FIRST_RUN = ['0', 'n', '', 'n', 'y']
+
+def test_refresh_reextracts_and_recosts_everything(archive, monkeypatch, capsys):
+    run_main(monkeypatch, FIRST_RUN)
+    first_calls = CountingDocument.opened[-1].calls
+    assert first_calls > 0
+    capsys.readouterr()
+
+    def no_reuse(*args, **kwargs):
+        raise AssertionError("refresh must not reuse previous results")
+    monkeypatch.setattr(data_manager, 'extract_changed_device_data', no_reuse)
+    monkeypatch.setattr(cost_calculator, 'calculate_costs_incremental', no_reuse)
+
+    run_main(monkeypatch, ['y'] + FIRST_RUN)
+    out = capsys.readouterr().out
+    assert "다시 추출할 장치" not in out
+    assert "비용 재계산 장치" not in out
+    # 저장된 노드 값 없이 첫 실행과 같은 만큼 문서를 읽습니다.
+    assert CountingDocument.opened[-1].calls == first_calls
+
+def test_cached_preview_does_not_open_document(archive, monkeypatch):
+    run_main(monkeypatch, FIRST_RUN)
+    opened = len(CountingDocument.opened)
+    run_main(monkeypatch, ['n'] + FIRST_RUN)
+    assert len(CountingDocument.opened) == opened
+
+def test_rerun_runs_engine_and_skips_archive_results(archive, monkeypatch, capsys):
+    run_main(monkeypatch, FIRST_RUN)
+    sidecar = archive_summary.sidecar_path(archive)
+    written = os.stat(sidecar).st_mtime_ns
+    capsys.readouterr()
+
+    runs = []
+    monkeypatch.setattr(data_manager, 'run_simulation', lambda Application: runs.append(Application))
+    # 사이드카 프리뷰 프롬프트 없이 바로 추출합니다.
+    run_main(monkeypatch, FIRST_RUN, ['--rerun'])
+    out = capsys.readouterr().out
+    assert runs == [CountingDocument.opened[-1]]
+    assert "이전 실행 대비" not in out
+    assert os.stat(sidecar).st_mtime_ns == written
+
+def test_profile_refuses_parallel_extraction(archive, monkeypatch, capsys):
+    monkeypatch.setattr(config, 'EXTRACTION_WORKERS', 2)
+    monkeypatch.setattr(config, 'PARALLEL_EXTRACTION_MIN_BLOCKS', 1)
+    pooled = []
+    monkeypatch.setattr(document_pool, 'extract_device_data_parallel', lambda *args, **kwargs: pooled.append(args))
+    run_main(monkeypatch, FIRST_RUN, ['--com-profile'])
+    out = capsys.readouterr().out
+    assert pooled == []
+    assert "parallel extraction does not support --com-profile" in out
+    assert "COM PROFILE" in out and "No COM tree accesses recorded" not in out
+
+def test_lazy_extraction_trace_replays_completely(archive, monkeypatch, capsys):
+    monkeypatch.setattr(config, 'LAZY_DEVICE_EXTRACTION', True)
+    monkeypatch.setattr(config, 'RECORD_COM_TRACE', True)
+    run_main(monkeypatch, FIRST_RUN)
+    assert "COM trace saved" in capsys.readouterr().out
+
+    monkeypatch.setattr(config, 'RECORD_COM_TRACE', False)
+    run_main(monkeypatch, ['y'] + FIRST_RUN, ['--replay-trace'])
+    out = capsys.readouterr().out
+    assert "Replaying COM trace" in out
+    # 프리뷰/비용 계산까지 끝난 뒤에도 트레이스에 없던 접근이 없습니다.
+    assert not data_manager._com_trace_document.missing
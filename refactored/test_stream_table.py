@@ -0,0 +1,46 @@
+"""stream_table 단위 처리 테스트"""
+
+import os
+
+import numpy as np
+
+import bkp_tree
+import stream_table
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_BKP = os.path.join(HERE, "MIX_HEFA_20250716_after_HI_v1.bkp")
+
+def _table(units):
+    columns = {column: np.array([25.0, 100.0]) for column in stream_table.STREAM_COLUMNS}
+    return stream_table.StreamTable(['S1', 'S2'], columns, units)
+
+def test_column_converts_known_unit():
+    table = _table({'RES_TEMP': 'C', 'RES_PRES': 'bar', 'RES_VOLFLOW': 'cum/hr'})
+    assert table.value('S1', 'RES_TEMP', 'K') == 298.15
+    assert table.value('S2', 'RES_TEMP', 'C') == 100.0
+
+def test_unknown_stored_unit_gives_no_value_for_requested_unit():
+    table = _table({'RES_TEMP': None, 'RES_PRES': 'bar', 'RES_VOLFLOW': 'cum/hr'})
+    assert np.all(np.isnan(table.column('RES_TEMP', 'K')))
+    assert table.value('S1', 'RES_TEMP', 'K') is None
+    assert table.max_value(['S1', 'S2'], 'RES_TEMP', 'K') is None
+    # 단위를 지정하지 않으면 저장된 값 그대로
+    assert table.value('S1', 'RES_TEMP') == 25.0
+
+def test_cells_with_unresolved_unit_are_skipped(monkeypatch):
+    expected = stream_table.load_stream_table(SAMPLE_BKP)
+    first = expected.names[0]
+    resolve = bkp_tree.unit_string
+    calls = {'n': 0}
+
+    def unit_string(unit_type, unit_code):
+        # 첫 스트림의 값들(아카이브에서 처음 읽는 칸들)만 단위를 알 수 없게 만듭니다.
+        calls['n'] += 1
+        return None if calls['n'] <= len(stream_table.STREAM_COLUMNS) else resolve(unit_type, unit_code)
+
+    monkeypatch.setattr(bkp_tree, 'unit_string', unit_string)
+    table = stream_table.load_stream_table(SAMPLE_BKP)
+    assert table.units == expected.units
+    assert all(table.value(first, column) is None for column in stream_table.STREAM_COLUMNS)
+    second = expected.names[1]
+    assert table.value(second, 'RES_TEMP', 'K') == expected.value(second, 'RES_TEMP', 'K')
@@ -0,0 +1,86 @@
+"""
+플로우시트 토폴로지 그래프 모듈
+
+블록마다 Connections(\\Data\\Blocks\\<블록>\\Connections\\<스트림> = 'F(IN)', 'P(OUT)', 'HS(OUT)' ...)를 한 번씩 읽어
+블록-스트림 이분 그래프(포트 = 블록, 스트림, 라벨)를 CSR 인접 배열로 구성합니다.
+블록의 연결 스트림/입출구 조회는 차수(degree)만큼만 봅니다.
+"""
+
+from typing import Optional, Dict, List, Iterable, Tuple, Callable
+import numpy as np
+
+# =============================================================================
+# 그래프
+# =============================================================================
+
+class FlowsheetGraph:
+    """
+    블록-스트림 이분 그래프
+    - blocks / streams: 이름 목록, block_index / stream_index: 이름 → 번호
+    - 포트 배열(연결 하나당 한 칸): port_block, port_stream, port_labels(대문자 라벨)
+    - block_ptr: 블록 b의 포트는 block_ptr[b]:block_ptr[b+1] (Connections 순서 유지)
+    """
+    def __init__(self, blocks: List[str], ports: Dict[str, List[Tuple[str, str]]]):
+        self.blocks = list(blocks)
+        self.block_index = {name: i for i, name in enumerate(self.blocks)}
+        self.streams: List[str] = []
+        self.stream_index: Dict[str, int] = {}
+        port_block: List[int] = []
+        port_stream: List[int] = []
+        self.port_labels: List[str] = []
+        block_ptr = [0]
+        for b, block in enumerate(self.blocks):
+            for stream, label in ports.get(block, ()):
+                s = self.stream_index.setdefault(stream, len(self.streams))
+                if s == len(self.streams):
+                    self.streams.append(stream)
+                port_block.append(b)
+                port_stream.append(s)
+                self.port_labels.append(str(label).upper() if label is not None else '')
+            block_ptr.append(len(port_block))
+
+        self.port_block = np.array(port_block, dtype=np.int32)
+        self.port_stream = np.array(port_stream, dtype=np.int32)
+        self.block_ptr = np.array(block_ptr, dtype=np.int32)
+
+    def __contains__(self, block: str) -> bool:
+        return block in self.block_index
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def _block_ports(self, block: str) -> range:
+        b = self.block_index.get(block)
+        if b is None:
+            return range(0)
+        return range(self.block_ptr[b], self.block_ptr[b + 1])
+
+    # --- 블록 기준 조회 ---
+
+    def ports(self, block: str) -> List[Tuple[str, str]]:
+        """블록의 (스트림, 라벨) 목록 (Connections 순서)"""
+        return [(self.streams[self.port_stream[p]], self.port_labels[p]) for p in self._block_ports(block)]
+
+    def stream_names(self, block: str) -> List[str]:
+        """블록에 연결된 스트림 이름 (Connections 순서)"""
+        return [self.streams[self.port_stream[p]] for p in self._block_ports(block)]
+
+    def inlet_outlet(self, block: str) -> Tuple[Optional[str], Optional[str]]:
+        """첫 입구(라벨에 IN) 스트림과 첫 출구(라벨에 OUT) 스트림"""
+        inlet = outlet = None
+        for p in self._block_ports(block):
+            label = self.port_labels[p]
+            if 'IN' in label and inlet is None:
+                inlet = self.streams[self.port_stream[p]]
+            elif 'OUT' in label and outlet is None:
+                outlet = self.streams[self.port_stream[p]]
+        return inlet, outlet
+
+# =============================================================================
+# 생성
+# =============================================================================
+
+def build_graph(block_names: Iterable[str], read_ports: Callable[[str], List[Tuple[str, str]]]) -> FlowsheetGraph:
+    """블록마다 read_ports(블록) → [(스트림, 라벨), ...]를 한 번씩 호출해 그래프를 만듭니다."""
+    block_names = list(block_names)
+    return FlowsheetGraph(block_names, {block: read_ports(block) for block in block_names})